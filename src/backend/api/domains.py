@@ -51,7 +51,9 @@ BK_BASE_API_URL = get_endpoint("bk-data", stage=BK_BASE_APIGW_STAGE)
 # BkMonitor
 BK_MONITOR_APIGW_STAGE = "prod" if settings.RUN_MODE == "PRODUCT" else "stage"
 BK_MONITOR_API_URL = get_endpoint("bkmonitorv3", stage=BK_MONITOR_APIGW_STAGE)
-BK_MONITOR_METRIC_PROXY_URL = settings.BK_MONITOR_METRIC_PROXY_URL
+BK_MONITOR_METRIC_PROXY_URL = (
+    get_endpoint("bk-monitor-metric-proxy") if settings.API_STANDIN_ENABLED else settings.BK_MONITOR_METRIC_PROXY_URL
+)
 
 # CMSI
 BK_CMSI_API_URL = get_endpoint("cmsi", APIProvider.ESB, stage="prod")
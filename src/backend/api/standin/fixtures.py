@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict
+from uuid import uuid1
+
+from api.standin.profile import StandInProfile
+
+STANDIN_USERNAME = "admin"
+STANDIN_SYSTEM_ID = "bk_audit"
+ES_SCROLL_MAX_SIZE = 10000
+
+
+class EsScrollStore:
+    """
+    滚动查询游标，替身进程内存储
+    """
+
+    def __init__(self, max_size: int = ES_SCROLL_MAX_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._scrolls: Dict[str, dict] = {}
+
+    def create(self, offset: int, size: int, total: int) -> str:
+        scroll_id = uuid1().hex
+        with self._lock:
+            if len(self._scrolls) >= self.max_size:
+                self._scrolls.pop(next(iter(self._scrolls)))
+            self._scrolls[scroll_id] = {"offset": offset, "size": size, "total": total}
+        return scroll_id
+
+    def next(self, scroll_id: str) -> dict:
+        with self._lock:
+            scroll = self._scrolls.get(scroll_id)
+            if scroll is None:
+                return {"offset": 0, "size": 0, "total": 0}
+            current = dict(scroll)
+            scroll["offset"] += scroll["size"]
+            if scroll["offset"] >= scroll["total"]:
+                self._scrolls.pop(scroll_id, None)
+            return current
+
+
+es_scroll_store = EsScrollStore()
+
+
+def build_event(index: int) -> dict:
+    now = int(time.time() * 1000)
+    return {
+        "event_id": uuid1().hex,
+        "raw_event_id": str(index),
+        "strategy_id": random.randint(1, 100),
+        "username": STANDIN_USERNAME,
+        "system_id": STANDIN_SYSTEM_ID,
+        "action_id": "view_resource",
+        "resource_type_id": "resource",
+        "instance_id": str(index),
+        "instance_name": f"instance-{index}",
+        "event_time": now,
+        "dtEventTimeStamp": now,
+        "event_data": {"index": index},
+    }
+
+
+def build_hits(offset: int, size: int, total: int) -> dict:
+    size = max(min(size, total - offset), 0)
+    return {
+        "total": total,
+        "hits": [{"_id": str(index), "_source": build_event(index)} for index in range(offset, offset + size)],
+    }
+
+
+def es_query_search(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    offset, size = int(data.get("start") or 0), int(data.get("size") or 10)
+    resp = {"hits": build_hits(offset, size, profile.es_total)}
+    if data.get("scroll"):
+        resp["_scroll_id"] = es_scroll_store.create(offset + size, size, profile.es_total)
+    return resp
+
+
+def es_query_scroll(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    scroll_id = data.get("scroll_id", "")
+    scroll = es_scroll_store.next(scroll_id)
+    return {"_scroll_id": scroll_id, "hits": build_hits(scroll["offset"], scroll["size"], scroll["total"])}
+
+
+def databus_cleans_post(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    result_table_id = "{}_{}".format(data.get("bk_biz_id"), data.get("result_table_name"))
+    return {"processing_id": result_table_id, "result_table_id": result_table_id}
+
+
+def create_deploy_plan(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"raw_data_id": random.randint(1, 100000)}
+
+
+def get_flow_deploy_data(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"status": "success", "logs": []}
+
+
+def search_alert(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"total": 0, "alerts": []}
+
+
+def create_ticket(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"sn": "NO{}".format(uuid1().hex[:16]), "id": random.randint(1, 100000)}
+
+
+def ticket_approve_result(data: dict, url_kwargs: dict, profile: StandInProfile) -> list:
+    return [
+        {"sn": sn, "current_status": "RUNNING", "approve_result": False}
+        for sn in (data.get("sn") if isinstance(data.get("sn"), list) else [data.get("sn")])
+    ]
+
+
+def create_task(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"task_id": random.randint(1, 100000), "task_url": ""}
+
+
+def get_task_status(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"state": "FINISHED", "start_time": "", "finish_time": "", "children": {}}
+
+
+def retrieve_user(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    username = data.get("id") or STANDIN_USERNAME
+    return {"username": username, "display_name": username}
+
+
+def list_users(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {"count": 1, "results": [retrieve_user({}, url_kwargs, profile)]}
+
+
+def get_msg_type(data: dict, url_kwargs: dict, profile: StandInProfile) -> dict:
+    return {
+        "result": True,
+        "code": 0,
+        "message": "",
+        "data": [{"type": msg_type, "is_active": True} for msg_type in ["mail", "weixin", "rtx", "sms"]],
+    }
+
+
+def uni_apps_query(data: dict, url_kwargs: dict, profile: StandInProfile) -> list:
+    return []
+
+
+def check_allowed(data: dict, url_kwargs: dict, profile: StandInProfile) -> list:
+    return [{"action_id": action_id, "is_allowed": True} for action_id in data.get("action_ids", [])]
+
+
+# {module}.{api_name} => 响应构造函数，未配置的接口按响应类型返回空数据
+STANDIN_FIXTURES: Dict[str, Callable[[dict, dict, StandInProfile], object]] = {
+    "bk_log.es_query_search": es_query_search,
+    "bk_log.es_query_scroll": es_query_scroll,
+    "bk_log.check_allowed": check_allowed,
+    "bk_base.databus_cleans_post": databus_cleans_post,
+    "bk_base.create_deploy_plan": create_deploy_plan,
+    "bk_base.get_flow_deploy_data": get_flow_deploy_data,
+    "bk_monitor.search_alert": search_alert,
+    "bk_itsm.create_ticket": create_ticket,
+    "bk_itsm.ticket_approve_result": ticket_approve_result,
+    "bk_sops.create_task": create_task,
+    "bk_sops.get_task_status": get_task_status,
+    "user_manage.retrieve_user": retrieve_user,
+    "user_manage.list_users": list_users,
+    "bk_cmsi.get_msg_type": get_msg_type,
+    "bk_paas.uni_apps_query": uni_apps_query,
+}
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import random
+from typing import Union
+
+from django.conf import settings
+
+
+class StandInFault:
+    ERROR = "error"
+    TIMEOUT = "timeout"
+
+
+class StandInProfile:
+    """
+    替身响应配置
+    latency/jitter 控制耗时，error_rate/timeout_rate 控制失败比例
+    """
+
+    def __init__(
+        self,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        timeout_rate: float = 0,
+        timeout: float = 65,
+        es_total: int = 1000,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout = timeout
+        self.es_total = es_total
+
+    @classmethod
+    def from_settings(cls, module: str = None) -> "StandInProfile":
+        """
+        全局配置合并模块配置
+        """
+
+        config = {**settings.API_STANDIN_PROFILE, **settings.API_STANDIN_MODULE_PROFILES.get(module, {})}
+        return cls(**config)
+
+    def get_delay(self) -> float:
+        return max(self.latency + random.uniform(-self.jitter, self.jitter), 0)
+
+    def pick_fault(self) -> Union[str, None]:
+        value = random.random()
+        if value < self.timeout_rate:
+            return StandInFault.TIMEOUT
+        if value < self.timeout_rate + self.error_rate:
+            return StandInFault.ERROR
+        return None
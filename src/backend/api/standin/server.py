@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import inspect
+import json
+import os
+import re
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from typing import Dict, List, Tuple, Union
+from urllib.parse import parse_qsl, urlparse
+
+from bk_resource.contrib.api import APIResource
+from bk_resource.utils.text import camel_to_underscore
+from blueapps.utils.logger import logger
+from django.conf import settings
+
+from api.standin.fixtures import STANDIN_FIXTURES
+from api.standin.profile import StandInFault, StandInProfile
+
+API_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# action 经 re.escape 转义后的 url 参数占位符
+URL_KEY_PATTERN = re.compile(r"\\\{(\w+)\\\}")
+
+
+class StandInRoute:
+    """
+    替身路由，由 api 模块中的 Resource 生成
+    """
+
+    def __init__(self, module: str, resource_class):
+        self.module = module
+        self.api_name = camel_to_underscore(
+            "".join(resource_class.__name__.rsplit("Resource", 1))
+            if resource_class.__name__.endswith("Resource")
+            else resource_class.__name__
+        )
+        self.method = resource_class.method.upper()
+        self.is_standard = resource_class.IS_STANDARD_FORMAT
+        self.many = getattr(resource_class, "many_response_data", False)
+        prefix = urlparse(resource_class.base_url).path.rstrip("/")
+        action = "/" + resource_class.action.split("?", 1)[0].lstrip("/")
+        self.pattern = re.compile(
+            "^" + URL_KEY_PATTERN.sub(r"(?P<\1>[^/]+)", re.escape(prefix + action)).replace("//", "/") + "$"
+        )
+
+    @property
+    def key(self) -> str:
+        return f"{self.module}.{self.api_name}"
+
+    def match(self, method: str, path: str) -> Union[Dict[str, str], None]:
+        if method != self.method:
+            return None
+        matched = self.pattern.match(path)
+        return matched.groupdict() if matched else None
+
+
+class StandInRouter:
+    """
+    替身路由分发
+    1. 路由由 api 目录下各模块的 Resource 自动生成，与项目实际调用的接口一致
+    2. 响应由 STANDIN_FIXTURES 构造，未配置的接口按响应类型返回空数据
+    3. 按模块的 StandInProfile 模拟耗时、错误与超时
+    """
+
+    def __init__(self, routes: List[StandInRoute] = None):
+        self.routes = routes if routes is not None else self.load_routes()
+        self.profiles: Dict[str, StandInProfile] = {}
+
+    @classmethod
+    def load_routes(cls) -> List[StandInRoute]:
+        routes = []
+        for module in sorted(os.listdir(API_ROOT)):
+            if not os.path.exists(os.path.join(API_ROOT, module, "default.py")):
+                continue
+            module_path = f"api.{module}.default"
+            for _, resource_class in inspect.getmembers(import_module(module_path), inspect.isclass):
+                if (
+                    resource_class.__module__ != module_path
+                    or inspect.isabstract(resource_class)
+                    or not issubclass(resource_class, APIResource)
+                    or not str(resource_class.base_url or "").startswith(settings.API_STANDIN_URL)
+                ):
+                    continue
+                routes.append(StandInRoute(module, resource_class))
+        return routes
+
+    def get_profile(self, module: str) -> StandInProfile:
+        if module not in self.profiles:
+            self.profiles[module] = StandInProfile.from_settings(module)
+        return self.profiles[module]
+
+    def match(self, method: str, path: str) -> Tuple[Union[StandInRoute, None], Dict[str, str]]:
+        for route in self.routes:
+            url_kwargs = route.match(method, path)
+            if url_kwargs is not None:
+                return route, url_kwargs
+        return None, {}
+
+    def dispatch(self, method: str, path: str, data: dict) -> Tuple[int, object]:
+        """
+        :return: 状态码, 响应体
+        """
+
+        route, url_kwargs = self.match(method.upper(), path)
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"result": False, "code": 404, "message": f"{method} {path} not found"}
+        profile = self.get_profile(route.module)
+        fault = profile.pick_fault()
+        if fault == StandInFault.TIMEOUT:
+            time.sleep(profile.timeout)
+        else:
+            time.sleep(profile.get_delay())
+        if fault == StandInFault.ERROR:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"result": False, "code": 500, "message": "stand-in error"}
+        fixture = STANDIN_FIXTURES.get(route.key)
+        result = fixture({**data, **url_kwargs}, url_kwargs, profile) if fixture else ([] if route.many else {})
+        if not route.is_standard:
+            return HTTPStatus.OK, result
+        return HTTPStatus.OK, {"result": True, "code": 0, "message": "", "data": result}
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    router: StandInRouter = None
+
+    def handle_request(self) -> None:
+        url = urlparse(self.path)
+        data = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                data.update(json.loads(self.rfile.read(length)))
+            except (TypeError, ValueError):
+                pass
+        status, body = self.router.dispatch(self.command, url.path, data)
+        content = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_request
+
+    def log_message(self, format, *args) -> None:
+        logger.debug("[StandIn] %s", format % args)
+
+
+def build_server(host: str, port: int, router: StandInRouter = None) -> ThreadingHTTPServer:
+    handler = type("RouterRequestHandler", (StandInRequestHandler,), {"router": router or StandInRouter()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
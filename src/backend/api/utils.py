@@ -25,6 +25,9 @@ def get_endpoint(api_name, provider=APIProvider.APIGW, stage=None):
     """
     获取BK-API endpoint
     """
+    # 压测替身
+    if settings.API_STANDIN_ENABLED:
+        return "{}/{}/{}".format(settings.API_STANDIN_URL.rstrip("/"), provider.value, api_name)
     # 默认环境
     if not stage:
         stage = "prod" if settings.RUN_MODE == "PRODUCT" else "stag"
@@ -23,6 +23,7 @@ from bk_audit.contrib.opentelemetry.utils import ServiceNameHandler
 from bk_resource.settings import bk_resource_settings
 from django.conf import settings
 
+from apps.audit.exporters import BufferedExporter
 from apps.audit.formatters import AuditFormatter
 
 
@@ -61,8 +62,27 @@ class BkAuditClient(BkAudit):
         )
 
 
+def build_exporters() -> list:
+    """
+    开启异步输出时，审计事件先写入缓冲队列，由后台线程批量输出
+    """
+
+    exporter = OTLogExporter()
+    if not settings.BK_AUDIT_ASYNC_EXPORT:
+        return [exporter]
+    return [
+        BufferedExporter(
+            exporter,
+            buffer_size=settings.BK_AUDIT_BUFFER_SIZE,
+            batch_size=settings.BK_AUDIT_BATCH_SIZE,
+            flush_interval=settings.BK_AUDIT_FLUSH_INTERVAL,
+            drop_policy=settings.BK_AUDIT_DROP_POLICY,
+        )
+    ]
+
+
 bk_audit_client = BkAuditClient(
     settings.APP_CODE,
     settings.SECRET_KEY,
-    {"formatter": AuditFormatter(), "exporters": [OTLogExporter()], "service_name_handler": ServiceNameHandler},
+    {"formatter": AuditFormatter(), "exporters": build_exporters(), "service_name_handler": ServiceNameHandler},
 )
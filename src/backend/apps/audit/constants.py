@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.utils.translation import gettext_lazy
+
+from core.choices import TextChoices
+
+# 队列满且策略为阻塞时的最长等待时间
+AUDIT_BUFFER_BLOCK_TIMEOUT = 0.05
+# 后台线程输出统计信息的间隔
+AUDIT_BUFFER_STATS_INTERVAL = 60
+
+
+class DropPolicy(TextChoices):
+    """
+    缓冲队列满时的丢弃策略
+    """
+
+    DROP_OLDEST = "drop_oldest", gettext_lazy("丢弃最早的事件")
+    DROP_NEWEST = "drop_newest", gettext_lazy("丢弃新事件")
+    BLOCK = "block", gettext_lazy("短暂阻塞后丢弃")
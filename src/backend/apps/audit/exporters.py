@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import atexit
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import List, Tuple
+
+from bk_audit.log.exporters import BaseExporter
+from blueapps.utils.logger import logger
+from opentelemetry import context as otel_context
+from opentelemetry.context import Context
+
+from apps.audit.constants import (
+    AUDIT_BUFFER_BLOCK_TIMEOUT,
+    AUDIT_BUFFER_STATS_INTERVAL,
+    DropPolicy,
+)
+
+
+class BufferedExporter(BaseExporter):
+    """
+    异步缓冲输出
+    审计事件写入有界队列后立即返回，由后台线程按批次交给实际的 Exporter 输出，
+    队列满时按照丢弃策略处理，避免输出端变慢时拖慢用户请求
+    事件入队时记录链路上下文，后台线程输出时恢复，保证审计日志仍可与请求关联
+    """
+
+    is_delay = False
+
+    def __init__(
+        self,
+        exporter: BaseExporter,
+        buffer_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1,
+        drop_policy: str = DropPolicy.DROP_OLDEST,
+    ):
+        self.exporter = exporter
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._counters = {"enqueued": 0, "flushed": 0, "dropped": 0, "failed": 0}
+        # 已从队列取出但尚未输出完成的事件数
+        self._inflight = 0
+        atexit.register(self.flush)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "pending": self._queue.qsize()}
+
+    def _incr(self, key: str, count: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += count
+
+    def export(self, events: list) -> None:
+        self._ensure_worker()
+        ctx = otel_context.get_current()
+        for event in events:
+            self._put((ctx, event))
+
+    def _put(self, event: Tuple[Context, object]) -> None:
+        if self.drop_policy == DropPolicy.BLOCK:
+            try:
+                self._queue.put(event, timeout=AUDIT_BUFFER_BLOCK_TIMEOUT)
+            except queue.Full:
+                self._incr("dropped")
+                return
+            self._incr("enqueued")
+            return
+        while True:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                if self.drop_policy == DropPolicy.DROP_NEWEST:
+                    self._incr("dropped")
+                    return
+                # 丢弃最早的事件，为新事件腾出空间
+                try:
+                    self._queue.get_nowait()
+                    self._incr("dropped")
+                except queue.Empty:
+                    pass
+                continue
+            self._incr("enqueued")
+            return
+
+    def _ensure_worker(self) -> None:
+        # 进程 fork 后线程不会被继承，需要在子进程内重新启动
+        pid = os.getpid()
+        if self._pid == pid and self._worker and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._worker and self._worker.is_alive():
+                return
+            if self._pid != pid:
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._pid = pid
+            self._worker = threading.Thread(target=self._run, name="bk-audit-exporter", daemon=True)
+            self._worker.start()
+
+    def _drain(self, block: bool) -> List[Tuple[Context, object]]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._inflight += len(batch)
+        return batch
+
+    def _export_batch(self, batch: List[Tuple[Context, object]]) -> None:
+        if not batch:
+            return
+        with self._export_lock:
+            try:
+                # 相邻且链路上下文相同的事件合并输出
+                for ctx, items in itertools.groupby(batch, key=lambda item: item[0]):
+                    self._export_with_context(ctx, [event for _, event in items])
+            finally:
+                with self._lock:
+                    self._inflight -= len(batch)
+
+    def _export_with_context(self, ctx: Context, events: list) -> None:
+        token = otel_context.attach(ctx)
+        try:
+            self.exporter.export(events)
+            self._incr("flushed", len(events))
+        except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+            self._incr("failed", len(events))
+            logger.exception("[BufferedExporter] Export Failed; Count => %s; Error => %s", len(events), err)
+        finally:
+            otel_context.detach(token)
+
+    def _run(self) -> None:
+        last_report = time.monotonic()
+        while True:
+            self._export_batch(self._drain(block=True))
+            if time.monotonic() - last_report >= AUDIT_BUFFER_STATS_INTERVAL:
+                last_report = time.monotonic()
+                logger.info("[BufferedExporter] Stats => %s", self.stats)
+
+    def flush(self, timeout: float = 5) -> None:
+        """
+        同步输出队列中剩余的事件，并等待后台线程正在输出的批次完成
+        """
+
+        while not self._queue.empty():
+            self._export_batch(self._drain(block=False))
+        deadline = time.monotonic() + timeout
+        while self._inflight > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
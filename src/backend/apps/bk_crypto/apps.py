@@ -22,10 +22,3 @@ from django.apps import AppConfig
 class BkCryptoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.bk_crypto"
-
-    def ready(self):
-        from blueapps.utils.logger import logger
-
-        from apps.bk_crypto.crypto import asymmetric_cipher
-
-        logger.info("[AsymmetricCipherPublicKey]\n%s", asymmetric_cipher.export_public_key())
@@ -17,3 +17,10 @@ to the current version of the project delivered to anyone in the future.
 """
 
 PRIVATE_KEY_CONFIG_NAME = "BKCRYPTO_PRIVATE_KEY"
+
+# 密钥轮换检查间隔(秒)
+CIPHER_KEY_CHECK_INTERVAL = 60
+
+# 字段密文缓存
+FIELD_CIPHER_CACHE_SIZE = 2048
+FIELD_CIPHER_CACHE_TTL = 300
@@ -16,6 +16,8 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import threading
+import time
 import typing
 from uuid import uuid1
 
@@ -28,7 +30,7 @@ from bkcrypto.symmetric.ciphers import BaseSymmetricCipher
 from blueapps.utils.logger import logger
 from django.conf import settings
 
-from apps.bk_crypto.constants import PRIVATE_KEY_CONFIG_NAME
+from apps.bk_crypto.constants import CIPHER_KEY_CHECK_INTERVAL, PRIVATE_KEY_CONFIG_NAME
 from apps.exceptions import MetaConfigNotExistException
 from apps.meta.constants import GLOBAL_CONFIG_LEVEL_INSTANCE, ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
@@ -87,29 +89,44 @@ class AsymmetricCipher:
 
     symmetric_cipher: BaseSymmetricCipher = get_symmetric_cipher(common={"key": settings.SECRET_KEY})
 
-    def get_cipher(self):
-        if settings.ENABLE_BKCRYPTO:
-            try:
-                private_key_string = GlobalMetaConfig.get(
-                    config_key=PRIVATE_KEY_CONFIG_NAME,
-                    config_level=ConfigLevelChoices.GLOBAL,
-                    instance_key=GLOBAL_CONFIG_LEVEL_INSTANCE,
-                )
-                private_key_string = self.symmetric_cipher.decrypt(private_key_string)
-            except MetaConfigNotExistException:
-                logger.warning(
-                    "[PrivateKetNotExists] %s, %s, %s",
-                    PRIVATE_KEY_CONFIG_NAME,
-                    ConfigLevelChoices.GLOBAL,
-                    GLOBAL_CONFIG_LEVEL_INSTANCE,
-                )
-                private_key_string = ""
-            return get_asymmetric_cipher(
-                cipher_options={
-                    AsymmetricCipherType.SM2.value: SM2AsymmetricOptions(private_key_string=private_key_string)
-                }
+    @staticmethod
+    def use_fake_cipher() -> bool:
+        """
+        未开启加密时使用虚拟加密
+        """
+
+        return not settings.ENABLE_BKCRYPTO
+
+    def get_private_key_stamp(self) -> str:
+        """
+        获取存储的私钥密文，用于判断密钥是否轮换
+        """
+
+        try:
+            return GlobalMetaConfig.get(
+                config_key=PRIVATE_KEY_CONFIG_NAME,
+                config_level=ConfigLevelChoices.GLOBAL,
+                instance_key=GLOBAL_CONFIG_LEVEL_INSTANCE,
             )
-        return FakeAsymmetricCipher()
+        except MetaConfigNotExistException:
+            logger.warning(
+                "[PrivateKetNotExists] %s, %s, %s",
+                PRIVATE_KEY_CONFIG_NAME,
+                ConfigLevelChoices.GLOBAL,
+                GLOBAL_CONFIG_LEVEL_INSTANCE,
+            )
+            return ""
+
+    def build_cipher(self, private_key_stamp: str) -> BaseAsymmetricCipher:
+        private_key_string = self.symmetric_cipher.decrypt(private_key_stamp) if private_key_stamp else ""
+        return get_asymmetric_cipher(
+            cipher_options={AsymmetricCipherType.SM2.value: SM2AsymmetricOptions(private_key_string=private_key_string)}
+        )
+
+    def get_cipher(self) -> BaseAsymmetricCipher:
+        if self.use_fake_cipher():
+            return FakeAsymmetricCipher()
+        return self.build_cipher(self.get_private_key_stamp())
 
     def init_private_key(self, *args, **kwargs):
         try:
@@ -126,6 +143,7 @@ class AsymmetricCipher:
                 config_level=ConfigLevelChoices.GLOBAL,
                 instance_key=GLOBAL_CONFIG_LEVEL_INSTANCE,
             )
+            asymmetric_cipher.reload()
 
     def encrypt_private_key(self, private_key: str) -> str:
         return self.symmetric_cipher.encrypt(private_key)
@@ -134,4 +152,93 @@ class AsymmetricCipher:
         return self.symmetric_cipher.decrypt(private_key)
 
 
-asymmetric_cipher: BaseAsymmetricCipher = AsymmetricCipher().get_cipher()
+class LazyAsymmetricCipher:
+    """
+    延迟初始化的加密器
+    1. 首次使用时才读取私钥，避免模块导入时访问数据库
+    2. 定期比对存储的私钥，密钥轮换后自动重新加载
+    """
+
+    def __init__(self, provider: AsymmetricCipher = None, check_interval: int = CIPHER_KEY_CHECK_INTERVAL):
+        self._provider = provider or AsymmetricCipher()
+        self._check_interval = check_interval
+        self._lock = threading.RLock()
+        self._cipher: typing.Optional[BaseAsymmetricCipher] = None
+        self._key_stamp: typing.Optional[str] = None
+        self._checked_at: float = 0
+        self._key_version: int = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._cipher is not None
+
+    @property
+    def cipher(self) -> BaseAsymmetricCipher:
+        return self.get_cipher()
+
+    def get_cipher(self) -> BaseAsymmetricCipher:
+        cipher = self._cipher
+        if cipher is not None and not self._need_check():
+            return cipher
+        with self._lock:
+            if self._cipher is None:
+                self._load()
+            elif self._need_check():
+                self._check_rotation()
+            return self._cipher
+
+    def current(self) -> typing.Tuple[int, BaseAsymmetricCipher]:
+        """
+        获取密钥版本及对应的加密器，版本在每次加载或轮换后递增
+        """
+
+        with self._lock:
+            cipher = self.get_cipher()
+            return self._key_version, cipher
+
+    def reload(self) -> None:
+        """
+        丢弃当前加密器，下次使用时重新加载
+        """
+
+        with self._lock:
+            self._cipher = None
+            self._key_stamp = None
+            self._checked_at = 0
+
+    def _need_check(self) -> bool:
+        return self._key_stamp is not None and time.monotonic() - self._checked_at >= self._check_interval
+
+    def _load(self) -> None:
+        if self._provider.use_fake_cipher():
+            self._cipher = FakeAsymmetricCipher()
+            self._key_stamp = None
+        else:
+            key_stamp = self._provider.get_private_key_stamp()
+            self._cipher = self._provider.build_cipher(key_stamp)
+            self._key_stamp = key_stamp
+        self._checked_at = time.monotonic()
+        self._key_version += 1
+        logger.info("[AsymmetricCipherPublicKey]\n%s", self._cipher.export_public_key())
+
+    def _check_rotation(self) -> None:
+        self._checked_at = time.monotonic()
+        try:
+            key_stamp = self._provider.get_private_key_stamp()
+        except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+            logger.warning("[AsymmetricCipherCheckFailed] %s", err)
+            return
+        if key_stamp == self._key_stamp:
+            return
+        logger.info("[AsymmetricCipherRotated] %s", PRIVATE_KEY_CONFIG_NAME)
+        self._cipher = self._provider.build_cipher(key_stamp)
+        self._key_stamp = key_stamp
+        self._key_version += 1
+
+    def __getattr__(self, item: str) -> typing.Any:
+        if item.startswith("__"):
+            raise AttributeError(item)
+        return getattr(self.get_cipher(), item)
+
+
+asymmetric_cipher: LazyAsymmetricCipher = LazyAsymmetricCipher()
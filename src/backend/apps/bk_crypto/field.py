@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from apps.bk_crypto.constants import FIELD_CIPHER_CACHE_SIZE, FIELD_CIPHER_CACHE_TTL
+from apps.bk_crypto.crypto import LazyAsymmetricCipher, asymmetric_cipher
+
+
+class FieldEncryptor:
+    """
+    字段加密
+    1. 同一批次内相同的值只加密一次
+    2. 按 (密钥版本, 明文) 缓存密文，容量有限且短时过期，密钥轮换后自动失效
+    """
+
+    def __init__(
+        self,
+        cipher: LazyAsymmetricCipher = asymmetric_cipher,
+        max_size: int = FIELD_CIPHER_CACHE_SIZE,
+        ttl: float = FIELD_CIPHER_CACHE_TTL,
+    ):
+        self.cipher = cipher
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: typing.OrderedDict[typing.Tuple[int, str], typing.Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encrypt(self, value: typing.Any) -> typing.Any:
+        return self.encrypt_many([value])[0]
+
+    def encrypt_many(self, values: typing.List[typing.Any]) -> typing.List[typing.Any]:
+        """
+        批量加密，返回与输入顺序一致的密文
+        """
+
+        key_version, cipher = self.cipher.current()
+        results = list(values)
+        misses: typing.Dict[str, typing.List[int]] = {}
+        now = time.monotonic()
+        with self._lock:
+            for index, value in enumerate(values):
+                # 非字符串不缓存，保持原有的加密行为
+                if not isinstance(value, str):
+                    results[index] = cipher.encrypt(value)
+                    continue
+                cached = self._cache.get((key_version, value))
+                if cached is not None and cached[1] > now:
+                    self._cache.move_to_end((key_version, value))
+                    results[index] = cached[0]
+                    continue
+                misses.setdefault(value, []).append(index)
+        if not misses:
+            return results
+        # 加密耗时较长，不持有锁
+        encrypted = {value: cipher.encrypt(value) for value in misses}
+        expire_at = time.monotonic() + self.ttl
+        with self._lock:
+            for value, ciphertext in encrypted.items():
+                self._cache[(key_version, value)] = (ciphertext, expire_at)
+                self._cache.move_to_end((key_version, value))
+                for index in misses[value]:
+                    results[index] = ciphertext
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return results
+
+    def batch(self) -> "FieldEncryptBatch":
+        return FieldEncryptBatch(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class FieldEncryptBatch:
+    """
+    批量加密多个字典中的值，flush 时统一加密并原地替换
+    """
+
+    def __init__(self, encryptor: FieldEncryptor):
+        self.encryptor = encryptor
+        self._targets: typing.List[dict] = []
+
+    def add(self, data: dict) -> None:
+        self._targets.append(data)
+
+    def flush(self) -> None:
+        if not self._targets:
+            return
+        keys = [(data, key) for data in self._targets for key in data.keys()]
+        encrypted = self.encryptor.encrypt_many([data[key] for data, key in keys])
+        for (data, key), ciphertext in zip(keys, encrypted):
+            data[key] = ciphertext
+        self._targets = []
+
+
+field_encryptor = FieldEncryptor()
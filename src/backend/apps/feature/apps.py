@@ -24,3 +24,16 @@ class FeatureConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.feature"
     verbose_name = gettext_lazy("特性")
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.feature.cache import feature_toggle_cache
+        from apps.feature.models import FeatureToggle
+
+        post_save.connect(
+            feature_toggle_cache.invalidate, sender=FeatureToggle, dispatch_uid="feature_toggle_invalidate_on_save"
+        )
+        post_delete.connect(
+            feature_toggle_cache.invalidate, sender=FeatureToggle, dispatch_uid="feature_toggle_invalidate_on_delete"
+        )
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import copy
+import threading
+import time
+from typing import Dict, Tuple, Type, Union
+from uuid import uuid1
+
+from bk_resource.utils.text import underscore_to_camel
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from apps.feature.constants import (
+    FEATURE_TOGGLE_PLUGIN_TTL,
+    FEATURE_TOGGLE_VERSION_CHECK_INTERVAL,
+    FEATURE_TOGGLE_VERSION_KEY,
+)
+from apps.feature.models import FeatureToggle
+from apps.feature.plugins import BaseFeaturePlugin
+
+
+class FeatureToggleCache:
+    """
+    特性开关缓存
+    1. 数据库配置与 settings.FEATURE_TOGGLE 默认值合并后全量加载至进程内存
+    2. 通过缓存中的版本号判断数据是否变更，变更后重新加载
+    3. 插件解析结果按 plugin_ttl 缓存，避免每次校验都请求外部接口
+    """
+
+    def __init__(
+        self,
+        check_interval: float = FEATURE_TOGGLE_VERSION_CHECK_INTERVAL,
+        plugin_ttl: float = FEATURE_TOGGLE_PLUGIN_TTL,
+    ):
+        self.check_interval = check_interval
+        self.plugin_ttl = plugin_ttl
+        self._lock = threading.RLock()
+        self._toggles: Dict[str, FeatureToggle] = {}
+        self._resolved: Dict[str, Tuple[float, FeatureToggle]] = {}
+        self._plugins: Dict[str, Type[BaseFeaturePlugin]] = {}
+        self._version: Union[str, None] = None
+        self._loaded = False
+        self._checked_at: float = 0
+
+    @property
+    def toggles(self) -> Dict[str, FeatureToggle]:
+        if self._loaded and time.monotonic() - self._checked_at < self.check_interval:
+            return self._toggles
+        with self._lock:
+            if not self._loaded or time.monotonic() - self._checked_at >= self.check_interval:
+                self._refresh()
+        return self._toggles
+
+    def _refresh(self) -> None:
+        version = cache.get(FEATURE_TOGGLE_VERSION_KEY)
+        if version is None:
+            version = uuid1().hex
+            # 其他进程已设置时以已有版本为准
+            if not cache.add(FEATURE_TOGGLE_VERSION_KEY, version, None):
+                version = cache.get(FEATURE_TOGGLE_VERSION_KEY, version)
+        self._checked_at = time.monotonic()
+        if self._loaded and version == self._version:
+            return
+        # 数据库未配置以设置为准
+        toggles = {
+            feature_id: FeatureToggle(feature_id=feature_id, status=status)
+            for feature_id, status in settings.FEATURE_TOGGLE.items()
+        }
+        for feature in FeatureToggle.objects.filter(feature_id__in=toggles.keys()):
+            toggles[feature.feature_id] = feature
+        self._toggles = toggles
+        self._resolved = {}
+        self._version = version
+        self._loaded = True
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """
+        更新版本号，所有进程在下次检查时重新加载
+        事务提交后再更新，避免其他进程加载到未提交前的数据
+        """
+
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self) -> None:
+        cache.set(FEATURE_TOGGLE_VERSION_KEY, uuid1().hex, None)
+        with self._lock:
+            self._loaded = False
+
+    def get_raw(self, feature_id: str) -> Union[FeatureToggle, None]:
+        """
+        获取未经插件处理的 Feature
+        """
+
+        feature = self.toggles.get(feature_id)
+        return copy.deepcopy(feature) if feature is not None else None
+
+    def get(self, feature_id: str) -> Union[FeatureToggle, None]:
+        """
+        获取经插件处理后的 Feature，返回副本避免调用方修改缓存
+        """
+
+        toggles = self.toggles
+        if feature_id not in toggles:
+            return None
+        resolved = self._resolved.get(feature_id)
+        if resolved is None or time.monotonic() - resolved[0] >= self.plugin_ttl:
+            with self._lock:
+                resolved = self._resolved.get(feature_id)
+                if resolved is None or time.monotonic() - resolved[0] >= self.plugin_ttl:
+                    feature = self.get_plugin(feature_id)(copy.deepcopy(toggles[feature_id])).feature
+                    resolved = (time.monotonic(), feature)
+                    self._resolved[feature_id] = resolved
+        return copy.deepcopy(resolved[1])
+
+    def get_plugin(self, feature_id: str) -> Type[BaseFeaturePlugin]:
+        """
+        获取 Feature 插件，导入结果常驻内存
+        """
+
+        plugin = self._plugins.get(feature_id)
+        if plugin is None:
+            plugin_path = f"feature.plugins.{underscore_to_camel(feature_id)}Plugin"
+            try:
+                plugin = import_string(plugin_path)
+            except ImportError:
+                plugin = BaseFeaturePlugin
+            self._plugins[feature_id] = plugin
+        return plugin
+
+
+feature_toggle_cache = FeatureToggleCache()
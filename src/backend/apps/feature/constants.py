@@ -26,3 +26,9 @@ class FeatureStatusChoices(TextChoices):
     STAG = "stag", gettext_lazy("测试环境")
     PROD = "prod", gettext_lazy("正式环境")
     AVAILABLE = "available", gettext_lazy("已启用")
+
+
+FEATURE_TOGGLE_VERSION_KEY = "feature:toggle:version"
+FEATURE_TOGGLE_VERSION_CHECK_INTERVAL = 5
+# 插件解析结果缓存时间，插件状态可能依赖外部接口
+FEATURE_TOGGLE_PLUGIN_TTL = 60
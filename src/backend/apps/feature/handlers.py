@@ -16,16 +16,12 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from typing import Union
-
-from bk_resource.utils.text import underscore_to_camel
 from django.conf import settings
-from django.utils.module_loading import import_string
 
 from apps.exceptions import FeatureNotExist
+from apps.feature.cache import feature_toggle_cache
 from apps.feature.constants import FeatureStatusChoices
 from apps.feature.models import FeatureToggle
-from apps.feature.plugins import BaseFeaturePlugin
 
 
 class FeatureHandler:
@@ -55,43 +51,11 @@ class FeatureHandler:
 
         # 校验Feature存在
         self._feature_exist()
-        # 存在数据库Feature时优先返回
-        db_feature = self._get_db_feature()
-        if db_feature:
-            feature = db_feature
-        # 数据库未配置以设置为准
-        else:
-            setting_feature = self._get_setting_feature()
-            feature = setting_feature
-        return self._plugin_feature(feature)
+        # 数据库配置优先，未配置以设置为准，均从进程缓存读取
+        return feature_toggle_cache.get(self.feature_id)
 
     def _feature_exist(self) -> None:
         """校验Feature存在"""
 
         if self.feature_id not in settings.FEATURE_TOGGLE.keys():
             raise FeatureNotExist(message=FeatureNotExist.MESSAGE % self.feature_id)
-
-    def _get_setting_feature(self) -> FeatureToggle:
-        """从设置获取Feature"""
-
-        feature_status = settings.FEATURE_TOGGLE[self.feature_id]
-        return FeatureToggle(
-            feature_id=self.feature_id,
-            status=feature_status,
-        )
-
-    def _get_db_feature(self) -> Union[FeatureToggle, None]:
-        """从数据库获取Feature"""
-
-        try:
-            return FeatureToggle.objects.get(feature_id=self.feature_id)
-        except FeatureToggle.DoesNotExist:
-            return None
-
-    def _plugin_feature(self, feature: FeatureToggle) -> FeatureToggle:
-        plugin_path = f"feature.plugins.{underscore_to_camel(feature.feature_id)}Plugin"
-        try:
-            plugin = import_string(plugin_path)
-        except ImportError:
-            plugin = BaseFeaturePlugin
-        return plugin(feature).feature
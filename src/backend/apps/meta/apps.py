@@ -23,3 +23,14 @@ from django.utils.translation import gettext_lazy
 class MetaConfig(AppConfig):
     name = "apps.meta"
     verbose_name = gettext_lazy("元数据")
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.meta.models import DataMap
+        from apps.meta.utils.data_map import data_map_translator
+
+        post_save.connect(data_map_translator.invalidate, sender=DataMap, dispatch_uid="data_map_invalidate_on_save")
+        post_delete.connect(
+            data_map_translator.invalidate, sender=DataMap, dispatch_uid="data_map_invalidate_on_delete"
+        )
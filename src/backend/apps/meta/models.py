@@ -315,23 +315,12 @@ class DataMap(OperateRecordModel):
     def get_alias(cls, data_field: str, data_key: str, cache_data: defaultdict = None, default: str = None) -> str:
         """
         获取单个别名
+        cache_data 已由进程内的数据字典缓存替代，仅保留兼容
         """
 
-        # 统一转换为字符串处理
-        data_key = str(data_key)
-        # 优先使用缓存
-        cache_data = defaultdict(dict) if cache_data is None else cache_data
-        if data_key in cache_data[data_field].keys():
-            return cache_data[data_field][data_key]
-        # 获取数据
-        try:
-            alias = cls.objects.get(data_field=data_field, data_key=data_key).data_alias
-        except cls.DoesNotExist:
-            alias = data_key if default is None else default
-            # 设置缓存
-        cache_data[data_field][data_key] = alias
-        # 响应
-        return alias
+        from apps.meta.utils.data_map import data_map_translator
+
+        return data_map_translator.get_alias(data_field, data_key, default=default)
 
     @classmethod
     def trans_data(
@@ -341,20 +330,9 @@ class DataMap(OperateRecordModel):
         转换数据 (仅支持第一层)
         """
 
-        # 无数据
-        if not data:
-            return data
-        # 兼容多数据的情况
-        if not many:
-            data = [data]
-        # 数据缓存
-        data_map_cache = defaultdict(dict)
-        # 转换
-        for item in data:
-            for field in data_fields:
-                item[field] = cls.get_alias(build_data_fields(field), item.get(field), data_map_cache)
-        # 响应
-        return data if many else data[0]
+        from apps.meta.utils.data_map import data_map_translator
+
+        return data_map_translator.translate(data, data_fields, build_data_fields=build_data_fields, many=many)
 
 
 class Tag(OperateRecordModel):
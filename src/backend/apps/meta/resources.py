@@ -95,6 +95,7 @@ from apps.meta.serializers import (
     UploadDataMapFileRequestSerializer,
     UploadDataMapFileResponseSerializer,
 )
+from apps.meta.utils.data_map import data_map_translator
 from apps.meta.utils.globals import Globals
 from apps.permission.handlers.actions import ActionEnum, get_action_by_id
 from apps.permission.handlers.drf import wrapper_permission_field
@@ -594,6 +595,8 @@ class UploadDataMapFile(Meta, Resource):
         with transaction.atomic():
             DataMap.objects.filter(data_field__in=keys).delete()
             DataMap.objects.bulk_create(data_maps)
+            # bulk_create 不触发信号，需主动刷新
+            data_map_translator.invalidate()
         return DataMap.objects.filter(data_field__in=keys)
 
 
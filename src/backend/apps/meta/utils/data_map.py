@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+import time
+from typing import Dict, List, Union
+from uuid import uuid1
+
+from django.core.cache import cache
+from django.db import transaction
+
+DATA_MAP_VERSION_KEY = "meta:data_map:version"
+DATA_MAP_VERSION_CHECK_INTERVAL = 5
+
+
+class DataMapTranslator:
+    """
+    数据字典翻译
+    1. 全量加载至进程内存，查询均为字典查找
+    2. 通过缓存中的版本号判断数据是否变更，变更后重新加载
+    """
+
+    def __init__(self, check_interval: float = DATA_MAP_VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mapping: Dict[str, Dict[str, str]] = {}
+        self._version: Union[str, None] = None
+        self._loaded = False
+        self._checked_at: float = 0
+
+    @property
+    def mapping(self) -> Dict[str, Dict[str, str]]:
+        if self._loaded and time.monotonic() - self._checked_at < self.check_interval:
+            return self._mapping
+        with self._lock:
+            if not self._loaded or time.monotonic() - self._checked_at >= self.check_interval:
+                self._refresh()
+        return self._mapping
+
+    def _refresh(self) -> None:
+        version = cache.get(DATA_MAP_VERSION_KEY)
+        if version is None:
+            version = uuid1().hex
+            # 其他进程已设置时以已有版本为准
+            if not cache.add(DATA_MAP_VERSION_KEY, version, None):
+                version = cache.get(DATA_MAP_VERSION_KEY, version)
+        self._checked_at = time.monotonic()
+        if self._loaded and version == self._version:
+            return
+        from apps.meta.models import DataMap
+
+        mapping: Dict[str, Dict[str, str]] = {}
+        for data_field, data_key, data_alias in DataMap.objects.values_list("data_field", "data_key", "data_alias"):
+            mapping.setdefault(data_field, {})[str(data_key)] = data_alias
+        self._mapping = mapping
+        self._version = version
+        self._loaded = True
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """
+        更新版本号，所有进程在下次检查时重新加载
+        事务提交后再更新，避免其他进程加载到未提交前的数据
+        """
+
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self) -> None:
+        cache.set(DATA_MAP_VERSION_KEY, uuid1().hex, None)
+        with self._lock:
+            self._loaded = False
+
+    def get_alias(self, data_field: str, data_key: str, default: str = None) -> str:
+        data_key = str(data_key)
+        alias = self.mapping.get(data_field, {}).get(data_key)
+        if alias is None:
+            return data_key if default is None else default
+        return alias
+
+    def get_aliases(self, data_field: str) -> Dict[str, str]:
+        """
+        获取字段下的全部别名
+        """
+
+        return dict(self.mapping.get(data_field, {}))
+
+    def translate(
+        self,
+        data: Union[List[dict], dict],
+        data_fields: list,
+        build_data_fields: callable = lambda x: x,
+        many: bool = False,
+    ) -> Union[List[dict], dict]:
+        """
+        批量转换数据 (仅支持第一层)
+        """
+
+        if not data:
+            return data
+        items = data if many else [data]
+        mapping = self.mapping
+        field_mappings = {field: mapping.get(build_data_fields(field), {}) for field in data_fields}
+        for item in items:
+            for field, field_mapping in field_mappings.items():
+                data_key = str(item.get(field))
+                item[field] = field_mapping.get(data_key, data_key)
+        return data
+
+
+data_map_translator = DataMapTranslator()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.notice.models import NoticeLog, NoticeLogArchive
+from core.archive import BaseArchivePolicy
+
+
+class NoticeLogArchivePolicy(BaseArchivePolicy):
+    """
+    消息记录归档
+    近期消息仅用于重复发送检测，保留期不会小于检测窗口
+    """
+
+    name = "notice_log"
+    model = NoticeLog
+    archive_model = NoticeLogArchive
+
+    @property
+    def retention_days(self) -> int:
+        return settings.NOTICE_LOG_RETENTION_DAYS
+
+    @property
+    def cutoff(self) -> datetime.datetime:
+        return min(super().cutoff, timezone.now() - datetime.timedelta(minutes=settings.NOTICE_AGG_MINUTES))
+
+    def candidates(self) -> QuerySet:
+        # 按 send_at 索引范围扫描，避免每批全表扫描
+        return (
+            NoticeLog._objects.filter(send_at__lt=int(self.cutoff.timestamp() * 1000))
+            .order_by("send_at", "log_id")
+            .values_list("log_id", flat=True)
+        )
@@ -28,6 +28,10 @@ NOTICE_GROUP_NAME_REGEX = r"[\\\|\/\:\*\<\>\"\?,]+"
 NOTICE_LOG_EXPIRED_DAYS = 30
 
 BK_AUDIT_MAIL_DEFAULT_TEMPLATE = "templates/notice/mail.html"
+NOTICE_TEMPLATE_CACHE_SIZE = 32
+
+NOTICE_DIGEST_MAX_SIZE = 50
+NOTICE_LOG_BATCH_SIZE = 500
 
 NOTICE_WHITELIST_USER_KEY = "NOTICE_WHITELIST_USER"
 
@@ -17,15 +17,17 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import datetime
+import functools
 import json
 import os
-from typing import List
+from typing import Dict, List
 
 from bk_resource import api
 from bk_resource.exceptions import APIRequestError
 from bk_resource.utils.common_utils import ignored
 from blueapps.utils.logger import logger
 from django.conf import settings
+from django.db.models import Min
 from django.template import Template, engines
 from django.template.backends.django import Template as BackendTemplate
 from django.utils import timezone
@@ -38,10 +40,14 @@ from apps.meta.models import GlobalMetaConfig
 from apps.notice.constants import (
     ADMIN_NOTICE_GROUP_ID,
     BK_AUDIT_MAIL_DEFAULT_TEMPLATE,
+    NOTICE_DIGEST_MAX_SIZE,
+    NOTICE_LOG_BATCH_SIZE,
+    NOTICE_TEMPLATE_CACHE_SIZE,
     NOTICE_WHITELIST_USER_KEY,
     MsgType,
 )
 from apps.notice.models import (
+    NoticeBuffer,
     NoticeButton,
     NoticeContent,
     NoticeContentConfig,
@@ -49,6 +55,18 @@ from apps.notice.models import (
     NoticeLog,
 )
 from apps.notice.tasks import send_notice
+from core.utils.tools import group_by
+
+
+@functools.lru_cache(maxsize=1)
+def load_default_mail_template() -> str:
+    with open(os.path.join(settings.BASE_DIR, BK_AUDIT_MAIL_DEFAULT_TEMPLATE), "r") as file:
+        return file.read()
+
+
+@functools.lru_cache(maxsize=NOTICE_TEMPLATE_CACHE_SIZE)
+def compile_mail_template(template_content: str) -> BackendTemplate:
+    return BackendTemplate(Template(template_content), engines.all()[0])
 
 
 class NoticeHandler:
@@ -64,6 +82,8 @@ class NoticeHandler:
         content: NoticeContent,
         button: NoticeButton = None,
         skip_recent_check: bool = False,
+        skip_digest: bool = False,
+        cmsi=None,
         **configs,
     ):
         self.notice_group = notice_group
@@ -72,36 +92,76 @@ class NoticeHandler:
         self.configs = configs
         self.button = button
         self.skip_recent_check = skip_recent_check
+        self.skip_digest = skip_digest
+        # 默认使用 bk_cmsi，测试时可替换为本地实现
+        self.cmsi = cmsi or api.bk_cmsi
 
     def send(self) -> None:
+        # 校验消息白名单
+        white_list = self._load_white_list()
+        if white_list:
+            self.notice_group.group_member = [u for u in self.notice_group.group_member if u in white_list]
+        # 获取支持的发送方式
+        msg_types = []
         for notice_config in self.notice_group.notice_config:
-            # 获取处理方法
             msg_type = notice_config.get("msg_type")
-            sender: callable = getattr(self, f"send_{msg_type}", None)
-            if sender is None:
+            if getattr(self, f"send_{msg_type}", None) is None:
                 logger.warn("[MsgTypeUnsupported] NoticeGroup => %s; MsgType => %s", self.notice_group.pk, msg_type)
                 continue
-            # 校验消息白名单
-            white_list = self._load_white_list()
-            if white_list:
-                self.notice_group.group_member = [u for u in self.notice_group.group_member if u in white_list]
-            # 记录日志
-            notice_log = self._record_send_log(msg_type)
-            # 校验聚合
-            if not self.skip_recent_check:
-                recent_log = self._check_recent_notice(notice_log, msg_type)
-                if recent_log is not None:
-                    msg = "[RecentSendCheckNotPass] NoticeLog => %s;" % recent_log.pk
-                    notice_log.is_duplicate = True
-                    notice_log.extra = msg
-                    notice_log.save(update_fields=["is_duplicate", "extra"])
-                    logger.info(msg)
-                    continue
+            msg_types.append(msg_type)
+        if not msg_types:
+            return
+        # 暂存等待聚合
+        if not self.skip_digest and settings.NOTICE_DIGEST_SECONDS > 0:
+            self._buffer(msg_types)
+            return
+        # 先记录日志，使并发发送的相同通知可以感知
+        notice_logs = [self._build_send_log(msg_type) for msg_type in msg_types]
+        for notice_log in notice_logs:
+            notice_log.save()
+        # 校验聚合
+        recent_logs = {} if self.skip_recent_check else self._load_recent_notice(notice_logs)
+        for notice_log in notice_logs:
+            recent_log_id = recent_logs.get(notice_log.md5)
+            if recent_log_id is not None:
+                self._mark_duplicate(notice_log, recent_log_id)
+                notice_log.save(update_fields=["is_duplicate", "extra"])
+                continue
             # 发送消息
             if self.notice_group.group_member:
-                notice_log.is_success, notice_log.extra = sender()
+                notice_log.is_success, notice_log.extra = self.send_by_msg_type(notice_log.msg_type)
                 notice_log.save(update_fields=["is_success", "extra"])
 
+    def _buffer(self, msg_types: List[str]) -> None:
+        """
+        校验聚合后暂存，重复通知仅记录日志
+        """
+
+        notice_logs = [self._build_send_log(msg_type) for msg_type in msg_types]
+        recent_logs = {} if self.skip_recent_check else self._load_recent_notice(notice_logs)
+        duplicate_logs = []
+        buffer_msg_types = []
+        for notice_log in notice_logs:
+            recent_log_id = recent_logs.get(notice_log.md5)
+            if recent_log_id is not None:
+                self._mark_duplicate(notice_log, recent_log_id)
+                duplicate_logs.append(notice_log)
+                continue
+            buffer_msg_types.append(notice_log.msg_type)
+        NoticeLog.objects.bulk_create(duplicate_logs, batch_size=NOTICE_LOG_BATCH_SIZE)
+        if buffer_msg_types:
+            NoticeDigestHandler.buffer(self, buffer_msg_types)
+
+    def _mark_duplicate(self, notice_log: NoticeLog, recent_log_id: int) -> None:
+        msg = "[RecentSendCheckNotPass] NoticeLog => %s;" % recent_log_id
+        notice_log.is_duplicate = True
+        notice_log.extra = msg
+        logger.info(msg)
+
+    def send_by_msg_type(self, msg_type: str) -> (bool, str):
+        sender: callable = getattr(self, f"send_{msg_type}")
+        return sender()
+
     def send_weixin(self) -> (bool, str):
         params = {
             "receiver__username": self.notice_group.group_member,
@@ -111,7 +171,7 @@ class NoticeHandler:
                 "message": self.weixin_content,
             },
         }
-        return self._call_api(api.bk_cmsi.send_weixin, **params)
+        return self._call_api(self.cmsi.send_weixin, **params)
 
     @property
     def weixin_content(self) -> str:
@@ -124,7 +184,7 @@ class NoticeHandler:
             "receiver__username": self.notice_group.group_member,
             "content": self.rtx_content,
         }
-        return self._call_api(api.bk_cmsi.send_rtx, **params)
+        return self._call_api(self.cmsi.send_rtx, **params)
 
     @property
     def rtx_content(self) -> str:
@@ -136,7 +196,7 @@ class NoticeHandler:
             "auto_read_message": self.voice_content,
             "receiver__username": self.notice_group.group_member,
         }
-        return self._call_api(api.bk_cmsi.send_voice, **params)
+        return self._call_api(self.cmsi.send_voice, **params)
 
     @property
     def voice_content(self) -> str:
@@ -150,7 +210,7 @@ class NoticeHandler:
             "title": self.title,
             "content": self.sms_content,
         }
-        return self._call_api(api.bk_cmsi.send_msg, **params)
+        return self._call_api(self.cmsi.send_msg, **params)
 
     @property
     def sms_content(self) -> str:
@@ -163,7 +223,7 @@ class NoticeHandler:
             "title": self.title,
             "content": self.mail_content,
         }
-        return self._call_api(api.bk_cmsi.send_mail, **params)
+        return self._call_api(self.cmsi.send_mail, **params)
 
     @property
     def mail_content(self) -> str:
@@ -174,11 +234,8 @@ class NoticeHandler:
             "footer_content": gettext("此为系统邮件，由蓝鲸审计中心自动发送，请勿回复"),
             "button": self.button,
         }
-        template_content: str = self.configs.get("_mail_template", "")
-        if not template_content:
-            with open(os.path.join(settings.BASE_DIR, BK_AUDIT_MAIL_DEFAULT_TEMPLATE), "r") as file:
-                template_content = file.read()
-        return BackendTemplate(Template(template_content), engines.all()[0]).render(context=context)
+        template_content: str = self.configs.get("_mail_template", "") or load_default_mail_template()
+        return compile_mail_template(template_content).render(context=context)
 
     def _call_api(self, api_resource: callable, **params) -> (bool, str):
         try:
@@ -193,8 +250,8 @@ class NoticeHandler:
             logger.error(msg)
             return False, msg
 
-    def _record_send_log(self, msg_type) -> NoticeLog:
-        return NoticeLog.objects.create(
+    def _build_send_log(self, msg_type) -> NoticeLog:
+        return NoticeLog(
             msg_type=msg_type,
             title=self.title,
             content=self.content.to_string(),
@@ -204,12 +261,25 @@ class NoticeHandler:
             trace_id=self.get_current_trace_id(self.__class__.__name__),
         )
 
-    def _check_recent_notice(self, notice_log: NoticeLog, msg_type: str) -> NoticeLog:
-        md5 = NoticeLog.build_hash(self.notice_group.group_member, msg_type, self.title, self.content)
+    def _load_recent_notice(self, notice_logs: List[NoticeLog]) -> Dict[str, int]:
+        """
+        一次查询所有发送方式的近期通知，返回 md5 与日志ID的映射
+        已记录的日志仅以早于自身的日志为准，避免并发发送时互相判定为重复
+        """
+
+        log_ids = {notice_log.md5: notice_log.log_id for notice_log in notice_logs}
         send_at = int(
             (datetime.datetime.now() - datetime.timedelta(minutes=settings.NOTICE_AGG_MINUTES)).timestamp() * 1000
         )
-        return NoticeLog.objects.filter(md5=md5, send_at__gte=send_at).exclude(log_id=notice_log.log_id).first()
+        recent_logs = {}
+        for md5, log_id in (
+            NoticeLog.objects.filter(md5__in=log_ids.keys(), send_at__gte=send_at)
+            .order_by("log_id")
+            .values_list("md5", "log_id")
+        ):
+            if log_ids[md5] is None or log_id < log_ids[md5]:
+                recent_logs.setdefault(md5, log_id)
+        return recent_logs
 
     def _load_white_list(self) -> List[str]:
         return GlobalMetaConfig.get(NOTICE_WHITELIST_USER_KEY, default=[])
@@ -224,6 +294,139 @@ class NoticeHandler:
             return ""
 
 
+class NoticeDigestHandler:
+    """
+    通知摘要
+    同一接收人与发送方式的通知在聚合窗口内暂存，窗口到期后合并为一条消息发送
+    """
+
+    def __init__(self, cmsi=None):
+        self.cmsi = cmsi
+
+    @classmethod
+    def buffer(cls, handler: NoticeHandler, msg_types: List[str]) -> None:
+        """
+        暂存通知
+        """
+
+        buffered_at = int(datetime.datetime.now().timestamp() * 1000)
+        receivers = handler.notice_group.group_member
+        NoticeBuffer.objects.bulk_create(
+            [
+                NoticeBuffer(
+                    digest_key=NoticeBuffer.build_digest_key(receivers, msg_type),
+                    msg_type=msg_type,
+                    receivers=receivers,
+                    title=str(handler.title),
+                    content=handler.content.to_json(),
+                    button=handler.button.to_json() if handler.button else None,
+                    configs=handler.configs,
+                    buffered_at=buffered_at,
+                )
+                for msg_type in msg_types
+            ],
+            batch_size=NOTICE_LOG_BATCH_SIZE,
+        )
+
+    def flush(self, force: bool = False) -> int:
+        """
+        发送聚合窗口已到期的通知，返回发送的消息数
+        """
+
+        # 获取到期的聚合Key
+        expired_at = int(
+            (datetime.datetime.now() - datetime.timedelta(seconds=settings.NOTICE_DIGEST_SECONDS)).timestamp() * 1000
+        )
+        digest_keys = NoticeBuffer.objects.values("digest_key").annotate(first_buffered_at=Min("buffered_at"))
+        if not force:
+            digest_keys = digest_keys.filter(first_buffered_at__lte=expired_at)
+        digest_keys = [item["digest_key"] for item in digest_keys]
+        if not digest_keys:
+            return 0
+        # 逐组发送
+        buffers = group_by(
+            NoticeBuffer.objects.filter(digest_key__in=digest_keys),
+            key=lambda buffer: buffer.digest_key,
+            sorted_key=lambda buffer: (buffer.digest_key, buffer.buffer_id),
+        )
+        send_count = 0
+        for items in buffers.values():
+            for index in range(0, len(items), NOTICE_DIGEST_MAX_SIZE):
+                chunk = items[index : index + NOTICE_DIGEST_MAX_SIZE]
+                # 逐条摘要记录日志并清理，避免中途异常导致已发送的摘要重复发送
+                NoticeLog.objects.bulk_create(self._send_digest(chunk), batch_size=NOTICE_LOG_BATCH_SIZE)
+                NoticeBuffer.objects.filter(buffer_id__in=[item.buffer_id for item in chunk]).delete()
+                send_count += 1
+        return send_count
+
+    def _send_digest(self, items: List[NoticeBuffer]) -> List[NoticeLog]:
+        # 相同通知在摘要中仅保留一条
+        contents = {item.buffer_id: NoticeContent.from_json(item.content) for item in items}
+        md5s = {
+            item.buffer_id: NoticeLog.build_hash(item.receivers, item.msg_type, item.title, contents[item.buffer_id])
+            for item in items
+        }
+        unique_items: Dict[str, NoticeBuffer] = {}
+        for item in items:
+            unique_items.setdefault(md5s[item.buffer_id], item)
+        digest_items = list(unique_items.values())
+        first = digest_items[0]
+        # 单条通知保持原样，多条合并为摘要
+        if len(digest_items) == 1:
+            title = first.title
+            content = contents[first.buffer_id]
+            button = NoticeButton.from_json(first.button)
+        else:
+            title = gettext("%(title)s 等 %(count)d 条通知") % {"title": first.title, "count": len(digest_items)}
+            content = NoticeContent(
+                *[
+                    NoticeContentConfig(
+                        key=f"notice_{item.buffer_id}",
+                        name=item.title,
+                        value=contents[item.buffer_id].to_string(),
+                    )
+                    for item in digest_items
+                ]
+            )
+            button = None
+        handler = NoticeHandler(
+            notice_group=NoticeGroup(group_member=first.receivers, notice_config=[{"msg_type": first.msg_type}]),
+            title=title,
+            content=content,
+            button=button,
+            skip_recent_check=True,
+            skip_digest=True,
+            cmsi=self.cmsi,
+            **first.configs,
+        )
+        is_success, extra = (
+            handler.send_by_msg_type(first.msg_type) if first.receivers else (False, "[DigestReceiversEmpty]")
+        )
+        # 每条原始通知均记录日志，便于追溯
+        send_at = int(datetime.datetime.now().timestamp() * 1000)
+        trace_id = NoticeHandler.get_current_trace_id(self.__class__.__name__)
+        notice_logs = []
+        for item in items:
+            notice_log = NoticeLog(
+                msg_type=item.msg_type,
+                title=item.title,
+                content=contents[item.buffer_id].to_string(),
+                md5=md5s[item.buffer_id],
+                send_at=send_at,
+                receivers=item.receivers,
+                trace_id=trace_id,
+                is_success=is_success,
+                extra=extra,
+            )
+            digest_item = unique_items[md5s[item.buffer_id]]
+            if digest_item is not item:
+                notice_log.is_success = False
+                notice_log.is_duplicate = True
+                notice_log.extra = "[DigestDuplicate] NoticeBuffer => %s;" % digest_item.buffer_id
+            notice_logs.append(notice_log)
+        return notice_logs
+
+
 class ErrorMsgHandler:
     """
     异常消息通知
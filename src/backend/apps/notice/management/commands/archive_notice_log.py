@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from apps.notice.archive import NoticeLogArchivePolicy
+from core.archive import BaseArchiveCommand
+
+
+class Command(BaseArchiveCommand):
+    """
+    将超过保留期的通知日志迁移至归档表
+    python manage.py archive_notice_log
+    python manage.py archive_notice_log --batch-size 500 --sleep 1 --max-batches 100
+    python manage.py archive_notice_log --dry-run
+    """
+
+    policy_class = NoticeLogArchivePolicy
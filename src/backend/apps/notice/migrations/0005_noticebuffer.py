@@ -0,0 +1,43 @@
+# Generated by Django 3.2.18 on 2026-10-19 10:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notice", "0004_auto_20230907_1906"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoticeBuffer",
+            fields=[
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="创建时间")),
+                (
+                    "created_by",
+                    models.CharField(blank=True, default="", max_length=32, null=True, verbose_name="创建者"),
+                ),
+                ("updated_at", models.DateTimeField(blank=True, null=True, verbose_name="更新时间")),
+                (
+                    "updated_by",
+                    models.CharField(blank=True, default="", max_length=32, null=True, verbose_name="修改者"),
+                ),
+                ("buffer_id", models.BigAutoField(primary_key=True, serialize=False, verbose_name="ID")),
+                ("digest_key", models.CharField(db_index=True, max_length=255, verbose_name="聚合Key")),
+                ("msg_type", models.CharField(max_length=255, verbose_name="发送方式")),
+                ("receivers", models.JSONField(default=list, verbose_name="收件人")),
+                ("title", models.TextField(blank=True, null=True, verbose_name="标题")),
+                ("content", models.JSONField(default=list, verbose_name="内容")),
+                ("button", models.JSONField(blank=True, null=True, verbose_name="按钮")),
+                ("configs", models.JSONField(default=dict, verbose_name="发送配置")),
+                ("buffered_at", models.BigIntegerField(db_index=True, verbose_name="暂存时间")),
+            ],
+            options={
+                "verbose_name": "待聚合通知",
+                "verbose_name_plural": "待聚合通知",
+                "ordering": ["buffer_id"],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notice", "0005_noticebuffer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoticeLogArchive",
+            fields=[
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="创建时间")),
+                (
+                    "created_by",
+                    models.CharField(blank=True, default="", max_length=32, null=True, verbose_name="创建者"),
+                ),
+                ("updated_at", models.DateTimeField(blank=True, null=True, verbose_name="更新时间")),
+                (
+                    "updated_by",
+                    models.CharField(blank=True, default="", max_length=32, null=True, verbose_name="修改者"),
+                ),
+                ("log_id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+                ("msg_type", models.CharField(max_length=255, verbose_name="发送方式")),
+                ("title", models.TextField(blank=True, null=True, verbose_name="标题")),
+                ("content", models.TextField(blank=True, null=True, verbose_name="内容")),
+                ("md5", models.CharField(max_length=255, verbose_name="消息Hash值")),
+                ("receivers", models.JSONField(blank=True, null=True, verbose_name="收件人")),
+                ("send_at", models.BigIntegerField(db_index=True, verbose_name="发送时间")),
+                ("trace_id", models.CharField(blank=True, max_length=255, null=True, verbose_name="Trace ID")),
+                ("is_success", models.BooleanField(default=False, verbose_name="是否成功")),
+                ("is_duplicate", models.BooleanField(default=False, verbose_name="是否重复")),
+                ("extra", models.TextField(blank=True, null=True, verbose_name="拓展信息")),
+            ],
+            options={
+                "verbose_name": "消息记录归档",
+                "verbose_name_plural": "消息记录归档",
+                "ordering": ["-log_id"],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notice", "0006_noticelogarchive"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="noticelog",
+            name="send_at",
+            field=models.BigIntegerField(db_index=True, verbose_name="发送时间"),
+        ),
+    ]
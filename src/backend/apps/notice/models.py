@@ -16,6 +16,8 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+from typing import List, Optional
+
 from bk_audit.log.models import AuditInstance
 from bk_resource.utils.common_utils import get_md5
 from django.db import models
@@ -50,6 +52,16 @@ class NoticeContent:
         ]
         return "\n".join(data)
 
+    def to_json(self) -> List[dict]:
+        return [
+            {"key": content_config.key, "name": str(content_config.display_name), "value": str(content_config.value)}
+            for content_config in self.content_configs
+        ]
+
+    @classmethod
+    def from_json(cls, data: List[dict]) -> "NoticeContent":
+        return cls(*[NoticeContentConfig(**content_config) for content_config in data])
+
 
 class NoticeButton:
     """
@@ -60,6 +72,13 @@ class NoticeButton:
         self.text = text
         self.url = url
 
+    def to_json(self) -> dict:
+        return {"text": str(self.text), "url": self.url}
+
+    @classmethod
+    def from_json(cls, data: Optional[dict]) -> Optional["NoticeButton"]:
+        return cls(**data) if data else None
+
 
 class NoticeGroupAuditInstance(AuditInstance):
     """
@@ -117,7 +136,7 @@ class NoticeLog(OperateRecordModel):
     content = models.TextField(gettext_lazy("内容"), null=True, blank=True)
     md5 = models.CharField(gettext_lazy("消息Hash值"), max_length=255)
     receivers = models.JSONField(gettext_lazy("收件人"), null=True, blank=True)
-    send_at = models.BigIntegerField(gettext_lazy("发送时间"))
+    send_at = models.BigIntegerField(gettext_lazy("发送时间"), db_index=True)
     trace_id = models.CharField(gettext_lazy("Trace ID"), null=True, blank=True, max_length=255)
     is_success = models.BooleanField(gettext_lazy("是否成功"), default=False)
     is_duplicate = models.BooleanField(gettext_lazy("是否重复"), default=False)
@@ -132,3 +151,53 @@ class NoticeLog(OperateRecordModel):
     @classmethod
     def build_hash(cls, receivers: list, msg_type: str, title: str, content: NoticeContent) -> str:
         return get_md5({"receiver": receivers, "msg_type": msg_type, "title": title, "content": content.to_string()})
+
+
+class NoticeLogArchive(OperateRecordModel):
+    """
+    消息记录归档
+    超过保留期的消息记录
+    """
+
+    log_id = models.BigIntegerField(gettext_lazy("ID"), primary_key=True)
+    msg_type = models.CharField(gettext_lazy("发送方式"), max_length=255)
+    title = models.TextField(gettext_lazy("标题"), null=True, blank=True)
+    content = models.TextField(gettext_lazy("内容"), null=True, blank=True)
+    md5 = models.CharField(gettext_lazy("消息Hash值"), max_length=255)
+    receivers = models.JSONField(gettext_lazy("收件人"), null=True, blank=True)
+    send_at = models.BigIntegerField(gettext_lazy("发送时间"), db_index=True)
+    trace_id = models.CharField(gettext_lazy("Trace ID"), null=True, blank=True, max_length=255)
+    is_success = models.BooleanField(gettext_lazy("是否成功"), default=False)
+    is_duplicate = models.BooleanField(gettext_lazy("是否重复"), default=False)
+    extra = models.TextField(gettext_lazy("拓展信息"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("消息记录归档")
+        verbose_name_plural = verbose_name
+        ordering = ["-log_id"]
+
+
+class NoticeBuffer(OperateRecordModel):
+    """
+    待聚合通知
+    同一接收人与发送方式的通知在聚合窗口内暂存，到期后合并为一条摘要发送
+    """
+
+    buffer_id = models.BigAutoField(gettext_lazy("ID"), primary_key=True)
+    digest_key = models.CharField(gettext_lazy("聚合Key"), max_length=255, db_index=True)
+    msg_type = models.CharField(gettext_lazy("发送方式"), max_length=255)
+    receivers = models.JSONField(gettext_lazy("收件人"), default=list)
+    title = models.TextField(gettext_lazy("标题"), null=True, blank=True)
+    content = models.JSONField(gettext_lazy("内容"), default=list)
+    button = models.JSONField(gettext_lazy("按钮"), null=True, blank=True)
+    configs = models.JSONField(gettext_lazy("发送配置"), default=dict)
+    buffered_at = models.BigIntegerField(gettext_lazy("暂存时间"), db_index=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("待聚合通知")
+        verbose_name_plural = verbose_name
+        ordering = ["buffer_id"]
+
+    @classmethod
+    def build_digest_key(cls, receivers: list, msg_type: str) -> str:
+        return get_md5({"receiver": sorted(receivers), "msg_type": msg_type})
@@ -16,7 +16,11 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from celery.task import task
+from celery.schedules import crontab
+from celery.task import periodic_task, task
+from django.conf import settings
+
+from core.utils.tools import single_task_decorator
 
 
 @task(queue="notice")
@@ -24,3 +28,13 @@ def send_notice(*args, **kwargs):
     from apps.notice.handlers import NoticeHandler
 
     NoticeHandler(*args, **kwargs).send()
+
+
+@periodic_task(run_every=crontab(minute="*/1"), queue="notice")
+@single_task_decorator
+def flush_notice_digest():
+    """发送到期的聚合通知，关闭聚合后立即发送剩余通知"""
+
+    from apps.notice.handlers import NoticeDigestHandler
+
+    NoticeDigestHandler().flush(force=settings.NOTICE_DIGEST_SECONDS <= 0)
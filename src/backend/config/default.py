@@ -30,6 +30,7 @@ from core.utils.distutils import strtobool
 INSTALLED_APPS = ("simpleui",) + INSTALLED_APPS
 INSTALLED_APPS += (
     "corsheaders",
+    "core",
     "apps.audit",
     "apps.meta",
     "apps.permission",
@@ -53,6 +54,7 @@ MIDDLEWARE += (
     "apigw_manager.apigw.authentication.ApiGatewayJWTGenericMiddleware",  # JWT 认证
     "apigw_manager.apigw.authentication.ApiGatewayJWTAppMiddleware",  # JWT 透传的应用信息
     "apigw_manager.apigw.authentication.ApiGatewayJWTUserMiddleware",  # JWT 透传的用户信息
+    "core.middleware.profiling.RequestProfilingMiddleware",  # 请求性能分析，默认关闭
 )
 
 # 默认数据库自增字段
@@ -168,6 +170,7 @@ BK_RESOURCE = {
     "PLATFORM_AUTH_ENABLED": strtobool(os.getenv("BKAPP_PLATFORM_AUTH_ENABLED", "True")),
     "PLATFORM_AUTH_ACCESS_TOKEN": os.getenv("BKAPP_PLATFORM_AUTH_ACCESS_TOKEN"),
     "PLATFORM_AUTH_ACCESS_USERNAME": os.getenv("BKAPP_PLATFORM_AUTH_ACCESS_USERNAME"),
+    "REQUEST_LOG_HANDLER": "core.log.ProfilingRequestLogHandler",
 }
 
 APPEND_SLASH = False
@@ -202,6 +205,9 @@ else:
 # BkBase
 BK_BASE_ACCESS_URL = os.getenv("BKAPP_BK_BASE_ACCESS_URL", "/#/data-hub-detail/index/")
 HTTP_PULL_REDIS_TIMEOUT = os.getenv("BKAPP_HTTP_PULL_REDIS_TIMEOUT", "360d")
+SNAPSHOT_PROVISION_CONCURRENCY = int(os.getenv("BKAPP_SNAPSHOT_PROVISION_CONCURRENCY", 5))
+STORAGE_CLUSTER_CACHE_TIMEOUT = int(os.getenv("BKAPP_STORAGE_CLUSTER_CACHE_TIMEOUT", 30))
+STORAGE_PROBE_CONCURRENCY = int(os.getenv("BKAPP_STORAGE_PROBE_CONCURRENCY", 10))
 
 # IAM
 BK_IAM_SYSTEM_ID = APP_CODE
@@ -263,6 +269,8 @@ SNAPSHOT_USERINFO_RESOURCE_TOKEN = os.getenv("BKAPP_FETCH_USER_INFO_TOKEN", "")
 
 # Notice
 NOTICE_AGG_MINUTES = int(os.getenv("BKAPP_NOTICE_AGG_MINUTES", 30))
+# 通知摘要聚合窗口，为 0 时不聚合
+NOTICE_DIGEST_SECONDS = int(os.getenv("BKAPP_NOTICE_DIGEST_SECONDS", 0))
 
 # Event
 EVENT_ES_CLUSTER_ID = int(os.getenv("BKAPP_EVENT_ES_CLUSTER_ID", 0))
@@ -292,6 +300,38 @@ BK_SOPS_APP_CODE = os.getenv("BKAPP_BK_SOPS_APP_CODE", "bk_sops")
 # Risk
 ENABLE_PROCESS_RISK_TASK = strtobool(os.getenv("BKAPP_ENABLE_PROCESS_RISK_TASK", "True"))
 
+# Audit 审计事件异步输出
+BK_AUDIT_ASYNC_EXPORT = strtobool(os.getenv("BKAPP_AUDIT_ASYNC_EXPORT", "True"))
+BK_AUDIT_BUFFER_SIZE = int(os.getenv("BKAPP_AUDIT_BUFFER_SIZE", 10000))
+BK_AUDIT_BATCH_SIZE = int(os.getenv("BKAPP_AUDIT_BATCH_SIZE", 500))
+BK_AUDIT_FLUSH_INTERVAL = float(os.getenv("BKAPP_AUDIT_FLUSH_INTERVAL", 1))
+BK_AUDIT_DROP_POLICY = os.getenv("BKAPP_AUDIT_DROP_POLICY", "drop_oldest")
+
+# Archive 数据归档
+DATA_ARCHIVE_BATCH_SIZE = int(os.getenv("BKAPP_DATA_ARCHIVE_BATCH_SIZE", 1000))
+DATA_ARCHIVE_SLEEP_SECONDS = float(os.getenv("BKAPP_DATA_ARCHIVE_SLEEP_SECONDS", 0.5))
+NOTICE_LOG_RETENTION_DAYS = int(os.getenv("BKAPP_NOTICE_LOG_RETENTION_DAYS", 30))
+TICKET_NODE_RETENTION_DAYS = int(os.getenv("BKAPP_TICKET_NODE_RETENTION_DAYS", 180))
+
+# API Stand-in 压测替身，开启后所有 BK-API 请求转发至本地替身服务
+# python manage.py run_api_standin
+API_STANDIN_ENABLED = strtobool(os.getenv("BKAPP_API_STANDIN_ENABLED", "False"))
+API_STANDIN_URL = os.getenv("BKAPP_API_STANDIN_URL", "http://127.0.0.1:8787")
+API_STANDIN_PROFILE = {
+    # 平均耗时及抖动 (秒)
+    "latency": float(os.getenv("BKAPP_API_STANDIN_LATENCY", 0.05)),
+    "jitter": float(os.getenv("BKAPP_API_STANDIN_JITTER", 0.02)),
+    # 返回 500 的比例
+    "error_rate": float(os.getenv("BKAPP_API_STANDIN_ERROR_RATE", 0)),
+    # 超时的比例及超时时长 (秒)
+    "timeout_rate": float(os.getenv("BKAPP_API_STANDIN_TIMEOUT_RATE", 0)),
+    "timeout": float(os.getenv("BKAPP_API_STANDIN_TIMEOUT", 65)),
+    # ES 查询返回的总条数
+    "es_total": int(os.getenv("BKAPP_API_STANDIN_ES_TOTAL", 1000)),
+}
+# 按模块覆盖，如 {"bk_log": {"latency": 0.2}, "bk_itsm": {"error_rate": 0.01}}
+API_STANDIN_MODULE_PROFILES = {}
+
 """
 以下为框架代码 请勿修改
 """
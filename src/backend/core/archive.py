@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import abc
+import datetime
+import json
+import time
+from typing import List, Type
+
+from blueapps.utils.logger import logger
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class BaseArchivePolicy(abc.ABC):
+    """
+    数据归档策略
+    将超过保留期的数据由热表迁移至归档表，热表仅保留近期数据
+    """
+
+    name: str = None
+    model: Type[models.Model] = None
+    archive_model: Type[models.Model] = None
+
+    @property
+    @abc.abstractmethod
+    def retention_days(self) -> int:
+        raise NotImplementedError()
+
+    @property
+    def cutoff(self) -> datetime.datetime:
+        return timezone.now() - datetime.timedelta(days=self.retention_days)
+
+    @abc.abstractmethod
+    def candidates(self) -> models.QuerySet:
+        """
+        待归档数据的主键，需按主键或时间有序
+        """
+
+        raise NotImplementedError()
+
+    def build_archive(self, instance: models.Model) -> models.Model:
+        return self.archive_model(
+            **{
+                field.attname: getattr(instance, field.attname)
+                for field in self.archive_model._meta.concrete_fields
+                if hasattr(instance, field.attname)
+            }
+        )
+
+    def archive(self, pks: List) -> int:
+        """
+        归档一批数据，写入归档表与删除热表在同一事务中完成
+        """
+
+        with transaction.atomic():
+            instances = list(self.model._base_manager.select_for_update().filter(pk__in=pks))
+            if not instances:
+                return 0
+            self.archive_model._base_manager.bulk_create(
+                [self.build_archive(instance) for instance in instances], ignore_conflicts=True
+            )
+            self.model._base_manager.filter(pk__in=[instance.pk for instance in instances]).delete()
+        return len(instances)
+
+
+class ArchiveHandler:
+    """
+    分批归档，每批之间休眠以降低对数据库的影响
+    """
+
+    def __init__(
+        self,
+        policy: BaseArchivePolicy,
+        batch_size: int = None,
+        sleep_seconds: float = None,
+        max_batches: int = None,
+    ):
+        self.policy = policy
+        self.batch_size = batch_size or settings.DATA_ARCHIVE_BATCH_SIZE
+        self.sleep_seconds = settings.DATA_ARCHIVE_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+        self.max_batches = max_batches
+
+    def count(self) -> int:
+        return self.policy.candidates().count()
+
+    def run(self) -> dict:
+        archived = 0
+        batches = 0
+        start_time = time.time()
+        while self.max_batches is None or batches < self.max_batches:
+            pks = list(self.policy.candidates()[: self.batch_size])
+            if not pks:
+                break
+            archived += self.policy.archive(pks)
+            batches += 1
+            logger.info("[ArchiveBatch] Policy => %s; Batch => %s; Archived => %s", self.policy.name, batches, archived)
+            if len(pks) < self.batch_size:
+                break
+            time.sleep(self.sleep_seconds)
+        return {
+            "policy": self.policy.name,
+            "archived": archived,
+            "batches": batches,
+            "duration": round(time.time() - start_time, 3),
+        }
+
+
+class BaseArchiveCommand(BaseCommand):
+    """
+    归档命令基类，各应用在自身的 management/commands 下声明归档策略
+    """
+
+    policy_class: Type[BaseArchivePolicy] = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--sleep", type=float, default=None, help="seconds between batches")
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--dry-run", action="store_true", default=False)
+
+    def handle(self, *args, **kwargs):
+        policy = self.policy_class()
+        handler = ArchiveHandler(
+            policy,
+            batch_size=kwargs["batch_size"],
+            sleep_seconds=kwargs["sleep"],
+            max_batches=kwargs["max_batches"],
+        )
+        if kwargs["dry_run"]:
+            result = {"policy": policy.name, "cutoff": str(policy.cutoff), "candidates": handler.count()}
+        else:
+            result = handler.run()
+        self.stdout.write(json.dumps(result, ensure_ascii=False))
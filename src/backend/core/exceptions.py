@@ -110,3 +110,9 @@ class RiskRuleInUse(BlueException):
     ERROR_CODE = "400"
     MESSAGE = gettext_lazy("该处理规则有未关单风险")
     STATUS_CODE = 400
+
+
+class RiskListCursorInvalid(BlueException):
+    ERROR_CODE = "400"
+    MESSAGE = gettext_lazy("风险列表游标无效")
+    STATUS_CODE = 400
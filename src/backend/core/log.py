@@ -21,9 +21,13 @@ import logging
 import os
 
 import json_log_formatter
+from bk_resource.utils.request_log import RequestLogHandler
 from django.conf import settings
 from rest_framework.settings import api_settings
 
+from core.profiling import get_current_profile, profiling_config
+from core.utils.metrics import metrics
+
 
 class JsonLogFormatter(json_log_formatter.JSONFormatter):
     """
@@ -56,3 +60,19 @@ class JsonLogFormatter(json_log_formatter.JSONFormatter):
             extra["exc_info"] = self.formatException(record.exc_info)
 
         return extra
+
+
+class ProfilingRequestLogHandler(RequestLogHandler):
+    """
+    Resource 请求日志，开启请求性能分析时同时统计各 Resource 与 API 的耗时
+    """
+
+    def record(self):
+        super().record()
+        if not profiling_config.get().enabled:
+            return
+        seconds = (self.end_time - self.start_time).total_seconds()
+        metrics.histogram("resource_latency_ms", seconds * 1000, self.resource_name)
+        profile = get_current_profile()
+        if profile is not None:
+            profile.record_resource(self.resource_name, seconds)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import (
+    ProfilingConfig,
+    get_profile_record,
+    list_profile_records,
+    profiling_config,
+)
+
+
+class Command(BaseCommand):
+    """
+    请求性能分析
+    python manage.py request_profile config
+    python manage.py request_profile enable --sample-rate 0.01 --users admin --slow-threshold 500
+    python manage.py request_profile disable
+    python manage.py request_profile list
+    python manage.py request_profile show <record_id> [--html profile.html]
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["config", "enable", "disable", "list", "show"])
+        parser.add_argument("record_id", nargs="?")
+        parser.add_argument("--sample-rate", type=float, default=0)
+        parser.add_argument("--users", default="", help="usernames split by comma")
+        parser.add_argument("--slow-threshold", type=int, default=ProfilingConfig.slow_threshold_ms)
+        parser.add_argument("--html", help="save html profile to this path")
+
+    def handle(self, *args, **kwargs):
+        action = kwargs["action"]
+        if action == "enable":
+            profiling_config.set(
+                ProfilingConfig(
+                    enabled=True,
+                    profile_sample_rate=kwargs["sample_rate"],
+                    profile_users=[user for user in kwargs["users"].split(",") if user],
+                    slow_threshold_ms=kwargs["slow_threshold"],
+                )
+            )
+        elif action == "disable":
+            profiling_config.set(ProfilingConfig(enabled=False))
+        elif action == "list":
+            for record in list_profile_records():
+                self.stdout.write(json.dumps(record, ensure_ascii=False))
+            return
+        elif action == "show":
+            self.show(kwargs["record_id"], kwargs["html"])
+            return
+        self.stdout.write(json.dumps(profiling_config.get().to_json(), ensure_ascii=False))
+
+    def show(self, record_id: str, html_path: str) -> None:
+        if not record_id:
+            raise CommandError("record_id is required")
+        record = get_profile_record(record_id)
+        if record is None:
+            raise CommandError(f"profile record {record_id} not found")
+        if html_path:
+            with open(html_path, "w", encoding="utf-8") as file:
+                file.write(record["html"])
+        summary = {key: val for key, val in record.items() if key not in ["text", "html"]}
+        self.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2))
+        self.stdout.write(record["text"])
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.standin.server import StandInRouter, build_server
+
+
+class Command(BaseCommand):
+    """
+    启动 BK-API 压测替身服务，需设置 BKAPP_API_STANDIN_ENABLED=True
+    python manage.py run_api_standin
+    python manage.py run_api_standin --routes
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--routes", action="store_true", default=False, help="list routes and exit")
+
+    def handle(self, *args, **kwargs):
+        if not settings.API_STANDIN_ENABLED:
+            raise CommandError("API_STANDIN_ENABLED is not set")
+        router = StandInRouter()
+        if kwargs["routes"]:
+            for route in router.routes:
+                self.stdout.write(f"{route.method:<6} {route.pattern.pattern} => {route.key}")
+            return
+        url = urlparse(settings.API_STANDIN_URL)
+        server = build_server(url.hostname, url.port or 80, router)
+        self.stdout.write(f"api stand-in listening on {settings.API_STANDIN_URL}, {len(router.routes)} routes")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
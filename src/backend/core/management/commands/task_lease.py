@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.utils.lock import TaskLease
+from core.utils.tools import single_task_cache_key_by_name
+
+
+class Command(BaseCommand):
+    """
+    查看或强制释放定时任务租约
+    python manage.py task_lease sync_bkm_alert
+    python manage.py task_lease sync_bkm_alert --release
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("task_names", nargs="+", help="task function name")
+        parser.add_argument("--release", action="store_true", default=False)
+
+    def handle(self, *args, **kwargs):
+        for task_name in kwargs["task_names"]:
+            lease = TaskLease(single_task_cache_key_by_name(task_name))
+            info = lease.inspect()
+            self.stdout.write(json.dumps({"task": task_name, "lease": info}, ensure_ascii=False))
+            if info and kwargs["release"]:
+                self.stdout.write(f"[{task_name}] released => {lease.force_release()}")
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import time
+from contextlib import ExitStack
+
+from blueapps.utils.logger import logger
+from blueapps.utils.request_provider import get_or_create_local_request_id
+from django.db import connections
+from pyinstrument import Profiler
+from rest_framework.settings import api_settings
+
+from core.profiling import (
+    PROFILING_METRIC_NAMES,
+    PROFILING_METRICS_REPORT_INTERVAL,
+    PROFILING_REQUEST_HEADER,
+    RequestProfile,
+    SqlCounter,
+    profiling_config,
+    reset_current_profile,
+    save_profile_record,
+    set_current_profile,
+    should_profile,
+)
+from core.utils.metrics import metrics
+
+
+class RequestProfilingMiddleware:
+    """
+    请求性能分析
+    开启后统计请求耗时、SQL 数量与耗时、Resource 及 API 调用，按配置采样使用 pyinstrument 分析
+    配置通过 python manage.py request_profile 修改，无需重启
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.last_report = time.monotonic()
+
+    def __call__(self, request):
+        config = profiling_config.get()
+        if not config.enabled:
+            return self.get_response(request)
+
+        user = getattr(request, "user", None)
+        username = getattr(user, "username", "") or ""
+        requested = bool(request.META.get(PROFILING_REQUEST_HEADER)) and (
+            getattr(user, "is_superuser", False) or username in config.profile_users
+        )
+        profiler = Profiler() if should_profile(config, username, requested) else None
+
+        profile = RequestProfile(request.path, username)
+        token = set_current_profile(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(SqlCounter(profile)))
+                if profiler:
+                    profiler.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler:
+                        profiler.stop()
+        finally:
+            profile.duration = time.perf_counter() - start
+            reset_current_profile(token)
+
+        record_id = self.record(request, profile, profiler, config.slow_threshold_ms)
+        if record_id:
+            response["X-Bkaudit-Profile-Id"] = record_id
+        return response
+
+    def record(self, request, profile: RequestProfile, profiler: Profiler, slow_threshold_ms: int) -> str:
+        view_name = getattr(getattr(request, "resolver_match", None), "view_name", "") or "unknown"
+        metrics.histogram("request_latency_ms", profile.duration * 1000, view_name)
+        metrics.observe("request_sql_count", profile.sql_count, view_name)
+        metrics.observe("request_api_count", profile.api_count, view_name)
+
+        if time.monotonic() - self.last_report >= PROFILING_METRICS_REPORT_INTERVAL:
+            self.last_report = time.monotonic()
+            logger.info("[RequestProfileMetrics] %s", {name: metrics.snapshot(name) for name in PROFILING_METRIC_NAMES})
+
+        data = profile.to_json()
+        if data["duration_ms"] >= slow_threshold_ms:
+            logger.info("[RequestProfile] View => %s; Profile => %s", view_name, data)
+        if not profiler:
+            return ""
+        record_id = get_or_create_local_request_id()
+        save_profile_record(
+            record_id,
+            {
+                **data,
+                "id": record_id,
+                "view_name": view_name,
+                "created_at": datetime.datetime.now().strftime(api_settings.DATETIME_FORMAT),
+                "text": profiler.output_text(unicode=True, color=False),
+                "html": profiler.output_html(),
+            },
+        )
+        return record_id
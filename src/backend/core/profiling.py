@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Union
+
+from django.core.cache import cache
+
+from core.constants import TimeEnum
+
+# 配置存储在缓存中，各进程定期刷新，修改后最多 PROFILING_CONFIG_REFRESH 秒生效
+PROFILING_CONFIG_KEY = "request_profiling:config"
+PROFILING_CONFIG_REFRESH = 10
+PROFILING_RECORD_KEY = "request_profiling:record:{}"
+PROFILING_INDEX_KEY = "request_profiling:index"
+PROFILING_INDEX_SIZE = 100
+PROFILING_RECORD_TIMEOUT = TimeEnum.ONE_DAY_SECOND.value
+# 进程内统计指标输出到日志的间隔
+PROFILING_METRICS_REPORT_INTERVAL = 60
+PROFILING_METRIC_NAMES = ["request_latency_ms", "request_sql_count", "request_api_count", "resource_latency_ms"]
+# 主动请求 Profile 的请求头，仅超级管理员或指定用户可用
+PROFILING_REQUEST_HEADER = "HTTP_X_BKAUDIT_PROFILE"
+
+
+@dataclass
+class ProfilingConfig:
+    """
+    请求性能分析配置
+    enabled: 统计请求、Resource、SQL 及 API 调用的耗时与次数
+    profile_sample_rate: 随机采样使用 pyinstrument 分析的比例
+    profile_users: 这些用户的请求均使用 pyinstrument 分析
+    slow_threshold_ms: 超过该耗时的请求输出统计日志
+    """
+
+    enabled: bool = False
+    profile_sample_rate: float = 0
+    profile_users: List[str] = field(default_factory=list)
+    slow_threshold_ms: int = 1000
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: Union[dict, None]) -> "ProfilingConfig":
+        data = data or {}
+        return cls(**{key: val for key, val in data.items() if key in cls.__dataclass_fields__})
+
+
+class ProfilingConfigLoader:
+    """
+    进程内缓存配置，避免每个请求都读取缓存
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = ProfilingConfig()
+        self._expire_at = 0
+
+    def get(self) -> ProfilingConfig:
+        if time.monotonic() < self._expire_at:
+            return self._config
+        with self._lock:
+            if time.monotonic() >= self._expire_at:
+                self._config = ProfilingConfig.from_json(cache.get(PROFILING_CONFIG_KEY))
+                self._expire_at = time.monotonic() + PROFILING_CONFIG_REFRESH
+        return self._config
+
+    def set(self, config: ProfilingConfig) -> None:
+        cache.set(PROFILING_CONFIG_KEY, config.to_json(), None)
+        with self._lock:
+            self._config = config
+            self._expire_at = time.monotonic() + PROFILING_CONFIG_REFRESH
+
+
+profiling_config = ProfilingConfigLoader()
+
+
+class RequestProfile:
+    """
+    单个请求的统计
+    """
+
+    def __init__(self, path: str, username: str):
+        self.path = path
+        self.username = username
+        self.duration = 0
+        self.sql_count = 0
+        self.sql_seconds = 0
+        self.api_count = 0
+        self.api_seconds = 0
+        self.resources = {}
+
+    def record_sql(self, seconds: float) -> None:
+        self.sql_count += 1
+        self.sql_seconds += seconds
+
+    def record_resource(self, resource_name: str, seconds: float) -> None:
+        count, total = self.resources.get(resource_name, (0, 0))
+        self.resources[resource_name] = (count + 1, total + seconds)
+        if resource_name.startswith("api."):
+            self.api_count += 1
+            self.api_seconds += seconds
+
+    def to_json(self) -> dict:
+        return {
+            "path": self.path,
+            "username": self.username,
+            "duration_ms": round(self.duration * 1000, 3),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_seconds * 1000, 3),
+            "api_count": self.api_count,
+            "api_ms": round(self.api_seconds * 1000, 3),
+            "resources": {
+                name: {"count": count, "ms": round(total * 1000, 3)} for name, (count, total) in self.resources.items()
+            },
+        }
+
+
+_current_profile = contextvars.ContextVar("request_profile", default=None)
+
+
+def get_current_profile() -> Union[RequestProfile, None]:
+    return _current_profile.get()
+
+
+def set_current_profile(profile: Union[RequestProfile, None]) -> contextvars.Token:
+    return _current_profile.set(profile)
+
+
+def reset_current_profile(token: contextvars.Token) -> None:
+    _current_profile.reset(token)
+
+
+class SqlCounter:
+    """
+    通过 connection.execute_wrapper 统计 SQL 数量与耗时
+    """
+
+    def __init__(self, profile: RequestProfile):
+        self.profile = profile
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.profile.record_sql(time.perf_counter() - start)
+
+
+def should_profile(config: ProfilingConfig, username: str, requested: bool) -> bool:
+    if requested or username in config.profile_users:
+        return True
+    return config.profile_sample_rate > 0 and random.random() < config.profile_sample_rate
+
+
+def save_profile_record(record_id: str, record: dict) -> None:
+    cache.set(PROFILING_RECORD_KEY.format(record_id), record, PROFILING_RECORD_TIMEOUT)
+    index = cache.get(PROFILING_INDEX_KEY) or []
+    summary = {key: record.get(key) for key in ["id", "path", "username", "duration_ms", "created_at"]}
+    cache.set(PROFILING_INDEX_KEY, [summary, *index][:PROFILING_INDEX_SIZE], PROFILING_RECORD_TIMEOUT)
+
+
+def list_profile_records() -> List[dict]:
+    return cache.get(PROFILING_INDEX_KEY) or []
+
+
+def get_profile_record(record_id: str) -> Union[dict, None]:
+    return cache.get(PROFILING_RECORD_KEY.format(record_id))
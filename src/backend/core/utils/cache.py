@@ -19,6 +19,10 @@ to the current version of the project delivered to anyone in the future.
 import abc
 import functools
 import json
+import pickle
+import time
+import zlib
+from typing import Union
 
 from blueapps.utils.base import md5_sum
 from blueapps.utils.logger import logger
@@ -26,40 +30,182 @@ from django.core.cache import cache
 from django.core.serializers.json import DjangoJSONEncoder
 
 from core.constants import TimeEnum
+from core.utils.lock import RedisLock
+from core.utils.metrics import metrics
 
+# 单飞重算时等待其他调用方写入缓存的最长时间(秒)
+CACHE_RECOMPUTE_WAIT = 5
+# 单飞重算锁的过期时间(秒)
+CACHE_RECOMPUTE_LOCK_TTL = 60
 
-def using_cache(key: str, duration, need_md5=False):
+
+class BaseCacheSerializer(abc.ABC):
+    """
+    缓存序列化
+    """
+
+    @abc.abstractmethod
+    def dumps(self, value) -> bytes:
+        ...
+
+    @abc.abstractmethod
+    def loads(self, data: bytes):
+        ...
+
+
+class JsonCacheSerializer(BaseCacheSerializer):
+    def dumps(self, value) -> bytes:
+        return json.dumps(value, cls=DjangoJSONEncoder).encode()
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class PickleCacheSerializer(BaseCacheSerializer):
+    def dumps(self, value) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes):
+        return pickle.loads(data)
+
+
+CACHE_SERIALIZERS = {
+    "json": JsonCacheSerializer(),
+    "pickle": PickleCacheSerializer(),
+}
+
+
+def register_cache_serializer(name: str, serializer: BaseCacheSerializer) -> None:
+    CACHE_SERIALIZERS[name] = serializer
+
+
+class CacheEntry:
+    """
+    缓存内容
+    fresh_until 之前为新鲜数据，之后到缓存过期之间为可以继续使用的旧数据
+    """
+
+    def __init__(self, data: bytes, compressed: bool, negative: bool, fresh_until: float):
+        self.data = data
+        self.compressed = compressed
+        self.negative = negative
+        self.fresh_until = fresh_until
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+    def to_cache(self) -> tuple:
+        return self.data, self.compressed, self.negative, self.fresh_until
+
+    @classmethod
+    def from_cache(cls, value) -> Union["CacheEntry", None]:
+        if isinstance(value, tuple) and len(value) == 4:
+            return cls(*value)
+        # 兼容旧版本写入的 json 字符串
+        if isinstance(value, str):
+            return cls(value.encode(), False, False, float("inf"))
+        return None
+
+    def load(self, serializer: BaseCacheSerializer):
+        return serializer.loads(zlib.decompress(self.data) if self.compressed else self.data)
+
+    @classmethod
+    def build(cls, value, serializer: BaseCacheSerializer, compress_threshold: int, negative: bool, duration):
+        data = serializer.dumps(value)
+        compressed = compress_threshold is not None and len(data) >= compress_threshold
+        if compressed:
+            data = zlib.compress(data)
+        return cls(data, compressed, negative, time.time() + duration)
+
+
+def using_cache(
+    key: str,
+    duration,
+    need_md5=False,
+    serializer: Union[str, BaseCacheSerializer] = "json",
+    compress_threshold: int = None,
+    negative_duration=None,
+    stale_duration=0,
+    single_flight=True,
+):
     """
     :param key: key 名可以使用format进行格式
     :param duration:
     :param need_md5: 缓冲是redis的时候 key不能带有空格等字符，需要用md5 hash一下
+    :param serializer: 序列化方式，json/pickle 或自定义的 BaseCacheSerializer
+    :param compress_threshold: 序列化后超过该大小(字节)时压缩存储，None 为不压缩
+    :param negative_duration: 空结果的缓存时间，None 为不缓存空结果
+    :param stale_duration: 过期后仍可返回旧数据的时间，期间只有一个调用方重新计算
+    :param single_flight: 未命中时只有一个调用方重新计算，其余调用方等待其结果
     :return:
     """
 
-    def decorator(func):
-        @functools.wraps(func)
-        def inner(*args, **kwargs):
+    cache_serializer = CACHE_SERIALIZERS[serializer] if isinstance(serializer, str) else serializer
 
+    def decorator(func):
+        def build_key(*args, **kwargs) -> str:
             try:
                 actual_key = key.format(*args, **kwargs)
             except (IndexError, KeyError):
                 actual_key = key
 
-            logger.info(f"[using cache] build key => [{actual_key}] duration => [{duration}]")
+            logger.debug(f"[using cache] build key => [{actual_key}] duration => [{duration}]")
 
             if need_md5:
                 actual_key = md5_sum(actual_key)
+            return actual_key
 
-            cache_result = cache.get(actual_key)
-
-            if cache_result:
-                return json.loads(cache_result)
+        def get_entry(actual_key: str) -> Union[CacheEntry, None]:
+            return CacheEntry.from_cache(cache.get(actual_key))
 
+        def refresh(actual_key: str, *args, **kwargs):
             result = func(*args, **kwargs)
             if result:
-                cache.set(actual_key, json.dumps(result, cls=DjangoJSONEncoder), duration)
+                entry = CacheEntry.build(result, cache_serializer, compress_threshold, False, duration)
+                cache.set(actual_key, entry.to_cache(), duration + stale_duration)
+            elif negative_duration is not None:
+                entry = CacheEntry.build(result, cache_serializer, compress_threshold, True, negative_duration)
+                cache.set(actual_key, entry.to_cache(), negative_duration)
             return result
 
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            actual_key = build_key(*args, **kwargs)
+
+            entry = get_entry(actual_key)
+            if entry is not None and entry.is_fresh:
+                metrics.incr("cache_negative_hit" if entry.negative else "cache_hit", key)
+                return entry.load(cache_serializer)
+
+            lock = RedisLock(f"{actual_key}:recompute", CACHE_RECOMPUTE_LOCK_TTL, metric_label=f"{key}:recompute")
+
+            # 旧数据仍可使用，只由获取到锁的调用方重新计算，其余调用方直接返回旧数据
+            if entry is not None:
+                metrics.incr("cache_stale", key)
+                if not lock.acquire(0):
+                    return entry.load(cache_serializer)
+                try:
+                    return refresh(actual_key, *args, **kwargs)
+                finally:
+                    lock.release()
+
+            metrics.incr("cache_miss", key)
+            if not single_flight:
+                return refresh(actual_key, *args, **kwargs)
+
+            # 未获取到锁说明其他调用方正在计算，等待其完成后读取结果
+            acquired = lock.acquire(CACHE_RECOMPUTE_WAIT)
+            try:
+                entry = get_entry(actual_key)
+                if entry is not None and entry.is_fresh:
+                    metrics.incr("cache_coalesced", key)
+                    return entry.load(cache_serializer)
+                return refresh(actual_key, *args, **kwargs)
+            finally:
+                if acquired:
+                    lock.release()
+
         return inner
 
     return decorator
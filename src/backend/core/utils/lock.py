@@ -17,14 +17,119 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import functools
+import json
+import math
+import os
+import socket
+import threading
 import time
 from contextlib import contextmanager
 
+from blueapps.utils.logger import logger
 from blueapps.utils.unique import uniqid
 from django.conf import settings
 from django.core.cache import cache
 
 from core.exceptions import LockError
+from core.utils.metrics import metrics
+
+# 等待锁时单次阻塞等待释放通知的最长时间(秒)，用于兜底锁过期未释放的情况
+LOCK_WAIT_POLL_INTERVAL = 1
+# 等待队列中的等待者超过该时间未刷新时视为已退出(毫秒)
+LOCK_WAITER_TIMEOUT = 3 * 1000
+# 续期间隔占过期时间的比例
+LOCK_RENEWAL_RATIO = 1 / 3
+# 定时任务租约过期时间(秒)，任务运行期间持续续期
+TASK_LEASE_TTL = 5 * 60
+
+# 获取锁: 清理等待队列中已退出的等待者，锁空闲且轮到自己时加锁，否则按需排队
+# KEYS: 锁, 等待队列, 等待者超时时间; ARGV: token, ttl(ms), 当前时间(ms), 等待超时(ms), 是否排队
+LOCK_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[3])
+while true do
+    local first = redis.call("lindex", KEYS[2], 0)
+    if not first then
+        break
+    end
+    local deadline = redis.call("zscore", KEYS[3], first)
+    if deadline and tonumber(deadline) > now then
+        break
+    end
+    redis.call("lpop", KEYS[2])
+    redis.call("zrem", KEYS[3], first)
+end
+if redis.call("exists", KEYS[1]) == 0 then
+    local first = redis.call("lindex", KEYS[2], 0)
+    if (not first) or first == ARGV[1] then
+        if first then
+            redis.call("lpop", KEYS[2])
+            redis.call("zrem", KEYS[3], ARGV[1])
+        end
+        redis.call("set", KEYS[1], ARGV[1], "px", ARGV[2])
+        return 1
+    end
+end
+if ARGV[5] == "1" then
+    if not redis.call("zscore", KEYS[3], ARGV[1]) then
+        redis.call("rpush", KEYS[2], ARGV[1])
+    end
+    redis.call("zadd", KEYS[3], now + tonumber(ARGV[4]), ARGV[1])
+    redis.call("pexpire", KEYS[2], ARGV[4])
+    redis.call("pexpire", KEYS[3], ARGV[4])
+end
+return 0
+"""
+
+# 释放锁: 仅持有者可以删除，删除后通知队首的等待者
+# KEYS: 锁, 等待队列; ARGV: token, 通知 key 前缀, 通知过期时间(ms)
+LOCK_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call("del", KEYS[1])
+local first = redis.call("lindex", KEYS[2], 0)
+if first then
+    redis.call("rpush", ARGV[2] .. first, 1)
+    redis.call("pexpire", ARGV[2] .. first, ARGV[3])
+end
+return 1
+"""
+
+# 续期: 仅持有者可以续期
+# KEYS: 锁; ARGV: token, ttl(ms)
+LOCK_EXTEND_SCRIPT = """
+if redis.call("get", KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+return redis.call("pexpire", KEYS[1], ARGV[2])
+"""
+
+# 放弃等待: 退出等待队列，锁空闲时通知新的队首
+# KEYS: 锁, 等待队列, 等待者超时时间; ARGV: token, 通知 key 前缀, 通知过期时间(ms)
+LOCK_CANCEL_SCRIPT = """
+redis.call("lrem", KEYS[2], 0, ARGV[1])
+redis.call("zrem", KEYS[3], ARGV[1])
+redis.call("del", ARGV[2] .. ARGV[1])
+if redis.call("exists", KEYS[1]) == 0 then
+    local first = redis.call("lindex", KEYS[2], 0)
+    if first then
+        redis.call("rpush", ARGV[2] .. first, 1)
+        redis.call("pexpire", ARGV[2] .. first, ARGV[3])
+    end
+end
+return 1
+"""
+
+
+def get_redis_client():
+    """
+    获取缓存使用的 Redis 连接，缓存不是 Redis 时返回 None
+    """
+
+    get_client = getattr(getattr(cache, "client", None), "get_client", None)
+    if get_client is None:
+        return None
+    return get_client(write=True)
 
 
 class BaseLock(object):
@@ -48,31 +153,206 @@ class BaseLock(object):
 
 
 class RedisLock(BaseLock):
+    """
+    Redis 锁
+    1. 释放与续期使用脚本原子比较 token，不会误删其他持有者的锁
+    2. 等待锁的客户端按先后顺序排队，释放时通知队首，等待期间阻塞而不轮询
+    3. auto_renewal 开启时后台线程定期续期，适用于耗时较长的临界区
+    4. 记录等锁耗时与持有耗时
+    缓存不是 Redis 时退化为基于 django cache 的实现
+    """
+
     __token = None
 
-    def __init__(self, name, ttl=None):
+    def __init__(self, name, ttl=None, auto_renewal=False, client=None, metric_label=None):
         super(RedisLock, self).__init__(name, ttl)
+        # 指标按 metric_label 聚合，锁名称包含变量时需要指定以免指标无限增长
+        self.metric_label = metric_label or name
         self.client = cache
+        self.redis = client if client is not None else get_redis_client()
+        self.auto_renewal = auto_renewal
+        self._acquired_at = None
+        self._renewal_stop = None
+        if self.redis is not None:
+            self.key = self.client.make_key(self.name)
+            self.queue_key = f"{self.key}:queue"
+            self.timeout_key = f"{self.key}:timeout"
+            self.notify_prefix = f"{self.key}:notify:"
+            self._acquire_script = self.redis.register_script(LOCK_ACQUIRE_SCRIPT)
+            self._release_script = self.redis.register_script(LOCK_RELEASE_SCRIPT)
+            self._extend_script = self.redis.register_script(LOCK_EXTEND_SCRIPT)
+            self._cancel_script = self.redis.register_script(LOCK_CANCEL_SCRIPT)
+
+    @property
+    def ttl_ms(self) -> int:
+        return int(self.ttl * 1000)
+
+    def build_token(self):
+        return uniqid()
 
     def acquire(self, _wait=0.001):
-        token = uniqid()
+        token = self.build_token()
+        start = time.monotonic()
+        if self.redis is None:
+            acquired = self._acquire_by_cache(token, _wait)
+        else:
+            acquired = self._acquire_by_redis(token, _wait)
+        metrics.observe("lock_wait_seconds", time.monotonic() - start, self.metric_label)
+        if not acquired:
+            metrics.incr("lock_acquire_failed", self.metric_label)
+            return False
+
+        self.__token = token
+        self._acquired_at = time.monotonic()
+        if self.auto_renewal:
+            self._start_renewal()
+        return True
+
+    def _acquire_by_cache(self, token, _wait):
         wait_until = time.time() + _wait
-        while not self.client.set(self.name, token, timeout=self.ttl, nx=True):
+        while not self.client.add(self.name, token, timeout=self.ttl):
             if time.time() < wait_until:
                 time.sleep(0.01)
             else:
                 return False
-
-        self.__token = token
         return True
 
+    def _try_acquire(self, token, enqueue):
+        return self._acquire_script(
+            keys=[self.key, self.queue_key, self.timeout_key],
+            args=[token, self.ttl_ms, int(time.time() * 1000), LOCK_WAITER_TIMEOUT, "1" if enqueue else "0"],
+        )
+
+    def _acquire_by_redis(self, token, _wait):
+        deadline = time.monotonic() + _wait
+        while True:
+            remaining = deadline - time.monotonic()
+            # 等待时间不足一个通知周期时不排队，避免短暂等待的请求阻塞队列
+            enqueue = remaining >= LOCK_WAIT_POLL_INTERVAL
+            if self._try_acquire(token, enqueue):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if remaining < LOCK_WAIT_POLL_INTERVAL:
+                time.sleep(remaining)
+                if self._try_acquire(token, False):
+                    return True
+                break
+            # 阻塞等待释放通知，超时后重新尝试以兜底锁过期的情况
+            timeout = max(1, math.floor(min(remaining, LOCK_WAIT_POLL_INTERVAL)))
+            self.redis.blpop([f"{self.notify_prefix}{token}"], timeout=timeout)
+        self._cancel_script(
+            keys=[self.key, self.queue_key, self.timeout_key],
+            args=[token, self.notify_prefix, LOCK_WAITER_TIMEOUT],
+        )
+        return False
+
+    def extend(self, ttl=None):
+        """
+        续期，仅当前持有者可以续期
+        """
+
+        if not self.__token:
+            return False
+        ttl = ttl or self.ttl
+        if self.redis is None:
+            if self.client.get(self.name) != self.__token:
+                return False
+            return self.client.touch(self.name, ttl)
+        return bool(self._extend_script(keys=[self.key], args=[self.__token, int(ttl * 1000)]))
+
+    def _start_renewal(self):
+        stop = threading.Event()
+        self._renewal_stop = stop
+        interval = self.ttl * LOCK_RENEWAL_RATIO
+
+        def renew():
+            while not stop.wait(interval):
+                if not self.extend():
+                    logger.warning("[RedisLock] Renewal Failed, Lock Lost; Name => %s", self.name)
+                    return
+
+        threading.Thread(target=renew, name=f"lock-renewal-{self.name}", daemon=True).start()
+
+    def _stop_renewal(self):
+        if self._renewal_stop is not None:
+            self._renewal_stop.set()
+            self._renewal_stop = None
+
     def release(self):
         if not self.__token:
             return False
-        token = self.client.get(self.name)
-        if not token or token != self.__token:
+        self._stop_renewal()
+        token, self.__token = self.__token, None
+        metrics.observe("lock_hold_seconds", time.monotonic() - self._acquired_at, self.metric_label)
+        if self.redis is None:
+            if self.client.get(self.name) != token:
+                return False
+            return self.client.delete(self.name)
+        return self._release_token(token)
+
+    def _release_token(self, token):
+        return bool(
+            self._release_script(
+                keys=[self.key, self.queue_key],
+                args=[token, self.notify_prefix, LOCK_WAITER_TIMEOUT],
+            )
+        )
+
+    def get_holder(self):
+        """
+        获取当前持有者的 token 及剩余过期时间(秒)，未被持有时 token 为 None
+        """
+
+        if self.redis is None:
+            return self.client.get(self.name), None
+        token = self.redis.get(self.key)
+        if token is None:
+            return None, None
+        pttl = self.redis.pttl(self.key)
+        return token, pttl / 1000 if pttl >= 0 else None
+
+    def force_release(self):
+        """
+        强制释放当前持有者的锁，用于处理异常遗留的锁
+        """
+
+        token, _ = self.get_holder()
+        if token is None:
             return False
-        return self.client.delete(self.name)
+        if self.redis is None:
+            return self.client.delete(self.name)
+        return self._release_token(token)
+
+
+class TaskLease(RedisLock):
+    """
+    定时任务租约
+    记录持有者信息，任务运行期间持续续期，进程异常退出后租约在过期时间后自动失效
+    """
+
+    def __init__(self, name, ttl=None, client=None):
+        super(TaskLease, self).__init__(name, ttl or TASK_LEASE_TTL, auto_renewal=True, client=client)
+
+    def build_token(self):
+        return json.dumps(
+            {"id": uniqid(), "host": socket.gethostname(), "pid": os.getpid(), "acquired_at": int(time.time())}
+        )
+
+    def inspect(self):
+        """
+        获取租约持有者及剩余过期时间，未被持有时返回 None
+        """
+
+        token, ttl = self.get_holder()
+        if token is None:
+            return None
+        try:
+            owner = json.loads(token)
+        except (TypeError, ValueError):
+            owner = {"id": token}
+        return {"name": self.name, "owner": owner, "ttl": ttl}
 
 
 @contextmanager
@@ -111,20 +391,17 @@ def share_lock(ttl=600, identify=None):
         def _inner(*args, **kwargs):
             if not settings.USE_REDIS:
                 return func(*args, **kwargs)
-            token = str(time.time())
             # 防止函数重名导致方法失效，增加一个ID参数，可以通过ID参数屏蔽多模块函数名重复的问题
             # 例如，可以为`${module}_${method_used_for}`
             cache_key = "celery_%s" % func.__name__ if identify is None else identify
-            client = cache
-            lock_success = client.set(cache_key, token, timeout=ttl, nx=True)
-            if not lock_success:
+            lock = RedisLock(cache_key, ttl)
+            if not lock.acquire(0):
                 return
 
             try:
                 return func(*args, **kwargs)
             finally:
-                if client.get(cache_key) == token:
-                    client.delete(cache_key)
+                lock.release()
 
         return _inner
 
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+# 直方图默认分桶
+DEFAULT_HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class MetricRegistry:
+    """
+    进程内指标统计
+    计数类指标使用 incr 累加，耗时类指标使用 observe 记录次数、总和与最大值，
+    需要分布时使用 histogram 额外记录各分桶的数量
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._timers: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def incr(self, name: str, label: str = "", value: float = 1) -> None:
+        with self._lock:
+            self._counters[(name, label)] += value
+
+    def observe(self, name: str, value: float, label: str = "") -> None:
+        with self._lock:
+            timer = self._timers.setdefault((name, label), {"count": 0, "sum": 0, "max": 0})
+            timer["count"] += 1
+            timer["sum"] += value
+            timer["max"] = max(timer["max"], value)
+
+    def histogram(self, name: str, value: float, label: str = "", buckets: tuple = DEFAULT_HISTOGRAM_BUCKETS) -> None:
+        with self._lock:
+            timer = self._timers.setdefault(
+                (name, label), {"count": 0, "sum": 0, "max": 0, "buckets": {str(bucket): 0 for bucket in buckets}}
+            )
+            timer["count"] += 1
+            timer["sum"] += value
+            timer["max"] = max(timer["max"], value)
+            for bucket in buckets:
+                if value <= bucket:
+                    timer["buckets"][str(bucket)] += 1
+                    break
+            else:
+                timer["buckets"]["+Inf"] = timer["buckets"].get("+Inf", 0) + 1
+
+    def snapshot(self, name: str = None) -> dict:
+        """
+        获取指标快照，格式为 {name: {label: value}}
+        """
+
+        data = defaultdict(dict)
+        with self._lock:
+            for (metric_name, label), value in self._counters.items():
+                data[metric_name][label] = value
+            for (metric_name, label), timer in self._timers.items():
+                data[metric_name][label] = {
+                    key: dict(val) if isinstance(val, dict) else val for key, val in timer.items()
+                }
+        if name is not None:
+            return data.get(name, {})
+        return dict(data)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+
+metrics = MetricRegistry()
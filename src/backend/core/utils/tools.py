@@ -16,23 +16,22 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-import copy
 import datetime
 import itertools
 from collections import OrderedDict
-from functools import wraps
-from typing import List, Union
+from functools import lru_cache, wraps
+from typing import List, Tuple, Union
 
 import arrow
 from blueapps.utils.logger import logger
 from blueapps.utils.request_provider import get_local_request
 from dateutil.tz import tzutc
-from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.settings import api_settings
 
 from core.constants import DEFAULT_JSON_EXPAND_SEPARATOR
 from core.exceptions import AppPermissionDenied
+from core.utils.lock import TaskLease
 
 
 def group_by(iter_list, key, sorted_key=None):
@@ -77,13 +76,16 @@ def expand_json(raw_json: dict, level: int) -> dict:
     将Json展开，获取多层内容
     input: {"a": {"a-1": 1}}
     output: {"a": {"a-1": 1}, "a/a-1": 1}
+    展开结果与原数据共享子节点，不做拷贝
     """
     data = dict()
     expanded_keys = set()
+    # 首轮处理原始数据，之后每轮只处理上一轮新增的 key
+    pending = list(raw_json.items())
     current_level = 1
     while current_level < level:
         current_level += 1
-        for key, val in raw_json.items():
+        for key, val in pending:
             # 已经展开则跳过
             if key in expanded_keys:
                 continue
@@ -94,8 +96,7 @@ def expand_json(raw_json: dict, level: int) -> dict:
             if isinstance(val, dict):
                 for child_key, child_val in val.items():
                     data[f"{key}{DEFAULT_JSON_EXPAND_SEPARATOR}{child_key}"] = child_val
-        # 处理结束后重新赋值原数据
-        raw_json = copy.deepcopy(data)
+        pending = [(key, val) for key, val in data.items() if key not in expanded_keys]
     return data
 
 
@@ -124,24 +125,26 @@ def format_date_string(date_string: str, output_format: str = api_settings.DATET
 
 
 def single_task_cache_key(func):
-    return f"{func.__name__}_running_key"
+    return single_task_cache_key_by_name(func.__name__)
+
+
+def single_task_cache_key_by_name(task_name: str):
+    return f"{task_name}_running_key"
 
 
 def single_task_decorator(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         logger.info(f"[{func.__name__}] start")
-        # 多并发控制
-        cache_key = single_task_cache_key(func)
-        is_running = cache.get(cache_key)
-        if is_running:
-            logger.info(f"[{func.__name__}] end (duplicate running task)")
+        # 多并发控制，租约在任务运行期间持续续期
+        lease = TaskLease(single_task_cache_key(func))
+        if not lease.acquire(0):
+            logger.info(f"[{func.__name__}] end (duplicate running task) lease => {lease.inspect()}")
             return
         try:
-            cache.set(cache_key, True)
             func(*args, **kwargs)
         finally:
-            cache.delete(cache_key)
+            lease.release()
         logger.info(f"[{func.__name__}] end")
 
     return wrapper
@@ -188,41 +191,66 @@ def trans_object_local(obj: Union[dict, List[dict]], fields: List[str]) -> Union
     return obj
 
 
-def modify_dict_by_path(data: dict, path: List[str], default_value: any, auto_create: bool = False) -> dict:
+def _set_by_path(data: dict, path: Union[List[str], Tuple[str, ...]], value: any, auto_create: bool) -> dict:
     # 如果内容为空直接返回
     if not data:
         return data
-    # 首层直接替换
-    if len(path) == 1:
-        data[path[0]] = default_value
-        return data
-    # 第二层需要递归
-    if auto_create:
-        data[path[0]] = data.get(path[0]) or {}
-    if data.get(path[0]) is None:
-        return data
-    # 递归更新下层内容
-    data[path[0]] = modify_dict_by_path(data[path[0]], path[1:], default_value)
+    node = data
+    last = len(path) - 1
+    # 仅第一层自动创建
+    if auto_create and last > 0:
+        node[path[0]] = node.get(path[0]) or {}
+    for index in range(last):
+        node = node.get(path[index])
+        if not node:
+            return data
+    node[path[last]] = value
     return data
 
 
-def drop_dict_item_by_path(data: dict, path: List[str], default_value: any) -> dict:
+def _drop_by_path(data: dict, path: Union[List[str], Tuple[str, ...]]) -> dict:
     # 如果内容为空直接返回
-    if not data:
+    node = data
+    for index in range(len(path) - 1):
+        if not node:
+            return data
+        node = node.get(path[index])
+    if not node:
         return data
-    # 首层直接移除
-    if len(path) == 1:
-        data.pop(path[0], None)
-        return data
-    # 第二层需要递归
-    next_path = data.get(path[0])
-    if not next_path:
-        return data
-    # 递归移除下层内容
-    data[path[0]] = drop_dict_item_by_path(data[path[0]], path[1:], default_value)
+    node.pop(path[-1], None)
     return data
 
 
+class JsonPath:
+    """
+    预编译的字典路径，按层级迭代访问，避免递归
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: Union[List[str], Tuple[str, ...]]):
+        self.path = tuple(path)
+
+    def set(self, data: dict, value: any, auto_create: bool = False) -> dict:
+        return _set_by_path(data, self.path, value, auto_create)
+
+    def drop(self, data: dict) -> dict:
+        return _drop_by_path(data, self.path)
+
+
+@lru_cache(maxsize=1024)
+def compile_json_path(path: str, separator: str = ".") -> JsonPath:
+    return JsonPath(path.split(separator))
+
+
+def modify_dict_by_path(data: dict, path: List[str], default_value: any, auto_create: bool = False) -> dict:
+    return _set_by_path(data, path, default_value, auto_create)
+
+
+def drop_dict_item_by_path(data: dict, path: List[str], default_value: any) -> dict:
+    return _drop_by_path(data, path)
+
+
 def get_app_info():
     """
     获取APP信息，确保请求来自APIGW
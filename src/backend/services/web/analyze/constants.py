@@ -16,11 +16,19 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import os
+
 from django.utils.translation import gettext_lazy
 
 from core.choices import TextChoices
 
-CHECK_FLOW_STATUS_SLEEP_SECONDS = 5
+# Flow 部署状态检查，间隔按检查次数指数增长
+FLOW_STATUS_CHECK_INTERVAL = int(os.getenv("BKAPP_FLOW_STATUS_CHECK_INTERVAL", 5))
+FLOW_STATUS_CHECK_MAX_INTERVAL = int(os.getenv("BKAPP_FLOW_STATUS_CHECK_MAX_INTERVAL", 60))
+FLOW_STATUS_CHECK_MAX_ATTEMPTS = int(os.getenv("BKAPP_FLOW_STATUS_CHECK_MAX_ATTEMPTS", 60))
+# 检查中的任务租期，避免重复检查
+FLOW_STATUS_CHECK_LEASE = 60
+FLOW_STATUS_SWEEP_BATCH_SIZE = 100
 
 BKBASE_ATTR_GROUP_FIELD_NAME = "attr_group"
 BKBASE_GROUP_BY_FIELD_CONTAINER_TYPE = "group"
@@ -169,3 +177,9 @@ class WindowType(TextChoices):
     SCROLL = "scroll", gettext_lazy("Scroll")
     SLIDE = "slide", gettext_lazy("Slide")
     WHOLE = "whole", gettext_lazy("Whole")
+
+
+# 结果表结构缓存
+RT_SCHEMA_CACHE_KEY_PREFIX = "analyze:rt_schema"
+RT_SCHEMA_CACHE_TIMEOUT = 60 * 60
+RT_SQL_FRAGMENT_CACHE_SIZE = 4096
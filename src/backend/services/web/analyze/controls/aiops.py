@@ -46,6 +46,7 @@ from services.web.analyze.constants import (
     BKBASE_PLAN_TAG,
     BKBASE_STRATEGY_ID_FIELD,
     BKBASE_SYSTEM_FIELD_ROLE,
+    FLOW_STATUS_CHECK_INTERVAL,
     ControlTypeChoices,
     FilterConnector,
     FilterOperator,
@@ -64,6 +65,12 @@ from services.web.analyze.controls.base import Controller
 from services.web.analyze.exceptions import ClusterNotExists
 from services.web.analyze.models import Control, ControlVersion
 from services.web.analyze.tasks import call_controller, check_flow_status
+from services.web.analyze.tracker import FlowStatusTracker
+from services.web.analyze.utils import (
+    ResultTableSchemaCache,
+    build_sql_case_branch,
+    build_sql_field,
+)
 from services.web.databus.constants import DEFAULT_RETENTION, DEFAULT_STORAGE_CONFIG_KEY
 from services.web.risk.constants import EventMappingFields
 from services.web.risk.handlers import EventHandler
@@ -191,8 +198,7 @@ class AIOpsController(Controller):
                 api.bk_base.start_flow(**params)
                 self.strategy.status = StrategyStatusChoices.STARTING
                 self.strategy.save(update_fields=["status"])
-                check_flow_status.delay(
-                    strategy_id=self.strategy.strategy_id,
+                self._track_flow_status(
                     success_status=StrategyStatusChoices.RUNNING,
                     failed_status=StrategyStatusChoices.START_FAILED,
                     other_status=StrategyStatusChoices.STARTING,
@@ -201,8 +207,7 @@ class AIOpsController(Controller):
                 api.bk_base.restart_flow(**params)
                 self.strategy.status = StrategyStatusChoices.UPDATING
                 self.strategy.save(update_fields=["status"])
-                check_flow_status.delay(
-                    strategy_id=self.strategy.strategy_id,
+                self._track_flow_status(
                     success_status=StrategyStatusChoices.RUNNING,
                     failed_status=StrategyStatusChoices.UPDATE_FAILED,
                     other_status=StrategyStatusChoices.UPDATING,
@@ -211,8 +216,7 @@ class AIOpsController(Controller):
                 api.bk_base.stop_flow(**params)
                 self.strategy.status = StrategyStatusChoices.STOPPING
                 self.strategy.save(update_fields=["status"])
-                check_flow_status.delay(
-                    strategy_id=self.strategy.strategy_id,
+                self._track_flow_status(
                     success_status=StrategyStatusChoices.DISABLED.value,
                     failed_status=StrategyStatusChoices.STOP_FAILED,
                     other_status=StrategyStatusChoices.STOPPING,
@@ -220,6 +224,19 @@ class AIOpsController(Controller):
             case _:
                 raise StrategyStatusUnexpected()
 
+    def _track_flow_status(self, success_status: str, failed_status: str, other_status: str) -> None:
+        """
+        记录部署中的 Flow 并调度首次检查
+        """
+
+        strategy_id = self.strategy.strategy_id
+        FlowStatusTracker.track(strategy_id, success_status, failed_status, other_status)
+        transaction.on_commit(
+            lambda: check_flow_status.apply_async(
+                kwargs={"strategy_id": strategy_id}, countdown=FLOW_STATUS_CHECK_INTERVAL
+            )
+        )
+
     def _describe_flow_status(self) -> str:
         """
         获取Flow运行状态
@@ -296,7 +313,7 @@ class AIOpsController(Controller):
 
         # check batch / batch_join
         if source_type == FlowDataSourceNodeType.BATCH:
-            result_table = api.bk_base.get_result_table(result_table_id=data_source["result_table_id"])
+            result_table = ResultTableSchemaCache(data_source["result_table_id"]).get_result_table()
             if (
                 result_table["processing_type"] == ResultTableType.CDC
                 or result_table["result_table_type"] == ResultTableType.STATIC
@@ -547,18 +564,13 @@ class AIOpsController(Controller):
                 for source_field in field["source_field"]:
                     system_ids.add(source_field["system_id"])
                     sql_whens.append(
-                        "WHEN system_id = '{system_id}' {action_id} THEN {field_mapping}".format(
+                        build_sql_case_branch(
                             system_id=source_field["system_id"],
-                            action_id="AND action_id = '{}'".format(source_field["action_id"])
+                            action_id=source_field["action_id"]
                             if source_field["mapping_type"] == MappingType.ACTION
                             else "",
-                            field_mapping=self._build_sql_fields(
-                                field_mapping=[
-                                    {"field_name": field["field_name"], "source_field": source_field["source_field"]}
-                                ],
-                                using_as=False,
-                                add_strategy_id=False,
-                            )[0],
+                            source_field=source_field["source_field"],
+                            field_name=field["field_name"],
                         )
                     )
                 sql_fields.append("CASE \n{}\nELSE NULL \nEND as {}".format(" \n".join(sql_whens), field["field_name"]))
@@ -589,7 +601,7 @@ class AIOpsController(Controller):
         origin_fields = []
         origin_sqls = []
 
-        for field in api.bk_base.get_rt_fields(result_table_id=result_table_id):
+        for field in ResultTableSchemaCache(result_table_id).get_fields():
             if field["field_name"] == "timestamp":
                 continue
             origin_fields.append(field["field_name"])
@@ -651,20 +663,9 @@ class AIOpsController(Controller):
         fields = []
 
         for field in field_mapping:
-            # 如果需要提取需要使用udf
-            if field["source_field"].find(".") != -1:
-                _parent_field, _child_field = field["source_field"].split(".", 1)
-                fields.append(
-                    "{}({}, '{}') {}".format(
-                        settings.BKBASE_UDF_JSON_EXTRACT_FUNC,
-                        _parent_field,
-                        _child_field,
-                        f"as {field['field_name']}" if using_as else "",
-                    )
-                )
-                continue
-            # 否则直接赋值
-            fields.append("{} {}".format(field["source_field"], f"as {field['field_name']}" if using_as else ""))
+            fields.append(
+                build_sql_field(source_field=field["source_field"], field_name=field["field_name"], using_as=using_as)
+            )
 
         # 增加策略ID
         if add_strategy_id:
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analyze", "0006_alter_control_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlowDeployTask",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("strategy_id", models.BigIntegerField(unique=True, verbose_name="Strategy ID")),
+                ("success_status", models.CharField(max_length=32, verbose_name="Success Status")),
+                ("failed_status", models.CharField(max_length=32, verbose_name="Failed Status")),
+                ("other_status", models.CharField(max_length=32, verbose_name="Other Status")),
+                ("attempts", models.IntegerField(default=0, verbose_name="Attempts")),
+                ("next_check_at", models.DateTimeField(db_index=True, verbose_name="Next Check At")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created At")),
+            ],
+            options={
+                "verbose_name": "Flow Deploy Task",
+                "verbose_name_plural": "Flow Deploy Task",
+                "ordering": ["next_check_at"],
+            },
+        ),
+    ]
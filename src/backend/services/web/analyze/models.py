@@ -59,3 +59,23 @@ class ControlVersion(SoftDeleteModel):
         verbose_name_plural = verbose_name
         ordering = ["control_id", "-control_version"]
         unique_together = [["control_id", "control_version"]]
+
+
+class FlowDeployTask(models.Model):
+    """
+    Flow Deploy Task
+    部署中的 Flow，由定时任务检查状态，完成后删除
+    """
+
+    strategy_id = models.BigIntegerField(gettext_lazy("Strategy ID"), unique=True)
+    success_status = models.CharField(gettext_lazy("Success Status"), max_length=32)
+    failed_status = models.CharField(gettext_lazy("Failed Status"), max_length=32)
+    other_status = models.CharField(gettext_lazy("Other Status"), max_length=32)
+    attempts = models.IntegerField(gettext_lazy("Attempts"), default=0)
+    next_check_at = models.DateTimeField(gettext_lazy("Next Check At"), db_index=True)
+    created_at = models.DateTimeField(gettext_lazy("Created At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("Flow Deploy Task")
+        verbose_name_plural = verbose_name
+        ordering = ["next_check_at"]
@@ -16,29 +16,18 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-import time
-
-from bk_resource import api
-from bk_resource.exceptions import APIRequestError
-from blueapps.utils.logger import logger_celery
 from celery.schedules import crontab
 from celery.task import periodic_task, task
-from django.utils.translation import gettext
 
-from apps.notice.handlers import ErrorMsgHandler
 from core.utils.tools import single_task_decorator
-from services.web.analyze.constants import (
-    BKBASE_ERROR_LOG_LEVEL,
-    CHECK_FLOW_STATUS_SLEEP_SECONDS,
-    FlowStatusChoices,
-)
+from services.web.analyze.constants import FLOW_STATUS_CHECK_MAX_INTERVAL
 from services.web.analyze.controls.auth import (
     AssetAuthHandler,
     CollectorPluginAuthHandler,
 )
 from services.web.analyze.controls.base import Controller
+from services.web.analyze.tracker import FlowStatusTracker
 from services.web.databus.models import CollectorPlugin, Snapshot
-from services.web.strategy_v2.models import Strategy
 
 
 @task()
@@ -54,9 +43,12 @@ def call_controller(func_name: str, strategy_id: int, *args, **kwargs):
 
 
 @task()
-def check_flow_status(strategy_id: int, success_status: str, failed_status: str, other_status: str):
+def check_flow_status(
+    strategy_id: int, success_status: str = None, failed_status: str = None, other_status: str = None
+):
     """
     check flow status
+    仍在部署中时以 countdown 重新调度，不在 worker 中等待
     """
 
     from services.web.analyze.controls.aiops import AiopsFeature
@@ -64,47 +56,30 @@ def check_flow_status(strategy_id: int, success_status: str, failed_status: str,
     if not AiopsFeature(help_text="check_flow_status").available:
         return
 
-    # load strategy
-    strategy = Strategy.objects.filter(strategy_id=strategy_id).first()
-    if strategy is None:
-        logger_celery.error("[CheckFlowStatusFailed] Strategy Not Found => %s", strategy_id)
+    # 兼容升级前已投递的任务
+    if success_status:
+        FlowStatusTracker.track(strategy_id, success_status, failed_status, other_status)
+
+    countdown = FlowStatusTracker.check(strategy_id)
+    # 间隔较短时直接调度，较长时由定时任务扫描
+    if countdown is not None and countdown < FLOW_STATUS_CHECK_MAX_INTERVAL:
+        check_flow_status.apply_async(kwargs={"strategy_id": strategy_id}, countdown=countdown)
+
+
+@periodic_task(run_every=crontab(minute="*/1"))
+@single_task_decorator
+def sweep_flow_status():
+    """
+    检查到期的 Flow 部署状态
+    """
+
+    from services.web.analyze.controls.aiops import AiopsFeature
+
+    if not AiopsFeature(help_text="sweep_flow_status").available:
         return
 
-    # check flow status
-    flow_id = strategy.backend_data["flow_id"]
-    try:
-        deploy_data = api.bk_base.get_flow_deploy_data(flow_id=flow_id)
-        status = deploy_data["status"]
-        if status == FlowStatusChoices.SUCCESS.value:
-            strategy.status = success_status
-        elif status == FlowStatusChoices.FAILURE.value:
-            strategy.status = failed_status
-            strategy.status_msg = ";".join(
-                [
-                    str(log.get("message", ""))
-                    for log in deploy_data.get("logs", [])
-                    if log.get("level") == BKBASE_ERROR_LOG_LEVEL
-                ]
-            )
-            strategy.save(update_fields=["status_msg"])
-        else:
-            strategy.status = other_status
-    except (APIRequestError, TypeError, KeyError):
-        strategy.status = other_status
-
-    # update status
-    strategy.save(update_fields=["status"])
-
-    # check re-run
-    if strategy.status == other_status:
-        time.sleep(CHECK_FLOW_STATUS_SLEEP_SECONDS)
-        check_flow_status.delay(
-            strategy_id, success_status=success_status, failed_status=failed_status, other_status=other_status
-        )
-
-    # check failed
-    if strategy.status == failed_status:
-        ErrorMsgHandler(title=gettext("Flow Status Abnormal"), content=gettext("Strategy ID:\t%s") % strategy_id).send()
+    for strategy_id in FlowStatusTracker.due_strategy_ids():
+        check_flow_status.delay(strategy_id=strategy_id)
 
 
 @periodic_task(run_every=crontab(minute="*/1"))
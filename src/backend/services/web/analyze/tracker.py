@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+from typing import List, Optional
+
+from bk_resource import api
+from bk_resource.exceptions import APIRequestError
+from blueapps.utils.logger import logger_celery
+from django.utils import timezone
+from django.utils.translation import gettext
+
+from apps.notice.handlers import ErrorMsgHandler
+from services.web.analyze.constants import (
+    BKBASE_ERROR_LOG_LEVEL,
+    FLOW_STATUS_CHECK_INTERVAL,
+    FLOW_STATUS_CHECK_LEASE,
+    FLOW_STATUS_CHECK_MAX_ATTEMPTS,
+    FLOW_STATUS_CHECK_MAX_INTERVAL,
+    FLOW_STATUS_SWEEP_BATCH_SIZE,
+    FlowStatusChoices,
+)
+from services.web.analyze.models import FlowDeployTask
+from services.web.strategy_v2.models import Strategy
+
+
+class FlowStatusTracker:
+    """
+    Flow 部署状态跟踪
+    1. 部署中的 Flow 记录在 FlowDeployTask 中，检查时间按次数退避
+    2. 每次检查只调用一次接口，未完成时更新下次检查时间，不在 worker 中等待
+    3. 超过最大检查次数视为失败
+    """
+
+    @classmethod
+    def track(cls, strategy_id: int, success_status: str, failed_status: str, other_status: str) -> FlowDeployTask:
+        """
+        记录部署中的 Flow，同一策略重复部署时以最新一次为准
+        """
+
+        task, _ = FlowDeployTask.objects.update_or_create(
+            strategy_id=strategy_id,
+            defaults={
+                "success_status": success_status,
+                "failed_status": failed_status,
+                "other_status": other_status,
+                "attempts": 0,
+                "next_check_at": timezone.now() + datetime.timedelta(seconds=FLOW_STATUS_CHECK_INTERVAL),
+            },
+        )
+        return task
+
+    @classmethod
+    def get_countdown(cls, attempts: int) -> int:
+        return min(FLOW_STATUS_CHECK_INTERVAL * 2**attempts, FLOW_STATUS_CHECK_MAX_INTERVAL)
+
+    @classmethod
+    def due_strategy_ids(cls) -> List[int]:
+        return list(
+            FlowDeployTask.objects.filter(next_check_at__lte=timezone.now()).values_list("strategy_id", flat=True)[
+                :FLOW_STATUS_SWEEP_BATCH_SIZE
+            ]
+        )
+
+    @classmethod
+    def claim(cls, strategy_id: int) -> Optional[FlowDeployTask]:
+        """
+        以条件更新抢占检查权，同一任务同时只有一个 worker 检查
+        """
+
+        now = timezone.now()
+        claimed = FlowDeployTask.objects.filter(strategy_id=strategy_id, next_check_at__lte=now).update(
+            next_check_at=now + datetime.timedelta(seconds=FLOW_STATUS_CHECK_LEASE)
+        )
+        if not claimed:
+            return None
+        return FlowDeployTask.objects.filter(strategy_id=strategy_id).first()
+
+    @classmethod
+    def check(cls, strategy_id: int) -> Optional[int]:
+        """
+        检查一次部署状态，仍在部署中时返回下次检查的倒计时(秒)
+        """
+
+        task = cls.claim(strategy_id)
+        if task is None:
+            return None
+
+        # load strategy
+        strategy = Strategy.objects.filter(strategy_id=strategy_id).first()
+        if strategy is None:
+            logger_celery.error("[CheckFlowStatusFailed] Strategy Not Found => %s", strategy_id)
+            task.delete()
+            return None
+
+        # check flow status
+        status = cls.describe(strategy)
+        if status == FlowStatusChoices.OTHER.value:
+            task.attempts += 1
+            if task.attempts < FLOW_STATUS_CHECK_MAX_ATTEMPTS:
+                countdown = cls.get_countdown(task.attempts)
+                task.next_check_at = timezone.now() + datetime.timedelta(seconds=countdown)
+                task.save(update_fields=["attempts", "next_check_at"])
+                strategy.status = task.other_status
+                strategy.save(update_fields=["status"])
+                return countdown
+            # give up
+            logger_celery.error("[CheckFlowStatusTimeout] Strategy => %s; Attempts => %s", strategy_id, task.attempts)
+            strategy.status_msg = gettext("Flow Status Check Timeout")
+            status = FlowStatusChoices.FAILURE.value
+
+        # finished
+        strategy.status = task.success_status if status == FlowStatusChoices.SUCCESS.value else task.failed_status
+        strategy.save(update_fields=["status", "status_msg"])
+        task.delete()
+        if status == FlowStatusChoices.FAILURE.value:
+            ErrorMsgHandler(
+                title=gettext("Flow Status Abnormal"), content=gettext("Strategy ID:\t%s") % strategy_id
+            ).send()
+        return None
+
+    @classmethod
+    def describe(cls, strategy: Strategy) -> str:
+        """
+        获取部署状态，失败时记录错误日志
+        """
+
+        try:
+            deploy_data = api.bk_base.get_flow_deploy_data(flow_id=strategy.backend_data["flow_id"])
+            status = deploy_data["status"]
+        except (APIRequestError, TypeError, KeyError):
+            return FlowStatusChoices.OTHER.value
+        if status == FlowStatusChoices.FAILURE.value:
+            strategy.status_msg = ";".join(
+                [
+                    str(log.get("message", ""))
+                    for log in deploy_data.get("logs", [])
+                    if log.get("level") == BKBASE_ERROR_LOG_LEVEL
+                ]
+            )
+        if status in [FlowStatusChoices.SUCCESS.value, FlowStatusChoices.FAILURE.value]:
+            return status
+        return FlowStatusChoices.OTHER.value
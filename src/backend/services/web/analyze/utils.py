@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import functools
+from typing import List
+
+from bk_resource import api
+from django.conf import settings
+from django.core.cache import cache
+
+from services.web.analyze.constants import (
+    RT_SCHEMA_CACHE_KEY_PREFIX,
+    RT_SCHEMA_CACHE_TIMEOUT,
+    RT_SQL_FRAGMENT_CACHE_SIZE,
+)
+
+
+class ResultTableSchemaCache:
+    """
+    结果表结构缓存
+    缓存 Key 中包含全局版本与结果表版本，递增版本即可令旧缓存失效，无需逐个删除
+    """
+
+    cache = cache
+    global_version_key = f"{RT_SCHEMA_CACHE_KEY_PREFIX}:version"
+
+    def __init__(self, result_table_id: str):
+        self.result_table_id = result_table_id
+
+    @property
+    def version_key(self) -> str:
+        return f"{RT_SCHEMA_CACHE_KEY_PREFIX}:version:{self.result_table_id}"
+
+    @property
+    def version(self) -> str:
+        versions = self.cache.get_many([self.global_version_key, self.version_key])
+        return "{}.{}".format(versions.get(self.global_version_key, 0), versions.get(self.version_key, 0))
+
+    def generate_cache_key(self, schema_type: str) -> str:
+        return f"{RT_SCHEMA_CACHE_KEY_PREFIX}:{schema_type}:{self.version}:{self.result_table_id}"
+
+    def get_fields(self) -> List[dict]:
+        """
+        获取结果表字段
+        """
+
+        return self._get_or_fetch("fields", lambda: api.bk_base.get_rt_fields(result_table_id=self.result_table_id))
+
+    def get_result_table(self) -> dict:
+        """
+        获取结果表信息
+        """
+
+        return self._get_or_fetch(
+            "result_table", lambda: api.bk_base.get_result_table(result_table_id=self.result_table_id)
+        )
+
+    def refresh_fields(self) -> List[dict]:
+        """
+        失效后重新拉取结果表字段
+        """
+
+        self.invalidate()
+        return self.get_fields()
+
+    def invalidate(self) -> None:
+        """
+        递增结果表版本，令该结果表的缓存失效
+        """
+
+        self._incr_version(self.version_key)
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        递增全局版本，令所有结果表的缓存失效
+        """
+
+        cls._incr_version(cls.global_version_key)
+
+    def _get_or_fetch(self, schema_type: str, fetch_func: callable) -> any:
+        cache_key = self.generate_cache_key(schema_type)
+        data = self.cache.get(cache_key)
+        if data is not None:
+            return data
+        data = fetch_func()
+        self.cache.set(cache_key, data, RT_SCHEMA_CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def _incr_version(cls, key: str) -> None:
+        cls.cache.add(key, 0, None)
+        try:
+            cls.cache.incr(key)
+        except ValueError:
+            cls.cache.set(key, 1, None)
+
+
+@functools.lru_cache(maxsize=RT_SQL_FRAGMENT_CACHE_SIZE)
+def build_sql_field(source_field: str, field_name: str, using_as: bool = True) -> str:
+    """
+    构造单个 SQL 字段，嵌套字段需要使用 UDF 提取
+    """
+
+    alias = f"as {field_name}" if using_as else ""
+    if source_field.find(".") != -1:
+        parent_field, child_field = source_field.split(".", 1)
+        return "{}({}, '{}') {}".format(settings.BKBASE_UDF_JSON_EXTRACT_FUNC, parent_field, child_field, alias)
+    return "{} {}".format(source_field, alias)
+
+
+@functools.lru_cache(maxsize=RT_SQL_FRAGMENT_CACHE_SIZE)
+def build_sql_case_branch(system_id: str, action_id: str, source_field: str, field_name: str) -> str:
+    """
+    构造系统/操作映射的 CASE WHEN 分支，action_id 为空时仅匹配系统
+    """
+
+    return "WHEN system_id = '{system_id}' {action_id} THEN {field_mapping}".format(
+        system_id=system_id,
+        action_id="AND action_id = '{}'".format(action_id) if action_id else "",
+        field_mapping=build_sql_field(source_field=source_field, field_name=field_name, using_as=False),
+    )
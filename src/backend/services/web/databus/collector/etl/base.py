@@ -29,8 +29,14 @@ from django.utils.translation import gettext
 
 from apps.meta.utils.fields import PYTHON_FIELD_TYPE_MAP
 from core.models import get_request_username
+from services.web.analyze.utils import ResultTableSchemaCache
 from services.web.databus.collector_plugin.handlers import PluginEtlHandler
-from services.web.databus.constants import JOIN_DATA_RT_FORMAT, EtlConfigEnum
+from services.web.databus.constants import (
+    JOIN_DATA_RT_FORMAT,
+    BkBaseConfigTypeChoices,
+    EtlConfigEnum,
+)
+from services.web.databus.fingerprint import ConfigFingerprint
 from services.web.databus.models import CollectorConfig, Snapshot
 
 
@@ -66,7 +72,12 @@ class EtlStorage:
         etl_params: dict,
         fields: List[dict],
         namespace: str,
+        force: bool = False,
     ) -> None:
+        """
+        创建或更新清洗，配置未变化时跳过更新，force 时总是下发
+        """
+
         # 校验字段类型是否匹配
         self.check_field_type(fields)
 
@@ -96,18 +107,29 @@ class EtlStorage:
             instance.processing_id = result["processing_id"]
             instance.bkbase_table_id = result["result_table_id"]
             instance.save()
+            ConfigFingerprint.save(instance.bkbase_table_id, BkBaseConfigTypeChoices.CLEAN.value, bkbase_params)
 
         # 更新清洗
         else:
             bkbase_params.update({"processing_id": bkbase_params["processing_id"]})
-            api.bk_base.databus_cleans_put(bkbase_params, request_cookies=False)
-            self.restart_bkbase_clean(bkbase_params["result_table_id"], bkbase_params["processing_id"])
+            ConfigFingerprint.push(
+                instance.bkbase_table_id,
+                BkBaseConfigTypeChoices.CLEAN.value,
+                bkbase_params,
+                lambda: self.update_bkbase_clean(instance, bkbase_params),
+                force=force,
+            )
 
         instance.fields = instance_fields
         instance.etl_config = self.etl_config
         instance.etl_params = etl_params
         instance.save()
 
+    def update_bkbase_clean(self, instance: CollectorConfig, bkbase_params: dict) -> None:
+        api.bk_base.databus_cleans_put(bkbase_params, request_cookies=False)
+        ResultTableSchemaCache(instance.bkbase_table_id).invalidate()
+        self.restart_bkbase_clean(bkbase_params["result_table_id"], bkbase_params["processing_id"])
+
     @classmethod
     def check_field_type(cls, fields: List[dict]):
         """检查字段类型"""
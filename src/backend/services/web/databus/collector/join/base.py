@@ -16,6 +16,8 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+from typing import Callable, Dict, Optional
+
 from bk_resource import api
 from blueapps.utils.logger import logger
 from django.conf import settings
@@ -42,10 +44,12 @@ from services.web.databus.collector.join.http_pull import HttpPullHandler
 from services.web.databus.constants import (
     ASSET_RT_FORMAT,
     JOIN_DATA_RT_FORMAT,
+    SnapshotProvisionStatusChoices,
+    SnapshotProvisionStepChoices,
     SnapshotRunningStatus,
     SnapShotStorageChoices,
 )
-from services.web.databus.models import CollectorConfig, Snapshot
+from services.web.databus.models import CollectorConfig, Snapshot, SnapshotProvisionStep
 
 
 class JoinConfig:
@@ -88,15 +92,32 @@ class JoinConfig:
 
 
 class JoinDataHandler:
+    """
+    快照接入
+    1. 接入 -> 清洗 -> 入库 -> 更新采集项清洗，每一步的状态记录在 SnapshotProvisionStep 中
+    2. 失败后重试时跳过已成功的步骤，全部完成后清理步骤记录
+    """
+
     storage_type = SnapShotStorageChoices.REDIS.value
+    etl_storage_handler_class = JoinDataEtlStorageHandler
 
-    def __init__(self, system_id: str, resource_type_id: str):
+    def __init__(
+        self,
+        system_id: str,
+        resource_type_id: str,
+        system: Optional[System] = None,
+        resource_type: Optional[ResourceType] = None,
+        snapshot: Optional[Snapshot] = None,
+    ):
         self.system_id = system_id
-        self.system = System.objects.get(system_id=system_id)
+        self.system = system or System.objects.get(system_id=system_id)
         self.resource_type_id = resource_type_id
-        self.resource_type = ResourceType.objects.get(system_id=system_id, resource_type_id=resource_type_id)
+        self.resource_type = resource_type or ResourceType.objects.get(
+            system_id=system_id, resource_type_id=resource_type_id
+        )
         self.collectors = self.load_collectors()
-        self.snapshot = self.get_snapshot_instance()
+        self.snapshot = snapshot or self.get_snapshot_instance()
+        self._steps: Optional[Dict[str, SnapshotProvisionStep]] = None
 
     def get_snapshot_instance(self):
         snapshot, _ = Snapshot.objects.get_or_create(system_id=self.system_id, resource_type_id=self.resource_type_id)
@@ -110,14 +131,16 @@ class JoinDataHandler:
     def start(self):
         try:
             # 创建DATAID
-            self.create_dataid()
+            self.run_step(SnapshotProvisionStepChoices.DATA_ID.value, self.create_dataid)
             # 创建清洗入库
             self.create_data_etl_storage()
             # 更新采集项清洗链路
-            self.update_log_clean_link()
+            self.run_step(SnapshotProvisionStepChoices.CLEAN_LINK.value, self.update_log_clean_link)
             # 更新状态
             self.update_status(SnapshotRunningStatus.RUNNING.value)
             self.snapshot.save()
+            # 全部完成，下次接入重新执行
+            self.clear_steps()
         except Exception as err:  # NOCC:broad-except(需要处理所有错误)
             self.update_status(SnapshotRunningStatus.FAILED.value)
             self.snapshot.save()
@@ -135,6 +158,49 @@ class JoinDataHandler:
     def update_status(self, status: str) -> None:
         self.snapshot.status = status
 
+    @property
+    def steps(self) -> Dict[str, SnapshotProvisionStep]:
+        if self._steps is None:
+            self._steps = {
+                step.step: step
+                for step in SnapshotProvisionStep.objects.filter(
+                    snapshot_id=self.snapshot.id, storage_type=self.storage_type
+                )
+            }
+        return self._steps
+
+    def run_step(self, step: str, func: Callable):
+        """
+        执行步骤，已成功的步骤直接返回上次的结果
+        """
+
+        record = self.steps.get(step)
+        if record and record.status == SnapshotProvisionStatusChoices.SUCCEEDED.value:
+            logger.info(f"{self.__class__.__name__} Skip Step {step}; SnapshotID => {self.snapshot.id}")
+            return record.result
+        if record is None:
+            record = SnapshotProvisionStep(snapshot_id=self.snapshot.id, storage_type=self.storage_type, step=step)
+            self.steps[step] = record
+        record.status = SnapshotProvisionStatusChoices.RUNNING.value
+        record.attempts += 1
+        record.save()
+        try:
+            result = func()
+        except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+            record.status = SnapshotProvisionStatusChoices.FAILED.value
+            record.error = str(err)
+            record.save(update_fields=["status", "error", "updated_at"])
+            raise
+        record.status = SnapshotProvisionStatusChoices.SUCCEEDED.value
+        record.result = result
+        record.error = None
+        record.save(update_fields=["status", "result", "error", "updated_at"])
+        return result
+
+    def clear_steps(self) -> None:
+        SnapshotProvisionStep.objects.filter(snapshot_id=self.snapshot.id, storage_type=self.storage_type).delete()
+        self._steps = {}
+
     def stop(self):
         # 直接停止采集任务
         params = {
@@ -155,20 +221,31 @@ class JoinDataHandler:
         http_pull_handler = HttpPullHandler(self.system, self.resource_type, self.snapshot, self.storage_type)
         self.snapshot.bkbase_data_id = http_pull_handler.update_or_create()
         self.snapshot.save()
+        return self.snapshot.bkbase_data_id
 
     def create_data_etl_storage(self):
         # 已有清洗链路不做调整
         if self._get_table_id():
             logger.info(f"{self.__class__.__name__} Skip EtlStorage; SnapshotID => {self.snapshot.id}")
             return
-        # 没有清洗链路则创建
+        # 没有清洗链路则创建，清洗与入库分步执行，失败后从未完成的步骤继续
         logger.info(f"{self.__class__.__name__} Create EtlStorage; SnapshotID => {self.snapshot.id}")
-        etl_storage_handler = JoinDataEtlStorageHandler(
+        etl_storage_handler = self.etl_storage_handler_class(
             self.snapshot.bkbase_data_id, self.system, self.resource_type, self.storage_type
         )
-        self.snapshot.bkbase_processing_id, self.snapshot.bkbase_table_id = etl_storage_handler.create()
+        clean = self.run_step(SnapshotProvisionStepChoices.CLEAN.value, etl_storage_handler.create_clean)
+        self.run_step(
+            SnapshotProvisionStepChoices.START_CLEAN.value,
+            lambda: etl_storage_handler.start_clean(clean["processing_id"], clean["result_table_id"]),
+        )
+        self.run_step(SnapshotProvisionStepChoices.STORAGE.value, etl_storage_handler.create_storage)
+        self.set_etl_storage(clean["processing_id"], clean["result_table_id"])
         self.snapshot.save()
 
+    def set_etl_storage(self, processing_id: str, bkbase_table_id: str) -> None:
+        self.snapshot.bkbase_processing_id = processing_id
+        self.snapshot.bkbase_table_id = bkbase_table_id
+
     def _get_table_id(self) -> str:
         if self.storage_type == SnapShotStorageChoices.HDFS.value:
             return self.snapshot.bkbase_hdfs_table_id
@@ -193,6 +270,7 @@ class JoinDataHandler:
 
 class AssetHandler(JoinDataHandler):
     storage_type = SnapShotStorageChoices.HDFS.value
+    etl_storage_handler_class = AssetEtlStorageHandler
 
     def load_collectors(self) -> QuerySet:
         return CollectorConfig.objects.none()
@@ -200,18 +278,9 @@ class AssetHandler(JoinDataHandler):
     def update_status(self, status: str) -> None:
         self.snapshot.hdfs_status = status
 
-    def create_data_etl_storage(self):
-        # 已有清洗链路不做调整
-        if self._get_table_id():
-            logger.info(f"{self.__class__.__name__} Skip EtlStorage; SnapshotID => {self.snapshot.id}")
-            return
-        # 没有清洗链路则创建
-        logger.info(f"{self.__class__.__name__} Create EtlStorage; SnapshotID => {self.snapshot.id}")
-        etl_storage_handler = AssetEtlStorageHandler(
-            self.snapshot.bkbase_data_id, self.system, self.resource_type, self.storage_type
-        )
-        self.snapshot.bkbase_hdfs_processing_id, self.snapshot.bkbase_hdfs_table_id = etl_storage_handler.create()
-        self.snapshot.save()
+    def set_etl_storage(self, processing_id: str, bkbase_table_id: str) -> None:
+        self.snapshot.bkbase_hdfs_processing_id = processing_id
+        self.snapshot.bkbase_hdfs_table_id = bkbase_table_id
 
     @property
     def result_table_id(self):
@@ -47,16 +47,26 @@ class JoinDataEtlStorageHandler:
 
     def create(self):
         # 创建清洗
-        result = api.bk_base.databus_cleans_post(self.clean_config)
-        EtlStorage.start_bkbase_clean(result["result_table_id"], result["processing_id"])
+        result = self.create_clean()
+        self.start_clean(result["processing_id"], result["result_table_id"])
         processing_id = result["processing_id"]
         bkbase_table_id = result["result_table_id"]
 
         # 创建入库
-        api.bk_base.databus_storages_post(self.storage_config)
+        self.create_storage()
 
         return processing_id, bkbase_table_id
 
+    def create_clean(self) -> dict:
+        result = api.bk_base.databus_cleans_post(self.clean_config)
+        return {"processing_id": result["processing_id"], "result_table_id": result["result_table_id"]}
+
+    def start_clean(self, processing_id: str, bkbase_table_id: str) -> None:
+        EtlStorage.start_bkbase_clean(bkbase_table_id, processing_id)
+
+    def create_storage(self) -> None:
+        api.bk_base.databus_storages_post(self.storage_config)
+
     @property
     def config_name(self):
         return JOIN_DATA_RT_FORMAT.format(system_id=self.system_id, resource_type_id=self.resource_type_id).replace(
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from typing import Dict, List, Tuple, Type
+
+from bk_resource.utils.thread_backend import ThreadPool
+from blueapps.utils.logger import logger
+from django.conf import settings
+from django.db.models import Q
+
+from apps.meta.models import ResourceType, System
+from services.web.databus.collector.join.base import AssetHandler, JoinDataHandler
+from services.web.databus.constants import SnapshotRunningStatus, SnapShotStorageChoices
+from services.web.databus.models import Snapshot
+
+
+class SnapshotProvisioner:
+    """
+    快照接入编排
+    1. 一次查询获取所有待接入的快照及其系统、资源类型
+    2. 快照之间并发执行，同一快照的 Redis 与 HDFS 接入在同一线程内顺序执行，避免相互覆盖快照状态
+    3. 单个快照失败不影响其他快照，失败的步骤由下次调度继续执行
+    """
+
+    pending_status = (SnapshotRunningStatus.PREPARING.value, SnapshotRunningStatus.FAILED.value)
+
+    def __init__(self, concurrency: int = None):
+        self.concurrency = concurrency or settings.SNAPSHOT_PROVISION_CONCURRENCY
+
+    def load_snapshots(self) -> List[Snapshot]:
+        return list(
+            Snapshot.objects.filter(
+                Q(status__in=self.pending_status, storage_type=SnapShotStorageChoices.REDIS.value)
+                | Q(hdfs_status__in=self.pending_status, storage_type=SnapShotStorageChoices.HDFS.value)
+            )
+        )
+
+    def get_handler_classes(self, snapshot: Snapshot) -> List[Type[JoinDataHandler]]:
+        handler_classes = []
+        if snapshot.storage_type == SnapShotStorageChoices.REDIS.value and snapshot.status in self.pending_status:
+            handler_classes.append(JoinDataHandler)
+        if snapshot.storage_type == SnapShotStorageChoices.HDFS.value and snapshot.hdfs_status in self.pending_status:
+            handler_classes.append(AssetHandler)
+        return handler_classes
+
+    def run(self) -> None:
+        snapshots = self.load_snapshots()
+        if not snapshots:
+            return
+        system_ids = {snapshot.system_id for snapshot in snapshots}
+        systems: Dict[str, System] = {
+            system.system_id: system for system in System.objects.filter(system_id__in=system_ids)
+        }
+        resource_types: Dict[Tuple[str, str], ResourceType] = {
+            (resource_type.system_id, resource_type.resource_type_id): resource_type
+            for resource_type in ResourceType.objects.filter(
+                system_id__in=system_ids,
+                resource_type_id__in={snapshot.resource_type_id for snapshot in snapshots},
+            )
+        }
+        jobs = []
+        for snapshot in snapshots:
+            system = systems.get(snapshot.system_id)
+            resource_type = resource_types.get((snapshot.system_id, snapshot.resource_type_id))
+            if system is None or resource_type is None:
+                logger.error(
+                    "[SnapshotProvisioner] System or ResourceType Not Exist; SystemID => %s; ResourceTypeID => %s",
+                    snapshot.system_id,
+                    snapshot.resource_type_id,
+                )
+                continue
+            jobs.append((snapshot, system, resource_type))
+        logger.info("[SnapshotProvisioner] Snapshots Count => %s; Concurrency => %s", len(jobs), self.concurrency)
+        pool = ThreadPool(processes=min(self.concurrency, len(jobs)) or 1)
+        try:
+            pool.map_ignore_exception(self.provision, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+    def provision(self, snapshot: Snapshot, system: System, resource_type: ResourceType) -> None:
+        for handler_class in self.get_handler_classes(snapshot):
+            logger.info(
+                "[SnapshotProvisioner] %s; SystemID => %s; ResourceTypeID => %s",
+                handler_class.__name__,
+                snapshot.system_id,
+                snapshot.resource_type_id,
+            )
+            handler_class(
+                snapshot.system_id,
+                snapshot.resource_type_id,
+                system=system,
+                resource_type=resource_type,
+                snapshot=snapshot,
+            ).start()
@@ -16,6 +16,7 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import copy
 import json
 from typing import List
 
@@ -38,13 +39,16 @@ from apps.meta.utils.fields import (
     START_TIME,
     VERSION_ID,
 )
+from services.web.analyze.utils import ResultTableSchemaCache
 from services.web.databus.constants import (
     DEFAULT_STORAGE_CONFIG_KEY,
     DEFAULT_TIME_FORMAT,
     DEFAULT_TIME_LEN,
     DEFAULT_TIME_ZONE,
+    BkBaseConfigTypeChoices,
 )
 from services.web.databus.exceptions import MultiOrNoneRawDataError
+from services.web.databus.fingerprint import ConfigFingerprint
 from services.web.databus.models import CollectorPlugin
 
 
@@ -53,13 +57,23 @@ class PluginEtlHandler:
         self.plugin = CollectorPlugin.objects.get(collector_plugin_id=collector_plugin_id)
         self.bkbase_labels = []
 
-    def create_or_update(self) -> None:
+    def create_or_update(self, force: bool = False) -> None:
+        """
+        创建或更新清洗入库，配置未变化时跳过更新，force 时总是下发
+        """
+
         bkbase_params = self.build_clean_config()
+        clean_config = copy.deepcopy(bkbase_params)
         # 更新
         if self.plugin.bkbase_table_id:
             bkbase_params.update({"processing_id": self.plugin.bkbase_processing_id})
-            api.bk_base.databus_cleans_put(bkbase_params)
-            self.restart_bkbase_clean(self.plugin.bkbase_table_id, self.plugin.bkbase_processing_id)
+            ConfigFingerprint.push(
+                self.plugin.bkbase_table_id,
+                BkBaseConfigTypeChoices.CLEAN.value,
+                clean_config,
+                lambda: self.update_bkbase_clean(bkbase_params),
+                force=force,
+            )
         # 创建
         else:
             result = api.bk_base.databus_cleans_post(bkbase_params)
@@ -67,6 +81,7 @@ class PluginEtlHandler:
             self.plugin.bkbase_processing_id = result["processing_id"]
             self.plugin.bkbase_table_id = result["result_table_id"]
             self.plugin.save(update_fields=["bkbase_processing_id", "bkbase_table_id"])
+            ConfigFingerprint.save(self.plugin.bkbase_table_id, BkBaseConfigTypeChoices.CLEAN.value, clean_config)
         # 入库参数
         default_cluster_id = int(
             GlobalMetaConfig.get(
@@ -103,15 +118,28 @@ class PluginEtlHandler:
         storage_params["physical_table_name"] = f"write_{{yyyyMMdd}}_{table_id}"
 
         # 创建入库
+        storage_config = copy.deepcopy(storage_params)
         if not self.plugin.has_storage:
             api.bk_base.databus_storages_post(storage_params)
             self.plugin.has_storage = True
             self.plugin.save(update_fields=["has_storage"])
+            ConfigFingerprint.save(self.plugin.bkbase_table_id, BkBaseConfigTypeChoices.STORAGE.value, storage_config)
 
         # 更新入库
         else:
             storage_params.update({"result_table_id": self.plugin.bkbase_table_id})
-            api.bk_base.databus_storages_put(storage_params)
+            ConfigFingerprint.push(
+                self.plugin.bkbase_table_id,
+                BkBaseConfigTypeChoices.STORAGE.value,
+                storage_config,
+                lambda: api.bk_base.databus_storages_put(storage_params),
+                force=force,
+            )
+
+    def update_bkbase_clean(self, bkbase_params: dict) -> None:
+        api.bk_base.databus_cleans_put(bkbase_params)
+        ResultTableSchemaCache(self.plugin.bkbase_table_id).invalidate()
+        self.restart_bkbase_clean(self.plugin.bkbase_table_id, self.plugin.bkbase_processing_id)
 
     def get_config_name(self) -> str:
         return self.plugin.collector_plugin_name_en.lower()
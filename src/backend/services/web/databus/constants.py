@@ -63,6 +63,8 @@ DEFAULT_TIME_LEN = 13
 COLLECTOR_PLUGIN_ID = "collector_plugin_id"
 
 STORAGE_ALLOCATION_MIN_DAYS_KEY = "storage_allocation_min_days_{id}"
+STORAGE_CLUSTER_CACHE_KEY = "databus:storage:clusters:{version}:{username}:{digest}"
+STORAGE_CLUSTER_VERSION_KEY = "databus:storage:clusters:version"
 
 DEFAULT_RETENTION = _DEFAULT_RETENTION
 DEFAULT_ALLOCATION_MIN_DAYS = 0
@@ -157,6 +159,25 @@ class SnapshotRunningStatus(TextChoices):
         return cls.CLOSED.value
 
 
+class SnapshotProvisionStepChoices(TextChoices):
+    DATA_ID = "data_id", gettext_lazy("创建接入")
+    CLEAN = "clean", gettext_lazy("创建清洗")
+    START_CLEAN = "start_clean", gettext_lazy("启动清洗")
+    STORAGE = "storage", gettext_lazy("创建入库")
+    CLEAN_LINK = "clean_link", gettext_lazy("更新采集项清洗")
+
+
+class SnapshotProvisionStatusChoices(TextChoices):
+    RUNNING = "running", gettext_lazy("执行中")
+    SUCCEEDED = "succeeded", gettext_lazy("成功")
+    FAILED = "failed", gettext_lazy("失败")
+
+
+class BkBaseConfigTypeChoices(TextChoices):
+    CLEAN = "clean", gettext_lazy("清洗")
+    STORAGE = "storage", gettext_lazy("入库")
+
+
 class SnapShotStorageChoices(TextChoices):
     HDFS = "hdfs", gettext_lazy("HDFS")
     REDIS = "redis", gettext_lazy("Redis")
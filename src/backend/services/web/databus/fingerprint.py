@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import hashlib
+import json
+from typing import Callable, Dict
+
+from blueapps.utils.logger import logger
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from services.web.databus.models import BkBaseConfigFingerprint
+
+
+class ConfigFingerprint:
+    """
+    BKBase 配置指纹
+    1. 配置按键排序后序列化计算摘要，与结果表最后一次下发的摘要比较
+    2. 配置未变化时跳过下发并记录跳过次数，force 时总是下发
+    """
+
+    @classmethod
+    def canonicalize(cls, config):
+        if isinstance(config, dict):
+            return {str(key): cls.canonicalize(val) for key, val in config.items()}
+        if isinstance(config, (list, tuple)):
+            return [cls.canonicalize(item) for item in config]
+        # 清洗配置中的 json_config 为序列化后的字符串，解析后再比较
+        if isinstance(config, str) and config[:1] in ("{", "["):
+            try:
+                return cls.canonicalize(json.loads(config))
+            except ValueError:
+                return config
+        return config
+
+    @classmethod
+    def build(cls, config: dict) -> str:
+        content = json.dumps(
+            cls.canonicalize(config), sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @classmethod
+    def is_changed(cls, result_table_id: str, config_type: str, config: dict) -> bool:
+        fingerprint = (
+            BkBaseConfigFingerprint.objects.filter(result_table_id=result_table_id, config_type=config_type)
+            .values_list("fingerprint", flat=True)
+            .first()
+        )
+        return fingerprint != cls.build(config)
+
+    @classmethod
+    def save(cls, result_table_id: str, config_type: str, config: dict) -> None:
+        BkBaseConfigFingerprint.objects.update_or_create(
+            result_table_id=result_table_id,
+            config_type=config_type,
+            defaults={"fingerprint": cls.build(config), "pushed_at": timezone.now()},
+        )
+
+    @classmethod
+    def skip(cls, result_table_id: str, config_type: str) -> None:
+        BkBaseConfigFingerprint.objects.filter(result_table_id=result_table_id, config_type=config_type).update(
+            skipped_count=F("skipped_count") + 1, skipped_at=timezone.now()
+        )
+
+    @classmethod
+    def push(cls, result_table_id: str, config_type: str, config: dict, func: Callable, force: bool = False) -> bool:
+        """
+        配置变化时执行下发并记录指纹
+        :return: 是否下发
+        """
+
+        if not force and not cls.is_changed(result_table_id, config_type, config):
+            cls.skip(result_table_id, config_type)
+            logger.info("[ConfigFingerprint] Skip Unchanged %s; ResultTableID => %s", config_type, result_table_id)
+            return False
+        func()
+        cls.save(result_table_id, config_type, config)
+        return True
+
+    @classmethod
+    def skipped_stats(cls) -> Dict[str, int]:
+        """
+        各类型配置的跳过次数
+        """
+
+        return {
+            item["config_type"]: item["skipped"] or 0
+            for item in BkBaseConfigFingerprint.objects.values("config_type").annotate(skipped=Sum("skipped_count"))
+        }
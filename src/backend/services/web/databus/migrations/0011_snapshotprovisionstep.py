@@ -0,0 +1,59 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("databus", "0010_auto_20230625_1502"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SnapshotProvisionStep",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("snapshot_id", models.BigIntegerField(db_index=True, verbose_name="快照ID")),
+                (
+                    "storage_type",
+                    models.CharField(
+                        choices=[("hdfs", "HDFS"), ("redis", "Redis")], max_length=32, verbose_name="Storage Type"
+                    ),
+                ),
+                (
+                    "step",
+                    models.CharField(
+                        choices=[
+                            ("data_id", "创建接入"),
+                            ("clean", "创建清洗"),
+                            ("start_clean", "启动清洗"),
+                            ("storage", "创建入库"),
+                            ("clean_link", "更新采集项清洗"),
+                        ],
+                        max_length=32,
+                        verbose_name="步骤",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "执行中"), ("succeeded", "成功"), ("failed", "失败")],
+                        default="running",
+                        max_length=32,
+                        verbose_name="状态",
+                    ),
+                ),
+                ("result", models.JSONField(blank=True, null=True, verbose_name="结果")),
+                ("error", models.TextField(blank=True, null=True, verbose_name="错误信息")),
+                ("attempts", models.IntegerField(default=0, verbose_name="执行次数")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="更新时间")),
+            ],
+            options={
+                "verbose_name": "快照接入步骤",
+                "verbose_name_plural": "快照接入步骤",
+                "ordering": ["id"],
+                "unique_together": {("snapshot_id", "storage_type", "step")},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("databus", "0011_snapshotprovisionstep"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BkBaseConfigFingerprint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("result_table_id", models.CharField(max_length=255, verbose_name="结果表ID")),
+                (
+                    "config_type",
+                    models.CharField(choices=[("clean", "清洗"), ("storage", "入库")], max_length=32, verbose_name="配置类型"),
+                ),
+                ("fingerprint", models.CharField(max_length=64, verbose_name="配置指纹")),
+                ("skipped_count", models.IntegerField(default=0, verbose_name="跳过次数")),
+                ("pushed_at", models.DateTimeField(blank=True, null=True, verbose_name="下发时间")),
+                ("skipped_at", models.DateTimeField(blank=True, null=True, verbose_name="最近跳过时间")),
+            ],
+            options={
+                "verbose_name": "BKBase 配置指纹",
+                "verbose_name_plural": "BKBase 配置指纹",
+                "ordering": ["-id"],
+                "unique_together": {("result_table_id", "config_type")},
+            },
+        ),
+    ]
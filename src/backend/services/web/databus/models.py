@@ -27,8 +27,11 @@ from services.web.databus.constants import (
     DEFAULT_STORAGE_REPLIES,
     DEFAULT_STORAGE_SHARD_SIZE,
     DEFAULT_STORAGE_SHARDS,
+    BkBaseConfigTypeChoices,
     CustomTypeEnum,
     PluginSceneChoices,
+    SnapshotProvisionStatusChoices,
+    SnapshotProvisionStepChoices,
     SnapshotRunningStatus,
     SnapShotStorageChoices,
     SourcePlatformChoices,
@@ -210,6 +213,34 @@ class Snapshot(SoftDeleteModel):
         unique_together = [["system_id", "resource_type_id"]]
 
 
+class SnapshotProvisionStep(models.Model):
+    """
+    快照接入步骤
+    1. 记录每个快照每种存储的接入步骤状态，失败后从未成功的步骤继续
+    2. 全部步骤完成后删除
+    """
+
+    snapshot_id = models.BigIntegerField(gettext_lazy("快照ID"), db_index=True)
+    storage_type = models.CharField(gettext_lazy("Storage Type"), max_length=32, choices=SnapShotStorageChoices.choices)
+    step = models.CharField(gettext_lazy("步骤"), max_length=32, choices=SnapshotProvisionStepChoices.choices)
+    status = models.CharField(
+        gettext_lazy("状态"),
+        max_length=32,
+        choices=SnapshotProvisionStatusChoices.choices,
+        default=SnapshotProvisionStatusChoices.RUNNING.value,
+    )
+    result = models.JSONField(gettext_lazy("结果"), null=True, blank=True)
+    error = models.TextField(gettext_lazy("错误信息"), null=True, blank=True)
+    attempts = models.IntegerField(gettext_lazy("执行次数"), default=0)
+    updated_at = models.DateTimeField(gettext_lazy("更新时间"), auto_now=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("快照接入步骤")
+        verbose_name_plural = verbose_name
+        unique_together = [["snapshot_id", "storage_type", "step"]]
+        ordering = ["id"]
+
+
 class StorageOperateLog(models.Model):
     """
     存储集群创建更新配置
@@ -228,3 +259,23 @@ class StorageOperateLog(models.Model):
     @classmethod
     def create(cls, cluster_id):
         cls.objects.create(cluster_id=cluster_id, operator=get_request_username(), request_id=get_local_request_id())
+
+
+class BkBaseConfigFingerprint(models.Model):
+    """
+    BKBase 清洗入库配置指纹
+    记录每个结果表最后一次下发的配置摘要，配置未变化时跳过下发
+    """
+
+    result_table_id = models.CharField(gettext_lazy("结果表ID"), max_length=255)
+    config_type = models.CharField(gettext_lazy("配置类型"), max_length=32, choices=BkBaseConfigTypeChoices.choices)
+    fingerprint = models.CharField(gettext_lazy("配置指纹"), max_length=64)
+    skipped_count = models.IntegerField(gettext_lazy("跳过次数"), default=0)
+    pushed_at = models.DateTimeField(gettext_lazy("下发时间"), null=True, blank=True)
+    skipped_at = models.DateTimeField(gettext_lazy("最近跳过时间"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("BKBase 配置指纹")
+        verbose_name_plural = verbose_name
+        unique_together = [["result_table_id", "config_type"]]
+        ordering = ["-id"]
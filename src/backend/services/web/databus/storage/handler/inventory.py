@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple, Union
+from uuid import uuid1
+
+from bk_resource import api
+from bk_resource.utils.thread_backend import ThreadPool
+from blueapps.utils.logger import logger
+from blueapps.utils.request_provider import get_request_username
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Min
+
+from apps.meta.constants import ConfigLevelChoices
+from apps.meta.models import GlobalMetaConfig
+from services.web.databus.constants import (
+    DEFAULT_ALLOCATION_MIN_DAYS,
+    STORAGE_ALLOCATION_MIN_DAYS_KEY,
+    STORAGE_CLUSTER_CACHE_KEY,
+    STORAGE_CLUSTER_VERSION_KEY,
+)
+from services.web.databus.models import StorageOperateLog
+
+
+class StorageInventory:
+    """
+    存储集群清单
+    1. bk_log 集群列表按请求用户短暂缓存，集群变更后通过版本号失效
+    2. 所有集群的操作记录、保留天数配置各自批量查询，查询次数与集群数量无关
+    3. 集群连通性按集群并发探测
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def load_clusters(self, **params) -> List[dict]:
+        """
+        获取 bk_log 集群列表，bk_log 按请求用户的权限过滤集群，缓存不可跨用户共享
+        """
+
+        version = cache.get(STORAGE_CLUSTER_VERSION_KEY, "")
+        digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        cache_key = STORAGE_CLUSTER_CACHE_KEY.format(
+            version=version, username=get_request_username() or "", digest=digest
+        )
+        clusters = cache.get(cache_key)
+        if clusters is None:
+            clusters = api.bk_log.get_storages(**params)
+            cache.set(cache_key, clusters, settings.STORAGE_CLUSTER_CACHE_TIMEOUT)
+        return clusters
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cache.set(STORAGE_CLUSTER_VERSION_KEY, uuid1().hex, None)
+
+    def load_operate_logs(self, cluster_ids: List[int]) -> Dict[int, Tuple[StorageOperateLog, StorageOperateLog]]:
+        """
+        获取集群的 (创建, 最后更新) 操作记录
+        """
+
+        bounds = (
+            StorageOperateLog.objects.filter(cluster_id__in=cluster_ids)
+            .values("cluster_id")
+            .annotate(first_id=Min("id"), last_id=Max("id"))
+            .order_by()
+        )
+        bounds = {item["cluster_id"]: (item["first_id"], item["last_id"]) for item in bounds}
+        log_ids = {log_id for ids in bounds.values() for log_id in ids}
+        logs = StorageOperateLog.objects.in_bulk(log_ids) if log_ids else {}
+        return {cluster_id: (logs[first_id], logs[last_id]) for cluster_id, (first_id, last_id) in bounds.items()}
+
+    def load_allocation_min_days(self, cluster_ids: List[int]) -> Dict[int, int]:
+        """
+        获取集群的保留天数配置，未配置时使用默认值
+        """
+
+        config_keys = {STORAGE_ALLOCATION_MIN_DAYS_KEY.format(id=cluster_id): cluster_id for cluster_id in cluster_ids}
+        configs = {
+            config_keys[config.config_key]: config.config_value
+            for config in GlobalMetaConfig.objects.filter(
+                config_level=ConfigLevelChoices.NAMESPACE.value,
+                instance_key=self.namespace,
+                config_key__in=config_keys.keys(),
+            )
+        }
+        return {cluster_id: configs.get(cluster_id, DEFAULT_ALLOCATION_MIN_DAYS) for cluster_id in cluster_ids}
+
+    @classmethod
+    def probe(cls, cluster_ids: List[Union[int, str]], concurrency: int = None, **kwargs) -> Dict[str, bool]:
+        """
+        并发探测集群连通性，单个集群探测失败视为不可用
+        """
+
+        cluster_ids = [str(cluster_id) for cluster_id in cluster_ids if cluster_id]
+        if not cluster_ids:
+            return {}
+        concurrency = min(concurrency or settings.STORAGE_PROBE_CONCURRENCY, len(cluster_ids))
+        pool = ThreadPool(processes=concurrency)
+        try:
+            results = pool.map_ignore_exception(
+                lambda cluster_id: api.bk_log.batch_connectivity_detect(cluster_ids=cluster_id, **kwargs),
+                cluster_ids,
+                return_exception=True,
+            )
+        finally:
+            pool.close()
+            pool.join()
+        status = {}
+        for cluster_id, result in zip(cluster_ids, results):
+            if isinstance(result, Exception):
+                logger.error("[StorageInventory] Probe Failed; ClusterID => %s; Err => %s", cluster_id, result)
+                status[cluster_id] = False
+                continue
+            status[cluster_id] = bool(result.get(cluster_id, result.get(int(cluster_id), False)))
+        return status
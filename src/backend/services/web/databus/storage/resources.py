@@ -16,9 +16,10 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+from typing import Dict, Tuple
+
 from bk_resource import Resource, api, resource
 from bk_resource.utils.common_utils import ignored
-from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy
@@ -31,6 +32,7 @@ from apps.exceptions import MetaConfigNotExistException, StorageChanging
 from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
 from apps.permission.handlers.actions import ActionEnum
+from core.utils.lock import TaskLease
 from core.utils.tools import single_task_cache_key
 from services.web.databus.constants import (
     COLLECTOR_PLUGIN_ID,
@@ -40,10 +42,12 @@ from services.web.databus.constants import (
 )
 from services.web.databus.models import CollectorPlugin, StorageOperateLog
 from services.web.databus.storage.handler.es import StorageConfig
+from services.web.databus.storage.handler.inventory import StorageInventory
 from services.web.databus.storage.handler.redis import RedisHandler
 from services.web.databus.storage.serializers import (
     CreateRedisRequestSerializer,
     CreateRedisResponseSerializer,
+    StorageBatchConnectivityDetectRequestSerializer,
     StorageCreateRequestSerializer,
     StorageDeleteRequestSerializer,
     StorageListRequestSerializer,
@@ -69,6 +73,7 @@ class DeleteStorageResource(StorageMeta, Resource):
     def perform_request(self, validated_request_data):
         data = api.bk_log.delete_storage(validated_request_data)
         StorageOperateLog.create(validated_request_data["cluster_id"])
+        StorageInventory.invalidate()
         bk_audit_client.add_event(action=ActionEnum.DELETE_STORAGE)
         return data
 
@@ -83,6 +88,7 @@ class UpdateStorageResource(StorageMeta, Resource):
             validated_request_data["auth_info"]["password"] = asymmetric_cipher.decrypt(password)
         data = api.bk_log.update_storage(validated_request_data)
         StorageOperateLog.create(validated_request_data["cluster_id"])
+        StorageInventory.invalidate()
         self.record_config(data["cluster_config"]["cluster_id"], validated_request_data)
         bk_audit_client.add_event(action=ActionEnum.EDIT_STORAGE)
         return data
@@ -94,8 +100,7 @@ class StorageActivateResource(StorageMeta, Resource):
 
     @transaction.atomic
     def perform_request(self, validated_request_data):
-        cache_key = single_task_cache_key(change_storage_cluster)
-        if cache.get(cache_key):
+        if TaskLease(single_task_cache_key(change_storage_cluster)).inspect():
             raise StorageChanging()
         # 设置默认集群
         namespace = validated_request_data["namespace"]
@@ -129,46 +134,45 @@ class StorageListResource(StorageMeta, Resource):
         condition_keyword = name.find(keyword) != -1 or domain.find(keyword) != -1
         return condition_namespace and condition_keyword
 
-    def _update_default_option(self, default_cluster_id: int, cluster: dict, namespace: str) -> dict:
+    def _format_time(self, operate_at) -> str:
+        return operate_at.astimezone(timezone.get_default_timezone()).strftime(api_settings.DATETIME_FORMAT)
+
+    def _update_default_option(
+        self,
+        default_cluster_id: int,
+        cluster: dict,
+        operate_logs: Dict[int, Tuple[StorageOperateLog, StorageOperateLog]],
+        allocation_min_days: Dict[int, int],
+    ) -> dict:
+        cluster_id = cluster["cluster_config"]["cluster_id"]
         option = cluster["cluster_config"]["custom_option"].get("option", {})
         option.update(
             {
-                "is_default": bool(cluster["cluster_config"]["cluster_id"] == default_cluster_id),
+                "is_default": bool(cluster_id == default_cluster_id),
                 "updater": "",
                 "update_at": "",
                 "creator": "",
                 "create_at": "",
             }
         )
-        update_log = StorageOperateLog.objects.filter(cluster_id=cluster["cluster_config"]["cluster_id"]).first()
-        if update_log:
+        if cluster_id in operate_logs:
+            create_log, update_log = operate_logs[cluster_id]
             option.update(
                 {
                     "updater": update_log.operator,
-                    "update_at": update_log.operate_at.astimezone(timezone.get_default_timezone()).strftime(
-                        api_settings.DATETIME_FORMAT
-                    ),
-                }
-            )
-        create_log = StorageOperateLog.objects.filter(cluster_id=cluster["cluster_config"]["cluster_id"]).last()
-        if create_log:
-            option.update(
-                {
+                    "update_at": self._format_time(update_log.operate_at),
                     "creator": create_log.operator,
-                    "create_at": create_log.operate_at.astimezone(timezone.get_default_timezone()).strftime(
-                        api_settings.DATETIME_FORMAT
-                    ),
+                    "create_at": self._format_time(create_log.operate_at),
                 }
             )
         cluster["cluster_config"]["custom_option"]["option"] = option
-        cluster["cluster_config"]["custom_option"]["allocation_min_days"] = StorageConfig.get_allocation_min_days(
-            namespace, cluster["cluster_config"]["cluster_id"]
-        )
+        cluster["cluster_config"]["custom_option"]["allocation_min_days"] = allocation_min_days[cluster_id]
         return cluster
 
     def perform_request(self, validated_request_data):
         namespace = validated_request_data["namespace"]
-        bk_log_clusters = api.bk_log.get_storages(**validated_request_data)
+        inventory = StorageInventory(namespace)
+        bk_log_clusters = inventory.load_clusters(**validated_request_data)
         try:
             default_cluster_id = int(
                 GlobalMetaConfig.get(
@@ -180,14 +184,27 @@ class StorageListResource(StorageMeta, Resource):
         except MetaConfigNotExistException:
             default_cluster_id = EMPTY_CLUSTER_ID
         clusters = [
-            self._update_default_option(default_cluster_id, cluster, namespace)
-            for cluster in bk_log_clusters
-            if self._check_filter_clusters(cluster, validated_request_data)
+            cluster for cluster in bk_log_clusters if self._check_filter_clusters(cluster, validated_request_data)
+        ]
+        cluster_ids = [cluster["cluster_config"]["cluster_id"] for cluster in clusters]
+        operate_logs = inventory.load_operate_logs(cluster_ids)
+        allocation_min_days = inventory.load_allocation_min_days(cluster_ids)
+        clusters = [
+            self._update_default_option(default_cluster_id, cluster, operate_logs, allocation_min_days)
+            for cluster in clusters
         ]
         bk_audit_client.add_event(action=ActionEnum.LIST_STORAGE)
         return clusters
 
 
+class BatchConnectivityDetectResource(StorageMeta, Resource):
+    name = gettext_lazy("批量连通性测试")
+    RequestSerializer = StorageBatchConnectivityDetectRequestSerializer
+
+    def perform_request(self, validated_request_data):
+        return StorageInventory.probe(validated_request_data["cluster_ids"].split(","))
+
+
 class CreateStorageResource(StorageMeta, Resource):
     name = gettext_lazy("创建集群")
     RequestSerializer = StorageCreateRequestSerializer
@@ -199,6 +216,7 @@ class CreateStorageResource(StorageMeta, Resource):
             validated_request_data["auth_info"]["password"] = asymmetric_cipher.decrypt(password)
         data = api.bk_log.create_storage(validated_request_data)
         StorageOperateLog.create(data)
+        StorageInventory.invalidate()
         self.record_config(data, validated_request_data)
         try:
             GlobalMetaConfig.get(
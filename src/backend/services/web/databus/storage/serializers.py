@@ -67,6 +67,10 @@ class StorageUpdateRequestSerializer(serializers.Serializer):
         return attrs
 
 
+class StorageBatchConnectivityDetectRequestSerializer(serializers.Serializer):
+    cluster_ids = serializers.CharField(label=gettext_lazy("集群ID"))
+
+
 class StorageListRequestSerializer(serializers.Serializer):
     namespace = serializers.CharField(label=gettext_lazy("Namespace"))
     keyword = serializers.CharField(label=gettext_lazy("搜索关键字"), allow_null=True, allow_blank=True, required=False)
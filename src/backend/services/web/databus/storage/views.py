@@ -44,7 +44,7 @@ class StoragesViewSet(ResourceViewSet):
             decorators=[insert_action_permission_field(actions=[ActionEnum.EDIT_STORAGE, ActionEnum.DELETE_STORAGE])],
         ),
         ResourceRoute("POST", api.bk_log.connectivity_detect, endpoint="connectivity_detect"),
-        ResourceRoute("GET", api.bk_log.batch_connectivity_detect, endpoint="batch_connectivity_detect"),
+        ResourceRoute("GET", resource.databus.storage.batch_connectivity_detect, endpoint="batch_connectivity_detect"),
         ResourceRoute("POST", resource.databus.storage.create_storage),
         ResourceRoute("PUT", resource.databus.storage.update_storage, pk_field="cluster_id"),
         ResourceRoute("DELETE", resource.databus.storage.delete_storage, pk_field="cluster_id"),
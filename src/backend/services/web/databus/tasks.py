@@ -36,7 +36,7 @@ from core.utils.tools import single_task_decorator
 from services.web.databus.collector.check.handlers import ReportCheckHandler
 from services.web.databus.collector.etl.base import EtlStorage
 from services.web.databus.collector.handlers import TailLogHandler
-from services.web.databus.collector.join.base import AssetHandler, JoinDataHandler
+from services.web.databus.collector.join.provision import SnapshotProvisioner
 from services.web.databus.collector_plugin.handlers import PluginEtlHandler
 from services.web.databus.constants import (
     API_PUSH_ETL_RETRY_TIMES,
@@ -45,7 +45,6 @@ from services.web.databus.constants import (
     EtlConfigEnum,
     PluginSceneChoices,
     SnapshotRunningStatus,
-    SnapShotStorageChoices,
 )
 from services.web.databus.models import CollectorConfig, CollectorPlugin, Snapshot
 
@@ -53,24 +52,8 @@ from services.web.databus.models import CollectorConfig, CollectorPlugin, Snapsh
 @periodic_task(run_every=crontab(minute="*/1"))
 @single_task_decorator
 def start_snapshot():
-    # 获取所有的启动中快照并逐个运行 (Redis)
-    snapshots = Snapshot.objects.filter(
-        status__in=(SnapshotRunningStatus.PREPARING.value, SnapshotRunningStatus.FAILED.value),
-        storage_type__in=(SnapShotStorageChoices.REDIS.value,),
-    )
-    for snapshot in snapshots:
-        logger.info(
-            "[start_snapshot] SystemID => %s; ResourceTypeID => %s", snapshot.system_id, snapshot.resource_type_id
-        )
-        JoinDataHandler(snapshot.system_id, snapshot.resource_type_id).start()
-    # 创建HDFS快照
-    snapshots = Snapshot.objects.filter(
-        hdfs_status__in=(SnapshotRunningStatus.PREPARING.value, SnapshotRunningStatus.FAILED.value),
-        storage_type__in=(SnapShotStorageChoices.HDFS.value,),
-    )
-    for snapshot in snapshots:
-        logger.info("[start_asset] SystemID => %s; ResourceTypeID => %s", snapshot.system_id, snapshot.resource_type_id)
-        AssetHandler(snapshot.system_id, snapshot.resource_type_id).start()
+    # 并发运行所有启动中及失败的快照，失败的快照从未完成的步骤继续
+    SnapshotProvisioner().run()
 
 
 @periodic_task(run_every=crontab(minute="*/10"))
@@ -119,11 +102,13 @@ def change_storage_cluster():
             try:
                 system = System.objects.get(system_id=collector.system_id)
                 etl_storage: EtlStorage = EtlStorage.get_instance(collector.etl_config)
+                # 存储变更时总是下发
                 etl_storage.update_or_create(
                     collector.collector_config_id,
                     collector.etl_params,
                     collector.fields,
                     system.namespace,
+                    force=True,
                 )
                 collector.refresh_from_db()
                 collector.storage_changed = False
@@ -242,7 +227,7 @@ def check_report_continues(end_time: datetime.datetime = None, time_period: int
 
 @periodic_task(run_every=crontab(minute="*/1"))
 @single_task_decorator
-def create_or_update_plugin_etl(collector_plugin_id: int = None):
+def create_or_update_plugin_etl(collector_plugin_id: int = None, force: bool = False):
     """创建或更新采集插件清洗入库"""
 
     if collector_plugin_id:
@@ -254,4 +239,4 @@ def create_or_update_plugin_etl(collector_plugin_id: int = None):
         )
     # 创建或更新
     for plugin in plugins:
-        PluginEtlHandler(collector_plugin_id=plugin.collector_plugin_id).create_or_update()
+        PluginEtlHandler(collector_plugin_id=plugin.collector_plugin_id).create_or_update(force=force)
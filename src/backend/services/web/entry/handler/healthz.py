@@ -27,6 +27,7 @@ from redis import StrictRedis
 
 from apps.exceptions import HealthzCheckFailed
 from services.web.databus.models import RedisConfig
+from services.web.databus.storage.handler.inventory import StorageInventory
 
 
 class MockData:
@@ -93,9 +94,7 @@ class HealthzHandler(object):
         """
 
         clusters = resource.storage.storage_list(namespace=settings.DEFAULT_NAMESPACE)
-        cluster_data = api.bk_log.batch_connectivity_detect(
-            cluster_ids=",".join([str(c["cluster_config"]["cluster_id"]) for c in clusters]), _is_backend=True
-        )
+        cluster_data = StorageInventory.probe([c["cluster_config"]["cluster_id"] for c in clusters], _is_backend=True)
         for cluster_id, result in cluster_data.items():
             if result:
                 continue
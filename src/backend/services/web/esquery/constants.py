@@ -16,9 +16,12 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import os
+
 from django.utils.translation import gettext_lazy
 
 from core.choices import TextChoices
+from core.constants import TimeEnum
 
 DEFAULT_TIMEDELTA = 7
 DEFAULT_PAGE = 1
@@ -47,3 +50,27 @@ class UserIdentifyTypeChoices(TextChoices):
 class ResultCodeChoices(TextChoices):
     SUCCESS = "0", gettext_lazy("成功")
     FAILED = "-1", gettext_lazy("其他")
+
+
+# 导出
+EXPORT_CHUNK_SIZE = int(os.getenv("BKAPP_ESQUERY_EXPORT_CHUNK_SIZE", 1000))
+EXPORT_MAX_COUNT = int(os.getenv("BKAPP_ESQUERY_EXPORT_MAX_COUNT", 1000000))
+EXPORT_SCROLL = os.getenv("BKAPP_ESQUERY_EXPORT_SCROLL", "5m")
+# 异步导出文件目录，由 Celery Worker 写入、Web 进程读取，需挂载为二者共享的存储卷；未配置时不支持异步导出
+EXPORT_FILE_DIR = os.getenv("BKAPP_ESQUERY_EXPORT_DIR", "")
+# 导出任务及文件的保留时长，过期文件由定时任务清理
+EXPORT_TASK_TIMEOUT = TimeEnum.ONE_DAY_SECOND.value
+EXPORT_TASK_ID_HEADER = "X-Bkaudit-Export-Task-Id"
+
+
+class ExportFormatChoices(TextChoices):
+    CSV = "csv", gettext_lazy("CSV")
+    NDJSON = "ndjson", gettext_lazy("NDJSON")
+
+
+class ExportStatusChoices(TextChoices):
+    PENDING = "pending", gettext_lazy("等待中")
+    RUNNING = "running", gettext_lazy("导出中")
+    SUCCESS = "success", gettext_lazy("成功")
+    FAILED = "failed", gettext_lazy("失败")
+    CANCELLED = "cancelled", gettext_lazy("已取消")
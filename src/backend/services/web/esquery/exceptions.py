@@ -23,3 +23,27 @@ from django.utils.translation import gettext_lazy
 class ClusterNotExist(BlueException):
     MODULE_CODE = "21"
     MESSAGE = gettext_lazy("集群不存在")
+
+
+class ExportTaskNotExist(BlueException):
+    MODULE_CODE = "21"
+    ERROR_CODE = "002"
+    MESSAGE = gettext_lazy("导出任务不存在")
+
+
+class ExportFileNotReady(BlueException):
+    MODULE_CODE = "21"
+    ERROR_CODE = "003"
+    MESSAGE = gettext_lazy("导出文件尚未生成")
+
+
+class ExportCancelled(BlueException):
+    MODULE_CODE = "21"
+    ERROR_CODE = "004"
+    MESSAGE = gettext_lazy("导出任务已取消")
+
+
+class ExportAsyncDisabled(BlueException):
+    MODULE_CODE = "21"
+    ERROR_CODE = "005"
+    MESSAGE = gettext_lazy("未配置共享导出目录，不支持异步导出")
@@ -17,9 +17,12 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
+import os
+from typing import List
 
 from bk_resource import Resource, api, resource
 from blueapps.utils.request_provider import get_request_username
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils.translation import gettext_lazy
 
 from api.bk_log.constants import INDEX_SET_ID
@@ -32,12 +35,27 @@ from apps.permission.handlers.resource_types import ResourceEnum
 from core.exceptions import PermissionException
 from core.permissions import SearchLogPermission
 from services.web.databus.constants import DEFAULT_STORAGE_CONFIG_KEY
+from services.web.esquery.constants import (
+    EXPORT_FILE_DIR,
+    EXPORT_TASK_ID_HEADER,
+    ExportStatusChoices,
+)
+from services.web.esquery.exceptions import (
+    ExportAsyncDisabled,
+    ExportFileNotReady,
+    ExportTaskNotExist,
+)
 from services.web.esquery.serializers import (
     EsQueryAttrSerializer,
+    EsQueryExportAttrSerializer,
     EsQuerySearchAttrSerializer,
     EsQuerySearchResponseSerializer,
+    ExportTaskRequestSerializer,
+    ExportTaskResponseSerializer,
     FieldMapRequestSerializer,
 )
+from services.web.esquery.tasks import export_search_result
+from services.web.esquery.utils.exporter import ExportProgress, SearchExporter
 from services.web.esquery.utils.field_map import FieldMapHandler
 from services.web.esquery.utils.formatter import HitsFormatter
 
@@ -79,13 +97,17 @@ class SearchAllResource(EsQueryBaseResource):
     RequestSerializer = EsQuerySearchAttrSerializer
     serializer_class = EsQuerySearchResponseSerializer
 
-    def parse_hits(self, hits: list) -> list:
+    @classmethod
+    def load_sensitive_objs(cls, username: str = None) -> List[SensitiveObject]:
+        """
+        获取敏感对象并标记用户是否有权限
+        """
+
         # 获取敏感字段列表
         private_sensitive_objs = list(SensitiveObject._objects.filter(is_private=True))
         sensitive_objs = list(SensitiveObject.objects.all())
         # 获取用户信息，用于判断敏感权限
         if sensitive_objs:
-            username = get_request_username()
             if username:
                 permissions = Permission(username).batch_is_allowed(
                     actions=[ActionEnum.ACCESS_AUDIT_SENSITIVE_INFO],
@@ -99,8 +121,12 @@ class SearchAllResource(EsQueryBaseResource):
                     "_has_permission",
                     permissions.get(so.id, {}).get(ActionEnum.ACCESS_AUDIT_SENSITIVE_INFO.id, False),
                 )
+        return [*sensitive_objs, *private_sensitive_objs]
+
+    def parse_hits(self, hits: list) -> list:
+        sensitive_objs = self.load_sensitive_objs(get_request_username())
         # parse
-        return [HitsFormatter(hit["_source"], [*sensitive_objs, *private_sensitive_objs]).value for hit in hits]
+        return HitsFormatter.format_hits([hit["_source"] for hit in hits], sensitive_objs)
 
     def perform_request(self, validated_request_data):
         # 调用BK-LOG查询事件
@@ -160,6 +186,80 @@ class SearchResource(SearchAllResource):
         return data
 
 
+class ExportResource(SearchResource):
+    name = gettext_lazy("导出")
+    RequestSerializer = EsQueryExportAttrSerializer
+    serializer_class = None
+
+    def perform_request(self, validated_request_data):
+        export_format = validated_request_data.pop("export_format")
+        fields = validated_request_data.pop("export_fields")
+        is_async = validated_request_data.pop("is_async")
+        # 异步导出文件需在 Worker 与 Web 进程间共享
+        if is_async and not EXPORT_FILE_DIR:
+            raise ExportAsyncDisabled()
+        for key in ["page", "page_size", "bind_system_info"]:
+            validated_request_data.pop(key, None)
+        username = get_request_username()
+        progress = ExportProgress.create(username=username, export_format=export_format)
+        bk_audit_client.add_event(action=ActionEnum.SEARCH_REGULAR_EVENT, extend_data=validated_request_data)
+        # 异步导出至文件
+        if is_async:
+            export_search_result.delay(progress.task_id, validated_request_data, export_format, fields, username)
+            return progress.get()
+        # 流式响应
+        exporter = SearchExporter(
+            search_params=validated_request_data,
+            export_format=export_format,
+            progress=progress,
+            fields=fields,
+            username=username,
+        )
+        response = StreamingHttpResponse(exporter.stream(), content_type=exporter.writer.content_type)
+        response["Content-Disposition"] = f'attachment; filename="{exporter.filename}"'
+        response[EXPORT_TASK_ID_HEADER] = progress.task_id
+        return response
+
+
+class ExportTaskBaseResource(EsQueryBaseResource, abc.ABC):
+    RequestSerializer = ExportTaskRequestSerializer
+
+    def get_progress(self, task_id: str) -> ExportProgress:
+        progress = ExportProgress(task_id)
+        # 仅允许导出人操作
+        if progress.get()["username"] != get_request_username():
+            raise ExportTaskNotExist()
+        return progress
+
+
+class ExportProgressResource(ExportTaskBaseResource):
+    name = gettext_lazy("导出进度")
+    ResponseSerializer = ExportTaskResponseSerializer
+
+    def perform_request(self, validated_request_data):
+        return self.get_progress(validated_request_data["task_id"]).get()
+
+
+class CancelExportResource(ExportTaskBaseResource):
+    name = gettext_lazy("取消导出")
+    ResponseSerializer = ExportTaskResponseSerializer
+
+    def perform_request(self, validated_request_data):
+        return self.get_progress(validated_request_data["task_id"]).cancel()
+
+
+class DownloadExportResource(ExportTaskBaseResource):
+    name = gettext_lazy("下载导出文件")
+
+    def perform_request(self, validated_request_data):
+        data = self.get_progress(validated_request_data["task_id"]).get()
+        if data["status"] != ExportStatusChoices.SUCCESS.value or not os.path.exists(data["file_path"]):
+            raise ExportFileNotReady()
+        return FileResponse(
+            open(data["file_path"], "rb"), as_attachment=True, filename=os.path.basename(data["file_path"])
+        )
+
+
 class FieldMapResource(EsQueryBaseResource):
     name = gettext_lazy("字段列表")
     RequestSerializer = FieldMapRequestSerializer
@@ -37,9 +37,11 @@ from services.web.esquery.constants import (
     DEFAULT_SORT_LIST,
     DEFAULT_TIMEDELTA,
     ES_MAX_LIMIT,
+    EXPORT_CHUNK_SIZE,
     SORT_ASC,
     SORT_DESC,
     AccessTypeChoices,
+    ExportFormatChoices,
     ResultCodeChoices,
 )
 
@@ -209,3 +211,32 @@ class EsQuerySearchResponseSerializer(serializers.Serializer):
     num_pages = serializers.IntegerField()
     total = serializers.IntegerField()
     results = serializers.ListField(child=serializers.JSONField())
+
+
+class EsQueryExportAttrSerializer(EsQuerySearchAttrSerializer):
+    page = serializers.IntegerField(default=DEFAULT_PAGE)
+    page_size = serializers.IntegerField(default=EXPORT_CHUNK_SIZE)
+    export_format = serializers.ChoiceField(
+        label=gettext_lazy("导出格式"), choices=ExportFormatChoices.choices, default=ExportFormatChoices.CSV.value
+    )
+    export_fields = serializers.CharField(
+        label=gettext_lazy("导出字段"), help_text=gettext_lazy("多个字段以半角逗号分隔"), allow_blank=True, default=str
+    )
+    is_async = serializers.BooleanField(label=gettext_lazy("异步导出"), default=False)
+
+    def validate_export_fields(self, value: str) -> list:
+        return [field for field in value.split(",") if field]
+
+
+class ExportTaskRequestSerializer(serializers.Serializer):
+    namespace = serializers.CharField()
+    task_id = serializers.CharField(label=gettext_lazy("导出任务ID"))
+
+
+class ExportTaskResponseSerializer(serializers.Serializer):
+    task_id = serializers.CharField(label=gettext_lazy("导出任务ID"))
+    export_format = serializers.CharField(label=gettext_lazy("导出格式"))
+    status = serializers.CharField(label=gettext_lazy("状态"))
+    total = serializers.IntegerField(label=gettext_lazy("总数"))
+    exported = serializers.IntegerField(label=gettext_lazy("已导出"))
+    error = serializers.CharField(label=gettext_lazy("错误信息"), allow_blank=True)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from typing import List
+
+from blueapps.utils.logger import logger_celery
+from celery.schedules import crontab
+from celery.task import periodic_task, task
+
+from services.web.esquery.utils.exporter import (
+    ExportProgress,
+    SearchExporter,
+    clean_expired_export_files,
+)
+
+
+@task()
+def export_search_result(task_id: str, search_params: dict, export_format: str, fields: List[str], username: str):
+    """导出审计日志至本地文件"""
+
+    progress = ExportProgress(task_id)
+    if progress.is_cancelled():
+        return
+    SearchExporter(
+        search_params=search_params,
+        export_format=export_format,
+        progress=progress,
+        fields=fields,
+        username=username,
+    ).export_to_file()
+
+
+@periodic_task(run_every=crontab(minute=0))
+def clean_export_files():
+    """清理过期的导出文件"""
+
+    removed = clean_expired_export_files()
+    if removed:
+        logger_celery.info("[CleanExportFiles] Removed %s files", len(removed))
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import abc
+import csv
+import io
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Type
+
+from bk_resource import api, resource
+from blueapps.utils.logger import logger
+from blueapps.utils.unique import uniqid
+from django.core.cache import cache
+
+from apps.meta.constants import ConfigLevelChoices
+from apps.meta.models import GlobalMetaConfig
+from services.web.databus.constants import (
+    BKLOG_INDEX_SET_SCENARIO_ID,
+    DEFAULT_STORAGE_CONFIG_KEY,
+    INDEX_SET_CONFIG_KEY,
+)
+from services.web.esquery.constants import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FILE_DIR,
+    EXPORT_MAX_COUNT,
+    EXPORT_SCROLL,
+    EXPORT_TASK_TIMEOUT,
+    ExportFormatChoices,
+    ExportStatusChoices,
+)
+from services.web.esquery.exceptions import ExportCancelled, ExportTaskNotExist
+from services.web.esquery.utils.formatter import HitsFormatter
+
+
+class ExportProgress:
+    """
+    导出进度，存储于缓存中以便跨进程查询及取消
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+
+    @property
+    def cache_key(self) -> str:
+        return f"esquery:export:{self.task_id}"
+
+    @property
+    def cancel_key(self) -> str:
+        return f"{self.cache_key}:cancel"
+
+    @classmethod
+    def create(cls, username: str, export_format: str) -> "ExportProgress":
+        progress = cls(uniqid())
+        cache.set(
+            progress.cache_key,
+            {
+                "task_id": progress.task_id,
+                "username": username,
+                "export_format": export_format,
+                "status": ExportStatusChoices.PENDING.value,
+                "total": 0,
+                "exported": 0,
+                "file_path": "",
+                "error": "",
+            },
+            EXPORT_TASK_TIMEOUT,
+        )
+        return progress
+
+    def get(self) -> dict:
+        data = cache.get(self.cache_key)
+        if data is None:
+            raise ExportTaskNotExist()
+        return data
+
+    def update(self, **kwargs) -> dict:
+        data = self.get()
+        data.update(kwargs)
+        cache.set(self.cache_key, data, EXPORT_TASK_TIMEOUT)
+        return data
+
+    def cancel(self) -> dict:
+        data = self.get()
+        cache.set(self.cancel_key, True, EXPORT_TASK_TIMEOUT)
+        if data["status"] == ExportStatusChoices.PENDING.value:
+            data = self.update(status=ExportStatusChoices.CANCELLED.value)
+        return data
+
+    def is_cancelled(self) -> bool:
+        return bool(cache.get(self.cancel_key))
+
+
+class BaseExportWriter(abc.ABC):
+    """
+    将格式化后的日志转换为导出文本
+    """
+
+    export_format: str = None
+    content_type: str = None
+
+    def __init__(self, fields: List[str] = None):
+        self.fields = fields or []
+
+    def dump_value(self, value: any) -> any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+    @abc.abstractmethod
+    def write(self, hits: List[dict]) -> str:
+        raise NotImplementedError()
+
+
+class CsvExportWriter(BaseExportWriter):
+    export_format = ExportFormatChoices.CSV.value
+    content_type = "text/csv; charset=utf-8"
+
+    def __init__(self, fields: List[str] = None):
+        super().__init__(fields)
+        self._header_written = False
+
+    def write(self, hits: List[dict]) -> str:
+        if not hits:
+            return ""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self._header_written:
+            # 未指定字段时以首条日志的字段为准
+            self.fields = self.fields or list(hits[0].keys())
+            # BOM 用于兼容 Excel 打开
+            buffer.write("\ufeff")
+            writer.writerow(self.fields)
+            self._header_written = True
+        for hit in hits:
+            writer.writerow([self.dump_value(hit.get(field, "")) for field in self.fields])
+        return buffer.getvalue()
+
+
+class NdjsonExportWriter(BaseExportWriter):
+    export_format = ExportFormatChoices.NDJSON.value
+    content_type = "application/x-ndjson; charset=utf-8"
+
+    def write(self, hits: List[dict]) -> str:
+        lines = []
+        for hit in hits:
+            if self.fields:
+                hit = {field: hit.get(field) for field in self.fields}
+            lines.append(json.dumps(hit, ensure_ascii=False, default=str))
+        return "".join(f"{line}\n" for line in lines)
+
+
+EXPORT_WRITERS: Dict[str, Type[BaseExportWriter]] = {
+    ExportFormatChoices.CSV.value: CsvExportWriter,
+    ExportFormatChoices.NDJSON.value: NdjsonExportWriter,
+}
+
+
+class SearchExporter:
+    """
+    审计日志导出
+    1. 通过滚动查询分批获取日志，每批经 HitsFormatter 完成敏感信息处理后立即输出
+    2. 支持流式响应及写入本地文件，进度及取消通过 ExportProgress 同步
+    """
+
+    def __init__(
+        self,
+        search_params: dict,
+        export_format: str,
+        progress: ExportProgress,
+        fields: List[str] = None,
+        username: str = None,
+    ):
+        self.search_params = search_params
+        self.namespace = search_params["namespace"]
+        self.progress = progress
+        self.username = username
+        self.writer = EXPORT_WRITERS[export_format](fields)
+
+    @property
+    def filename(self) -> str:
+        return f"bkaudit_{self.progress.task_id}.{self.writer.export_format}"
+
+    @property
+    def storage_cluster_id(self) -> int:
+        return int(
+            self.search_params.get("storage_cluster_id")
+            or GlobalMetaConfig.get(
+                DEFAULT_STORAGE_CONFIG_KEY,
+                config_level=ConfigLevelChoices.NAMESPACE.value,
+                instance_key=self.namespace,
+            )
+        )
+
+    @property
+    def indices(self) -> str:
+        index_set_config = GlobalMetaConfig.get(
+            INDEX_SET_CONFIG_KEY,
+            config_level=ConfigLevelChoices.NAMESPACE.value,
+            instance_key=self.namespace,
+        )
+        return ",".join(index["result_table_id"].replace(".", "_") for index in index_set_config["indexes"])
+
+    def iter_chunks(self) -> Iterator[List[dict]]:
+        """
+        分批获取并格式化日志
+        """
+
+        from services.web.esquery.resources import SearchAllResource
+
+        sensitive_objs = SearchAllResource.load_sensitive_objs(self.username)
+        resp = resource.esquery.es_query(
+            **{**self.search_params, "start": 0, "size": EXPORT_CHUNK_SIZE, "scroll": EXPORT_SCROLL}
+        )
+        total = min(resp.get("hits", {}).get("total", 0), EXPORT_MAX_COUNT)
+        self.progress.update(status=ExportStatusChoices.RUNNING.value, total=total)
+        exported = 0
+        scroll_id = resp.get("_scroll_id")
+        indices = None
+        while True:
+            hits = resp.get("hits", {}).get("hits", [])[: EXPORT_MAX_COUNT - exported]
+            if not hits:
+                break
+            yield HitsFormatter.format_hits([hit["_source"] for hit in hits], sensitive_objs)
+            exported += len(hits)
+            self.progress.update(exported=exported)
+            if exported >= EXPORT_MAX_COUNT or not scroll_id:
+                break
+            if self.progress.is_cancelled():
+                raise ExportCancelled()
+            indices = indices or self.indices
+            resp = api.bk_log.es_query_scroll(
+                indices=indices,
+                scenario_id=BKLOG_INDEX_SET_SCENARIO_ID,
+                storage_cluster_id=self.storage_cluster_id,
+                scroll=EXPORT_SCROLL,
+                scroll_id=scroll_id,
+            )
+            scroll_id = resp.get("_scroll_id", scroll_id)
+
+    def iter_content(self) -> Iterator[str]:
+        for hits in self.iter_chunks():
+            yield self.writer.write(hits)
+
+    def stream(self) -> Iterator[str]:
+        """
+        流式输出，用于同步下载
+        """
+
+        try:
+            yield from self.iter_content()
+        except ExportCancelled:
+            self.progress.update(status=ExportStatusChoices.CANCELLED.value)
+            return
+        except GeneratorExit:
+            # 客户端断开连接时响应被关闭，视为取消
+            logger.info("[SearchExportClosed] TaskID => %s", self.progress.task_id)
+            self.progress.update(status=ExportStatusChoices.CANCELLED.value)
+            raise
+        except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+            logger.exception("[SearchExportFailed] TaskID => %s; Error => %s", self.progress.task_id, err)
+            self.progress.update(status=ExportStatusChoices.FAILED.value, error=str(err))
+            raise
+        self.progress.update(status=ExportStatusChoices.SUCCESS.value)
+
+    def export_to_file(self) -> str:
+        """
+        写入本地文件，用于异步导出
+        """
+
+        os.makedirs(EXPORT_FILE_DIR, exist_ok=True)
+        file_path = os.path.join(EXPORT_FILE_DIR, self.filename)
+        try:
+            with open(file_path, "w", encoding="utf-8", newline="") as file:
+                for content in self.iter_content():
+                    file.write(content)
+        except ExportCancelled:
+            os.remove(file_path)
+            self.progress.update(status=ExportStatusChoices.CANCELLED.value)
+            return ""
+        except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+            logger.exception("[SearchExportFailed] TaskID => %s; Error => %s", self.progress.task_id, err)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            self.progress.update(status=ExportStatusChoices.FAILED.value, error=str(err))
+            return ""
+        self.progress.update(status=ExportStatusChoices.SUCCESS.value, file_path=file_path)
+        return file_path
+
+
+def clean_expired_export_files(file_dir: str = EXPORT_FILE_DIR, expire_seconds: int = EXPORT_TASK_TIMEOUT) -> List[str]:
+    """
+    清理过期的导出文件，文件过期时间与导出任务一致
+    """
+
+    if not file_dir or not os.path.isdir(file_dir):
+        return []
+    expired_at = time.time() - expire_seconds
+    removed = []
+    for entry in os.scandir(file_dir):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < expired_at:
+                os.remove(entry.path)
+                removed.append(entry.path)
+        except FileNotFoundError:
+            continue
+    return removed
@@ -20,7 +20,7 @@ import json
 from json import JSONDecodeError
 from typing import List, Union
 
-from apps.bk_crypto.crypto import asymmetric_cipher
+from apps.bk_crypto.field import FieldEncryptBatch, field_encryptor
 from apps.meta.constants import (
     SENSITIVE_REPLACE_VALUE,
     SensitiveResourceTypeEnum,
@@ -38,8 +38,7 @@ from apps.meta.utils.fields import (
 )
 from core.utils.tools import (
     choices_to_items,
-    drop_dict_item_by_path,
-    modify_dict_by_path,
+    compile_json_path,
     mstimestamp_to_date_string,
 )
 from services.web.esquery.constants import (
@@ -64,11 +63,27 @@ JSON_FORMAT = [
 class HitsFormatter:
     """格式化Es输出"""
 
-    def __init__(self, hit: dict, sensitive_objs: List[SensitiveObject]):
+    def __init__(self, hit: dict, sensitive_objs: List[SensitiveObject], encrypt_batch: FieldEncryptBatch = None):
         self.hit = hit
         self.sensitive_objs = sensitive_objs
+        self.encrypt_batch = encrypt_batch
         self._format_hit()
-        self._format_sensitive_data()
+        # 批量加密时，需等待加密完成后再处理敏感数据
+        if encrypt_batch is None:
+            self._format_sensitive_data()
+
+    @classmethod
+    def format_hits(cls, hits: List[dict], sensitive_objs: List[SensitiveObject]) -> List[dict]:
+        """
+        批量格式化，整页数据的用户信息统一去重加密
+        """
+
+        encrypt_batch = field_encryptor.batch()
+        formatters = [cls(hit, sensitive_objs, encrypt_batch) for hit in hits]
+        encrypt_batch.flush()
+        for formatter in formatters:
+            formatter._format_sensitive_data()
+        return [formatter.value for formatter in formatters]
 
     @property
     def value(self):
@@ -128,8 +143,11 @@ class HitsFormatter:
     def _format_snapshot_user_info(self, value: dict) -> dict:
         data = DataMap.trans_data(value, list(value.keys()), build_data_fields=lambda x: f"snapshot_user_info__{x}")
         # 加密用户数据
-        for key, val in data.items():
-            data[key] = asymmetric_cipher.encrypt(val)
+        if self.encrypt_batch is not None:
+            self.encrypt_batch.add(data)
+            return data
+        for key, ciphertext in zip(data.keys(), field_encryptor.encrypt_many(list(data.values()))):
+            data[key] = ciphertext
         return data
 
     def _format_sensitive_data(self):
@@ -148,10 +166,11 @@ class HitsFormatter:
                 _all_permission = False
             # 逐个字段进行替换或移除
             for field in so.fields:
-                field_path = field["field_name"].split(".")
-                default_value = field.get("default_value", SENSITIVE_REPLACE_VALUE)
-                args = (self.hit, field_path, default_value)
-                self.hit = drop_dict_item_by_path(*args) if so.is_private else modify_dict_by_path(*args)
+                field_path = compile_json_path(field["field_name"])
+                if so.is_private:
+                    field_path.drop(self.hit)
+                else:
+                    field_path.set(self.hit, field.get("default_value", SENSITIVE_REPLACE_VALUE))
         # 没有所有权限时，需要隐藏原始日志
         if not _all_permission:
             self.hit["log"] = SENSITIVE_REPLACE_VALUE
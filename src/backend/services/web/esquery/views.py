@@ -25,4 +25,8 @@ class EsQueryViewSet(ResourceViewSet):
         ResourceRoute("GET", resource.esquery.search, endpoint="search"),
         ResourceRoute("GET", api.bk_log.index_set_operators, endpoint="operators"),
         ResourceRoute("GET", resource.esquery.field_map, endpoint="field_map"),
+        ResourceRoute("POST", resource.esquery.export, endpoint="export"),
+        ResourceRoute("GET", resource.esquery.export_progress, endpoint="export_progress"),
+        ResourceRoute("POST", resource.esquery.cancel_export, endpoint="export_cancel"),
+        ResourceRoute("GET", resource.esquery.download_export, endpoint="export_download"),
     ]
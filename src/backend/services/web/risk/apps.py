@@ -24,3 +24,14 @@ class RiskConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "services.web.risk"
     verbose_name = gettext_lazy("Risk")
+
+    def ready(self):
+        from django.db.models.signals import post_save
+
+        from services.web.risk.handlers.timeline import TicketTimelineHandler
+        from services.web.risk.models import RiskRule, RiskRuleCatalog, TicketNode
+
+        post_save.connect(
+            TicketTimelineHandler.on_node_saved, sender=TicketNode, dispatch_uid="ticket_timeline_merge_on_save"
+        )
+        post_save.connect(RiskRuleCatalog.on_rule_saved, sender=RiskRule, dispatch_uid="risk_rule_catalog_on_save")
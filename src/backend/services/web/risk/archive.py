@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from core.archive import BaseArchivePolicy
+from services.web.risk.constants import RiskStatus, TicketNodeStatus
+from services.web.risk.models import Risk, TicketNode, TicketNodeArchive
+
+
+class TicketNodeArchivePolicy(BaseArchivePolicy):
+    """
+    风险处理记录归档
+    仅归档已关单且超过保留期未再操作的风险，查询时由 TicketNode.load_history 合并归档数据
+    """
+
+    name = "ticket_node"
+    model = TicketNode
+    archive_model = TicketNodeArchive
+
+    @property
+    def retention_days(self) -> int:
+        return settings.TICKET_NODE_RETENTION_DAYS
+
+    def candidates(self) -> QuerySet:
+        risk_ids = Risk.objects.filter(status=RiskStatus.CLOSED, last_operate_time__lt=self.cutoff).values("risk_id")
+        return (
+            TicketNode.objects.filter(risk_id__in=risk_ids, status=TicketNodeStatus.FINISHED)
+            .order_by("timestamp")
+            .values_list("id", flat=True)
+        )
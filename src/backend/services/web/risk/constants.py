@@ -30,6 +30,8 @@ from services.web.databus.constants import DEFAULT_TIME_ZONE, TRANSFER_TIME_FORM
 
 BKM_ALERT_SYNC_HOURS = int(os.getenv("BKAPP_BKM_ALERT_SYNC_HOURS", 3))
 BKM_ALERT_BATCH_SIZE = 100
+BKM_ALERT_EVENT_CHUNK_SIZE = int(os.getenv("BKAPP_BKM_ALERT_EVENT_CHUNK_SIZE", 1000))
+BKM_ALERT_HIGH_WATER_MARK_KEY = "BKM_ALERT_HIGH_WATER_MARK"
 
 BKAUDIT_EVENT_RT_INDEX_NAME_FORMAT = "BkAudit_Event_{result_table}"
 BKAUDIT_EVENT_RT_INDEX_SET_ID = "bkaudit_event_index_set_id"
@@ -50,8 +52,16 @@ EVENT_ESQUERY_DELAY_TIME = int(os.getenv("BKAPP_EVENT_ESQUERY_DELAY_TIME", str(1
 RISK_SYNC_BATCH_SIZE = int(os.getenv("BKAPP_RISK_SYNC_BATCH_SIZE", 1000))
 RISK_SYNC_SCROLL = os.getenv("BKAPP_RISK_SYNC_SCROLL", "5m")
 RISK_SYNC_START_TIME_KEY = "RISK_SYNC_START_TIME"
+RISK_RULE_SET_VERSION_KEY = "RISK_RULE_SET_VERSION"
 RISK_ESQUERY_DELAY_TIME = int(os.getenv("BKAPP_RISK_ESQUERY_DELAY_TIME", str(10 * 60)))  # s
 
+# 风险列表总数按查询条件缓存
+RISK_LIST_COUNT_CACHE_KEY = "risk:list:count:{digest}"
+RISK_LIST_COUNT_CACHE_TIMEOUT = int(os.getenv("BKAPP_RISK_LIST_COUNT_CACHE_TIMEOUT", 60))  # s
+RISK_LIST_MAX_PAGE_SIZE = 1000
+# 游标翻页仅支持按 (event_time, risk_id) 排序
+RISK_LIST_CURSOR_ORDER_FIELDS = ["event_time", "-event_time"]
+
 SECURITY_PERSON_KEY = "SECURITY_PERSON"
 
 RISK_OPERATE_NOTICE_CONFIG_KEY = "RISK_OPERATE_NOTICE_CONFIG"
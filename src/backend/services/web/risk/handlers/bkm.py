@@ -18,7 +18,7 @@ to the current version of the project delivered to anyone in the future.
 
 import datetime
 import math
-from typing import List
+from typing import Dict, Iterable, List
 
 from bk_resource import api
 from bk_resource.exceptions import APIRequestError
@@ -33,6 +33,8 @@ from services.web.analyze.constants import ControlTypeChoices
 from services.web.analyze.models import Control
 from services.web.risk.constants import (
     BKM_ALERT_BATCH_SIZE,
+    BKM_ALERT_EVENT_CHUNK_SIZE,
+    BKM_ALERT_HIGH_WATER_MARK_KEY,
     BKM_ALERT_SYNC_HOURS,
     EVENT_ESQUERY_DELAY_TIME,
     EVENT_SYNC_START_TIME_KEY,
@@ -44,16 +46,57 @@ from services.web.strategy_v2.constants import StrategyStatusChoices
 from services.web.strategy_v2.models import Strategy
 
 
+class BKMAlertHighWaterMark:
+    """
+    BKM告警同步高水位
+    按BKM策略记录上次拉取到的告警ID及其更新时间，重跑时仅跳过未发生变化的告警，
+    仍在持续或已更新的告警会重新同步
+    """
+
+    def __init__(self):
+        self.marks: Dict[str, Dict[str, int]] = GlobalMetaConfig.get(
+            config_key=BKM_ALERT_HIGH_WATER_MARK_KEY, default={}
+        )
+
+    @classmethod
+    def get_update_time(cls, alert: dict) -> int:
+        return alert.get("update_time") or alert["create_time"]
+
+    def is_synced(self, alert: dict) -> bool:
+        mark = self.marks.get(str(alert["strategy_id"]), {})
+        return mark.get(str(alert["id"])) == self.get_update_time(alert)
+
+    def filter(self, alerts: List[dict]) -> List[dict]:
+        return [alert for alert in alerts if not self.is_synced(alert)]
+
+    def update(self, alerts: List[dict]) -> None:
+        """
+        以本次拉取到的全部告警替换高水位，拉取窗口外的告警不再保留
+        """
+
+        marks = {}
+        for alert in alerts:
+            marks.setdefault(str(alert["strategy_id"]), {})[str(alert["id"])] = self.get_update_time(alert)
+        self.marks = marks
+
+    def save(self, strategy_ids: Iterable) -> None:
+        # 仅保留仍在运行的策略，避免无效数据堆积
+        strategy_ids = {str(strategy_id) for strategy_id in strategy_ids}
+        self.marks = {key: mark for key, mark in self.marks.items() if key in strategy_ids}
+        GlobalMetaConfig.set(config_key=BKM_ALERT_HIGH_WATER_MARK_KEY, config_value=self.marks)
+
+
 class BKMAlertSyncHandler:
     """
     同步BKM告警
     """
 
+    def __init__(self):
+        # BKM策略ID与审计策略映射，每次同步仅加载一次
+        self.strategy_map: Dict[int, Strategy] = {}
+
     @transaction.atomic()
     def sync(self) -> None:
-        # 检测策略数量
-        if not Strategy.objects.filter(self._build_db_filter()).exists():
-            logger.info("[NoneStrategyNeedToSyncAlert] BKMAlertSyncHandler Stopped")
         # 初始化参数
         start_time_ts = GlobalMetaConfig.get(
             config_key=EVENT_SYNC_START_TIME_KEY,
@@ -61,31 +104,59 @@ class BKMAlertSyncHandler:
         )
         start_time = datetime.datetime.fromtimestamp(start_time_ts)
         end_time = datetime.datetime.now() - datetime.timedelta(seconds=EVENT_ESQUERY_DELAY_TIME)
-        # 预拉取获取数据量
-        api_params = self._build_api_params(start_time=start_time, end_time=end_time, page=1, page_size=1)
-        pre_data = self._call_api(**api_params)
-        # 批量拉取
-        request_params = [
-            self._build_api_params(start_time=start_time, end_time=end_time, page=i + 1, page_size=BKM_ALERT_BATCH_SIZE)
-            for i in range(math.ceil(pre_data["total"] / BKM_ALERT_BATCH_SIZE))
-        ]
-        data = self._batch_call_api(*request_params)
-        # 存入数据库
-        events = self._format_alert_as_event(data["alerts"])
-        self._create_or_update_event(events)
-        # 更新时间
+        # 加载策略
+        self.strategy_map = self._load_strategy_map()
+        if not self.strategy_map:
+            logger.info("[NoneStrategyNeedToSyncAlert] BKMAlertSyncHandler Stopped")
+            GlobalMetaConfig.set(config_key=EVENT_SYNC_START_TIME_KEY, config_value=math.floor(end_time.timestamp()))
+            return
+        # 拉取并过滤已同步的告警
+        high_water_mark = BKMAlertHighWaterMark()
+        fetched_alerts = self._fetch_alerts(start_time=start_time, end_time=end_time)
+        alerts = high_water_mark.filter(fetched_alerts)
+        # 分块存入
+        events = self._format_alert_as_event(alerts)
+        for i in range(0, len(events), BKM_ALERT_EVENT_CHUNK_SIZE):
+            self._create_or_update_event(events[i : i + BKM_ALERT_EVENT_CHUNK_SIZE])
+        # 更新高水位与时间
+        high_water_mark.update(fetched_alerts)
+        high_water_mark.save(self.strategy_map.keys())
         GlobalMetaConfig.set(config_key=EVENT_SYNC_START_TIME_KEY, config_value=math.floor(end_time.timestamp()))
 
-    def _format_alert_as_event(self, data: List[dict]) -> List[dict]:
-        # 获取BKM策略与审计策略映射关系
-        strategy_map = {
+    def _load_strategy_map(self) -> Dict[int, Strategy]:
+        """
+        获取BKM策略与审计策略映射关系
+        """
+
+        return {
             s.backend_data["id"]: s for s in Strategy.objects.filter(self._build_db_filter()) if "id" in s.backend_data
         }
+
+    def _fetch_alerts(self, start_time: datetime.datetime, end_time: datetime.datetime) -> List[dict]:
+        """
+        拉取告警，首页同时返回总量，剩余分页批量拉取
+        """
+
+        first_page = self._call_api(
+            **self._build_api_params(start_time=start_time, end_time=end_time, page=1, page_size=BKM_ALERT_BATCH_SIZE)
+        )
+        alerts = list(first_page["alerts"])
+        if len(alerts) < BKM_ALERT_BATCH_SIZE:
+            return alerts
+        request_params = [
+            self._build_api_params(start_time=start_time, end_time=end_time, page=page, page_size=BKM_ALERT_BATCH_SIZE)
+            for page in range(2, math.ceil(first_page["total"] / BKM_ALERT_BATCH_SIZE) + 1)
+        ]
+        if request_params:
+            alerts.extend(self._batch_call_api(*request_params)["alerts"])
+        return alerts
+
+    def _format_alert_as_event(self, data: List[dict]) -> List[dict]:
         # 格式化
         return [
             {
                 EventMappingFields.EVENT_ID.field_name: "{}-{}".format(
-                    self._get_bkaudit_strategy_id(strategy_map, alert["strategy_id"]), alert["id"]
+                    self._get_bkaudit_strategy_id(self.strategy_map, alert["strategy_id"]), alert["id"]
                 ),
                 EventMappingFields.EVENT_CONTENT.field_name: "{} {}".format(
                     " ".join(
@@ -98,7 +169,7 @@ class BKMAlertSyncHandler:
                 ),
                 EventMappingFields.RAW_EVENT_ID.field_name: str(alert["id"]),
                 EventMappingFields.STRATEGY_ID.field_name: self._get_bkaudit_strategy_id(
-                    strategy_map, alert["strategy_id"]
+                    self.strategy_map, alert["strategy_id"]
                 ),
                 EventMappingFields.EVENT_DATA.field_name: alert,
                 EventMappingFields.EVENT_TIME.field_name: alert["create_time"] * 1000,
@@ -160,16 +231,7 @@ class BKMAlertSyncHandler:
         return Q(control_id__in=controls.values("control_id"), status=StrategyStatusChoices.RUNNING)
 
     def _build_bkm_filter(self) -> list:
-        conditions = [
-            {
-                "key": "strategy_id",
-                "value": [
-                    s.backend_data["id"]
-                    for s in Strategy.objects.filter(self._build_db_filter())
-                    if "id" in s.backend_data
-                ],
-            }
-        ]
+        conditions = [{"key": "strategy_id", "value": list(self.strategy_map.keys())}]
         return conditions
 
     def _build_api_params(
@@ -184,7 +246,8 @@ class BKMAlertSyncHandler:
             "show_overview": False,
             "show_aggs": False,
             "conditions": self._build_bkm_filter(),
-            "ordering": [],
+            # 固定排序，保证分页拉取时告警不重不漏
+            "ordering": ["create_time", "id"],
         }
 
     def _call_api(self, **params) -> dict:
@@ -245,7 +245,7 @@ class EventHandler(ElasticHandler):
                 scroll=RISK_SYNC_SCROLL,
                 scroll_id=scroll_id,
             )
-            hits = [HitsFormatter(hit["_source"], []).value for hit in resp.get("hits", {}).get("hits", [])]
+            hits = HitsFormatter.format_hits([hit["_source"] for hit in resp.get("hits", {}).get("hits", [])], [])
             if not hits:
                 break
             data.extend(hits)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import base64
+import datetime
+import hashlib
+import json
+import math
+from typing import List, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+from core.exceptions import RiskListCursorInvalid
+from services.web.risk.constants import (
+    RISK_LIST_COUNT_CACHE_KEY,
+    RISK_LIST_COUNT_CACHE_TIMEOUT,
+)
+from services.web.risk.models import Risk, RiskExperience
+
+
+class RiskListHandler:
+    """
+    风险列表查询
+    1. 传入 cursor 时按 (event_time, risk_id) 进行游标分页，翻页耗时与页码无关
+    2. 未传入 cursor 时兼容页码分页
+    3. 总数按查询条件缓存，避免每次翻页都对全表执行 COUNT
+    4. 经验数量仅统计当前页的风险
+    """
+
+    def __init__(self, queryset: QuerySet, page_size: int, count_timeout: int = RISK_LIST_COUNT_CACHE_TIMEOUT):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.count_timeout = count_timeout
+
+    @property
+    def total(self) -> int:
+        """
+        获取总数，相同查询条件 (含权限条件) 在缓存有效期内复用
+        """
+
+        queryset = self.queryset.order_by()
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return 0
+        cache_key = RISK_LIST_COUNT_CACHE_KEY.format(digest=hashlib.md5(sql.encode()).hexdigest())
+        total = cache.get(cache_key)
+        if total is None:
+            total = queryset.count()
+            cache.set(cache_key, total, self.count_timeout)
+        return total
+
+    def paginate_by_page(self, page: int, order_field: str) -> dict:
+        """
+        页码分页，缓存的总数可能滞后，仅用于计算总数及页数，当前页始终实时查询
+        """
+
+        total = self.total
+        offset = (page - 1) * self.page_size
+        risks = list(self.queryset.order_by(order_field)[offset : offset + self.page_size])
+        return {
+            "page": page,
+            "num_pages": math.ceil(total / self.page_size),
+            "total": total,
+            "results": self.load_experiences(risks),
+        }
+
+    def paginate_by_cursor(self, cursor: str, descending: bool = True) -> dict:
+        """
+        游标分页，多取一条用于判断是否存在下一页
+        """
+
+        queryset = self.queryset
+        if cursor:
+            event_time, risk_id = self.decode_cursor(cursor)
+            if descending:
+                queryset = queryset.filter(Q(event_time__lt=event_time) | Q(event_time=event_time, risk_id__lt=risk_id))
+            else:
+                queryset = queryset.filter(Q(event_time__gt=event_time) | Q(event_time=event_time, risk_id__gt=risk_id))
+        ordering = ["-event_time", "-risk_id"] if descending else ["event_time", "risk_id"]
+        risks = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        next_cursor = self.encode_cursor(risks[self.page_size - 1]) if len(risks) > self.page_size else None
+        return {
+            "total": self.total,
+            "next_cursor": next_cursor,
+            "results": self.load_experiences(risks[: self.page_size]),
+        }
+
+    @classmethod
+    def load_experiences(cls, risks: List[Risk]) -> List[Risk]:
+        """
+        获取当前页风险关联的经验数量
+        """
+
+        if not risks:
+            return risks
+        experiences = {
+            e["risk_id"]: e["count"]
+            for e in RiskExperience.objects.filter(risk_id__in=[risk.risk_id for risk in risks])
+            .values("risk_id")
+            .order_by("risk_id")
+            .annotate(count=Count("risk_id"))
+        }
+        for risk in risks:
+            setattr(risk, "experiences", experiences.get(risk.risk_id, 0))
+        return risks
+
+    @classmethod
+    def encode_cursor(cls, risk: Risk) -> str:
+        data = json.dumps([risk.event_time.isoformat(), risk.risk_id])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor: str) -> Tuple[datetime.datetime, str]:
+        try:
+            event_time, risk_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            event_time = parse_datetime(event_time)
+        except (TypeError, ValueError):
+            raise RiskListCursorInvalid()
+        if event_time is None or not isinstance(risk_id, str):
+            raise RiskListCursorInvalid()
+        return event_time, risk_id
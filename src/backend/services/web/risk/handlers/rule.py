@@ -16,9 +16,95 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import threading
+from typing import Dict, List, Tuple, Union
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, F, IntegerField, Max, Value, When
+
+from apps.meta.constants import GLOBAL_CONFIG_LEVEL_INSTANCE, ConfigLevelChoices
+from apps.meta.models import GlobalMetaConfig
 from core.exceptions import RiskRuleNotMatch
-from services.web.risk.constants import RiskRuleOperator
+from services.web.risk.constants import RISK_RULE_SET_VERSION_KEY, RiskRuleOperator
 from services.web.risk.models import Risk, RiskRule
+from services.web.risk.serializers import RiskRuleInfoSerializer
+
+
+class RiskRuleSetHandler:
+    """
+    风险处理规则集
+    1. 规则集版本号存储于 GlobalMetaConfig，规则变更时在同一事务内递增
+    2. 版本号所在行同时作为规则集的写锁，优先级分配与批量调整串行执行
+    3. 规则匹配按版本号判断是否需要重新加载规则
+    """
+
+    @classmethod
+    def lock(cls) -> GlobalMetaConfig:
+        config, _ = GlobalMetaConfig.objects.get_or_create(
+            config_level=ConfigLevelChoices.GLOBAL.value,
+            instance_key=GLOBAL_CONFIG_LEVEL_INSTANCE,
+            config_key=RISK_RULE_SET_VERSION_KEY,
+            defaults={"config_value": 0},
+        )
+        return GlobalMetaConfig.objects.select_for_update().get(pk=config.pk)
+
+    @classmethod
+    def get_version(cls) -> int:
+        return GlobalMetaConfig.get(config_key=RISK_RULE_SET_VERSION_KEY, default=0)
+
+    @classmethod
+    @transaction.atomic()
+    def bump_version(cls) -> int:
+        config = cls.lock()
+        config.config_value = (config.config_value or 0) + 1
+        config.save(update_fields=["config_value"])
+        return config.config_value
+
+    @classmethod
+    @transaction.atomic()
+    def allocate_priority_index(cls) -> int:
+        """
+        分配新规则的优先级，持有规则集锁直至事务结束
+        """
+
+        cls.lock()
+        max_index = RiskRule.objects.aggregate(max_index=Max("priority_index"))["max_index"]
+        return (max_index or 0) + 1
+
+    @classmethod
+    @transaction.atomic()
+    def reorder(cls, config: List[dict]) -> List[Tuple[RiskRule, dict]]:
+        """
+        批量调整优先级与启停状态，查询次数与规则数量无关
+        返回 (调整后的规则, 调整前的数据)
+        """
+
+        cls.lock()
+        config = {item["rule_id"]: item for item in config}
+        rules: Dict[int, RiskRule] = {}
+        for rule in RiskRule.objects.filter(rule_id__in=config.keys()):
+            if rule.rule_id not in rules or rule.version > rules[rule.rule_id].version:
+                rules[rule.rule_id] = rule
+        if not rules:
+            return []
+        origin_data = {rule_id: RiskRuleInfoSerializer(rule).data for rule_id, rule in rules.items()}
+        RiskRule._objects.filter(rule_id__in=rules.keys()).update(
+            priority_index=Case(
+                *[When(rule_id=rule_id, then=Value(config[rule_id]["priority_index"])) for rule_id in rules],
+                default=F("priority_index"),
+                output_field=IntegerField(),
+            ),
+            is_enabled=Case(
+                *[When(rule_id=rule_id, then=Value(config[rule_id]["is_enabled"])) for rule_id in rules],
+                default=F("is_enabled"),
+                output_field=BooleanField(),
+            ),
+        )
+        cls.bump_version()
+        for rule_id, rule in rules.items():
+            rule.priority_index = config[rule_id]["priority_index"]
+            rule.is_enabled = config[rule_id]["is_enabled"]
+        return [(rule, origin_data[rule_id]) for rule_id, rule in rules.items()]
 
 
 class RiskRuleHandler:
@@ -26,10 +112,27 @@ class RiskRuleHandler:
     风险处理规则
     """
 
+    _lock = threading.Lock()
+    _rules: Tuple[Union[int, None], List[RiskRule]] = (None, [])
+
     def __init__(self, risk_id: str):
         self.risk = Risk.objects.get(risk_id=risk_id)
-        # 仅使用启用的规则用于匹配
-        self.rules = RiskRule.load_latest_rules().filter(is_enabled=True).order_by("-priority_index")
+        self.rules = self.load_rules()
+
+    @classmethod
+    def load_rules(cls) -> List[RiskRule]:
+        """
+        仅使用启用的规则用于匹配，规则集版本号未变更时复用已加载的规则
+        """
+
+        version = RiskRuleSetHandler.get_version()
+        if cls._rules[0] == version:
+            return cls._rules[1]
+        with cls._lock:
+            if cls._rules[0] != version:
+                rules = list(RiskRule.load_latest_rules().filter(is_enabled=True).order_by("-priority_index"))
+                cls._rules = (version, rules)
+        return cls._rules[1]
 
     def bind_rule(self) -> None:
         """
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from typing import List, Union
+
+from django.db import transaction
+
+from services.web.risk.models import TicketNode, TicketNodeArchive, TicketTimeline
+from services.web.risk.serializers import TicketNodeSerializer
+
+
+class TicketTimelineHandler:
+    """
+    风险处理记录时间线
+    1. TicketNode 保存后按节点 ID 合并至时间线，读取时仅需一次按 risk_id 的查询
+    2. 归档仅迁移记录所在的表，时间线保持不变
+    3. 时间线缺失 (历史数据) 时由全部处理记录重建
+    """
+
+    def __init__(self, risk_id: str):
+        self.risk_id = risk_id
+
+    def load(self) -> List[dict]:
+        """
+        获取时间线，按时间正序
+        """
+
+        timeline = TicketTimeline.objects.filter(risk_id=self.risk_id).first()
+        if timeline is None:
+            timeline = self.rebuild()
+        return timeline.nodes
+
+    @transaction.atomic()
+    def rebuild(self) -> TicketTimeline:
+        """
+        由全部处理记录重建时间线
+        """
+
+        timeline = self._lock()
+        nodes = TicketNode.load_history(self.risk_id)
+        timeline.nodes = [TicketNodeSerializer(node).data for node in nodes]
+        timeline.last_node_id = self.get_last_node_id(timeline.nodes)
+        timeline.save(update_fields=["nodes", "last_node_id", "updated_at"])
+        return timeline
+
+    @transaction.atomic()
+    def merge(self, node: Union[TicketNode, TicketNodeArchive]) -> TicketTimeline:
+        """
+        合并单个处理记录，相同 ID 的记录覆盖
+        """
+
+        timeline = self._lock()
+        if not timeline.nodes:
+            return self.rebuild()
+        nodes = [item for item in timeline.nodes if item["id"] != node.id]
+        nodes.append(TicketNodeSerializer(node).data)
+        timeline.nodes = sorted(nodes, key=lambda item: item["timestamp"])
+        timeline.last_node_id = self.get_last_node_id(timeline.nodes)
+        timeline.save(update_fields=["nodes", "last_node_id", "updated_at"])
+        return timeline
+
+    def _lock(self) -> TicketTimeline:
+        # 并发创建由 get_or_create 处理唯一键冲突
+        timeline, _ = TicketTimeline.objects.get_or_create(risk_id=self.risk_id)
+        return TicketTimeline.objects.select_for_update().get(pk=timeline.pk)
+
+    @classmethod
+    def get_last_node_id(cls, nodes: List[dict]) -> Union[str, None]:
+        """
+        最后一个非误报相关的处理记录，与 Risk.last_history 保持一致
+        """
+
+        from services.web.risk.handlers.ticket import MisReport, ReOpenMisReport
+
+        for node in reversed(nodes):
+            if node["action"] not in [MisReport.__name__, ReOpenMisReport.__name__]:
+                return node["id"]
+        return None
+
+    @classmethod
+    def on_node_saved(cls, sender, instance: TicketNode, **kwargs) -> None:
+        cls(instance.risk_id).merge(instance)
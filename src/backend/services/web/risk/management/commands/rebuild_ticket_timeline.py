@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.core.management.base import BaseCommand
+
+from services.web.risk.handlers.timeline import TicketTimelineHandler
+from services.web.risk.models import Risk, TicketTimeline
+
+
+class Command(BaseCommand):
+    """
+    由处理记录 (含归档) 重建风险处理时间线
+    python manage.py rebuild_ticket_timeline
+    python manage.py rebuild_ticket_timeline 20231001120000000001 20231001120000000002
+    python manage.py rebuild_ticket_timeline --missing
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("risk_ids", nargs="*", help="risk id, default all")
+        parser.add_argument("--missing", action="store_true", default=False, help="only risks without timeline")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        risks = Risk.objects.all()
+        if kwargs["risk_ids"]:
+            risks = risks.filter(risk_id__in=kwargs["risk_ids"])
+        if kwargs["missing"]:
+            risks = risks.exclude(risk_id__in=TicketTimeline.objects.values("risk_id"))
+        total = 0
+        for risk_id in risks.order_by().values_list("risk_id", flat=True).iterator(chunk_size=kwargs["batch_size"]):
+            TicketTimelineHandler(risk_id).rebuild()
+            total += 1
+        self.stdout.write(f"rebuild ticket timeline for {total} risks")
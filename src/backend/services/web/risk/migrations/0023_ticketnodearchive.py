@@ -0,0 +1,56 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+import core.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("risk", "0022_risk_last_operate_time"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketNodeArchive",
+            fields=[
+                (
+                    "id",
+                    core.models.UUIDField(
+                        default=core.models.UUIDField.get_default_value,
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("risk_id", models.CharField(db_index=True, max_length=255, verbose_name="Risk ID")),
+                ("operator", models.CharField(max_length=255, verbose_name="Operator")),
+                (
+                    "current_operator",
+                    models.JSONField(blank=True, default=list, null=True, verbose_name="Current Operator"),
+                ),
+                ("action", models.CharField(max_length=64, verbose_name="Action")),
+                ("timestamp", models.FloatField(verbose_name="Timestamp")),
+                ("time", models.CharField(max_length=32, verbose_name="Time")),
+                ("process_result", models.JSONField(default=dict, verbose_name="Process Result")),
+                ("extra", models.JSONField(default=dict, verbose_name="Extra")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "运行中"), ("finished", "已完成")],
+                        default="finished",
+                        max_length=32,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True, verbose_name="Archived At")),
+            ],
+            options={
+                "verbose_name": "Ticket History Archive",
+                "verbose_name_plural": "Ticket History Archive",
+                "ordering": ["-timestamp"],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("risk", "0023_ticketnodearchive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketTimeline",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("risk_id", models.CharField(max_length=255, unique=True, verbose_name="Risk ID")),
+                ("nodes", models.JSONField(default=list, verbose_name="Nodes")),
+                ("last_node_id", models.CharField(blank=True, max_length=64, null=True, verbose_name="Last Node ID")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Updated At")),
+            ],
+            options={
+                "verbose_name": "Ticket Timeline",
+                "verbose_name_plural": "Ticket Timeline",
+                "ordering": ["-id"],
+            },
+        ),
+    ]
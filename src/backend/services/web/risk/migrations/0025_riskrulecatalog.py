@@ -0,0 +1,57 @@
+# Generated by Django 3.2.18 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def init_risk_rule_catalog(apps, schema_editor):
+    RiskRule = apps.get_model("risk", "RiskRule")
+    RiskRuleCatalog = apps.get_model("risk", "RiskRuleCatalog")
+    max_versions = {
+        item["rule_id"]: item["max_version"]
+        for item in RiskRule.objects.filter(is_deleted=False, rule_id__isnull=False)
+        .order_by()
+        .values("rule_id")
+        .annotate(max_version=Max("version"))
+    }
+    catalogs = [
+        RiskRuleCatalog(rule_id=rule.rule_id, version=rule.version, latest_rule_id=rule.id)
+        for rule in RiskRule.objects.filter(is_deleted=False, rule_id__in=max_versions.keys())
+        if rule.version == max_versions[rule.rule_id]
+    ]
+    RiskRuleCatalog.objects.bulk_create(catalogs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("risk", "0024_tickettimeline"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RiskRuleCatalog",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rule_id", models.BigIntegerField(unique=True, verbose_name="Rule ID")),
+                ("version", models.IntegerField(verbose_name="版本号")),
+                (
+                    "latest_rule",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="catalog",
+                        to="risk.riskrule",
+                        verbose_name="Latest Risk Rule",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Risk Rule Catalog",
+                "verbose_name_plural": "Risk Rule Catalog",
+                "ordering": ["rule_id"],
+            },
+        ),
+        migrations.RunPython(init_risk_rule_catalog, migrations.RunPython.noop),
+    ]
@@ -18,13 +18,14 @@ to the current version of the project delivered to anyone in the future.
 
 import datetime
 from functools import cached_property
+from itertools import chain
 from typing import List, Union
 
 from bk_audit.constants.log import DEFAULT_EMPTY_VALUE
 from bk_audit.log.models import AuditInstance
 from blueapps.utils.request_provider import get_request_username
 from django.db import models
-from django.db.models import Max, Q, QuerySet
+from django.db.models import Q, QuerySet
 from django.utils.translation import gettext_lazy
 from iam import DjangoQuerySetConverter
 
@@ -129,7 +130,21 @@ class Risk(models.Model):
     def last_history(self) -> Union["TicketNode", None]:
         from services.web.risk.handlers.ticket import MisReport, ReOpenMisReport
 
-        nodes = TicketNode.objects.filter(risk_id=self.risk_id).order_by("-timestamp")
+        # 通过时间线直接定位最后的处理节点
+        timeline = TicketTimeline.objects.filter(risk_id=self.risk_id).only("last_node_id").first()
+        if timeline is not None and timeline.last_node_id:
+            node = (
+                TicketNode.objects.filter(id=timeline.last_node_id).first()
+                or TicketNodeArchive.objects.filter(id=timeline.last_node_id).first()
+            )
+            if node is not None:
+                return node
+
+        # 优先查询热表，未命中时再查询归档表
+        nodes = chain(
+            TicketNode.objects.filter(risk_id=self.risk_id).order_by("-timestamp"),
+            TicketNodeArchive.objects.filter(risk_id=self.risk_id).order_by("-timestamp"),
+        )
         for node in nodes:
             if node.action not in [MisReport.__name__, ReOpenMisReport.__name__]:
                 return node
@@ -239,11 +254,39 @@ class RiskRule(SoftDeleteModel):
 
     @classmethod
     def load_latest_rules(cls) -> QuerySet:
-        max_versions = cls.objects.all().order_by().values("rule_id").annotate(max_version=Max("version"))
-        q = Q()
-        for v in max_versions:
-            q |= Q(rule_id=v["rule_id"], version=v["max_version"])
-        return cls.objects.filter(q)
+        return cls.objects.filter(catalog__isnull=False)
+
+
+class RiskRuleCatalog(models.Model):
+    """
+    风险处理规则目录
+    每个 rule_id 保留一条指向最新版本的记录，随 RiskRule 保存更新
+    """
+
+    rule_id = models.BigIntegerField(gettext_lazy("Rule ID"), unique=True)
+    version = models.IntegerField(gettext_lazy("版本号"))
+    latest_rule = models.OneToOneField(
+        RiskRule,
+        verbose_name=gettext_lazy("Latest Risk Rule"),
+        related_name="catalog",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+    )
+
+    class Meta:
+        verbose_name = gettext_lazy("Risk Rule Catalog")
+        verbose_name_plural = verbose_name
+        ordering = ["rule_id"]
+
+    @classmethod
+    def on_rule_saved(cls, sender, instance: RiskRule, **kwargs) -> None:
+        if instance.rule_id is None or instance.version is None:
+            return
+        if cls.objects.filter(rule_id=instance.rule_id, version__gt=instance.version).exists():
+            return
+        cls.objects.update_or_create(
+            rule_id=instance.rule_id, defaults={"version": instance.version, "latest_rule": instance}
+        )
 
 
 class RiskRuleAuditInstance(AuditInstance):
@@ -319,6 +362,61 @@ class TicketNode(models.Model):
         verbose_name_plural = verbose_name
         ordering = ["-timestamp"]
 
+    @classmethod
+    def load_history(cls, risk_id: str, reverse: bool = False) -> List[Union["TicketNode", "TicketNodeArchive"]]:
+        """
+        获取风险的全部处理记录，包含已归档的记录
+        """
+
+        nodes = [*TicketNodeArchive.objects.filter(risk_id=risk_id), *cls.objects.filter(risk_id=risk_id)]
+        return sorted(nodes, key=lambda node: node.timestamp, reverse=reverse)
+
+
+class TicketNodeArchive(models.Model):
+    """
+    Ticket History Archive
+    已关单且超过保留期的风险处理记录
+    """
+
+    id = UUIDField(verbose_name=gettext_lazy("ID"), primary_key=True)
+    risk_id = models.CharField(gettext_lazy("Risk ID"), max_length=255, db_index=True)
+    operator = models.CharField(gettext_lazy("Operator"), max_length=255)
+    current_operator = models.JSONField(gettext_lazy("Current Operator"), null=True, blank=True, default=list)
+    action = models.CharField(gettext_lazy("Action"), max_length=64)
+    timestamp = models.FloatField(gettext_lazy("Timestamp"))
+    time = models.CharField(gettext_lazy("Time"), max_length=32)
+    process_result = models.JSONField("Process Result", default=dict)
+    extra = models.JSONField("Extra", default=dict)
+    status = models.CharField(
+        gettext_lazy("Status"),
+        max_length=32,
+        choices=TicketNodeStatus.choices,
+        default=TicketNodeStatus.FINISHED,
+    )
+    archived_at = models.DateTimeField(gettext_lazy("Archived At"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("Ticket History Archive")
+        verbose_name_plural = verbose_name
+        ordering = ["-timestamp"]
+
+
+class TicketTimeline(models.Model):
+    """
+    Ticket Timeline
+    风险处理记录的物化视图，随 TicketNode 写入更新，包含已归档的记录
+    """
+
+    risk_id = models.CharField(gettext_lazy("Risk ID"), max_length=255, unique=True)
+    nodes = models.JSONField(gettext_lazy("Nodes"), default=list)
+    last_node_id = models.CharField(gettext_lazy("Last Node ID"), max_length=64, null=True, blank=True)
+    updated_at = models.DateTimeField(gettext_lazy("Updated At"), auto_now=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("Ticket Timeline")
+        verbose_name_plural = verbose_name
+        ordering = ["-id"]
+
 
 class TicketPermission(models.Model):
     """
@@ -20,7 +20,8 @@ import abc
 
 from bk_resource import Resource
 from blueapps.utils.request_provider import get_local_request, get_request_username
-from django.db.models import Count, Q
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy
 
@@ -70,18 +71,20 @@ class ListProcessApplications(ProcessApplicationMeta):
                 _q |= Q(**{key: item})
             q &= _q
         # 筛选数据
-        process_applications = ProcessApplication.objects.filter(q).order_by("-is_enabled", order_field)
-        # 获取关联的规则
-        rule_map = {
-            item["pa_id"]: item["count"]
-            for item in RiskRule.load_latest_rules()
-            .filter(pa_id__in=process_applications.values("id"))
-            .values("pa_id")
-            .annotate(count=Count("pa_id"))
+        # 关联的规则数量
+        rule_count = (
+            RiskRule.load_latest_rules()
+            .filter(pa_id=OuterRef("id"))
             .order_by()
-        }
-        for pa in process_applications:
-            setattr(pa, "rule_count", rule_map.get(pa.id, 0))
+            .values("pa_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        process_applications = (
+            ProcessApplication.objects.filter(q)
+            .annotate(rule_count=Coalesce(Subquery(rule_count), 0))
+            .order_by("-is_enabled", order_field)
+        )
         return process_applications
 
 
@@ -143,13 +146,11 @@ class ListRiskByPA(ProcessApplicationMeta):
     def perform_request(self, validated_request_data):
         # 获取处理套餐实例
         pa = get_object_or_404(ProcessApplication, id=validated_request_data["id"])
-        # 获取规则列表
-        rules = RiskRule.objects.filter(pa_id=pa.id)
-        # 拼接筛选条件
-        q = Q()
-        for rule in rules:
-            q |= Q(rule_id=rule.rule_id, rule_version=rule.version)
-        risks = Risk.load_authed_risks(action=ActionEnum.LIST_RISK).exclude(status=RiskStatus.CLOSED).filter(q)
+        # 绑定该套餐任一版本规则的风险
+        rules = RiskRule.objects.filter(pa_id=pa.id, rule_id=OuterRef("rule_id"), version=OuterRef("rule_version"))
+        risks = (
+            Risk.load_authed_risks(action=ActionEnum.LIST_RISK).exclude(status=RiskStatus.CLOSED).filter(Exists(rules))
+        )
         bk_audit_client.add_event(
             action=ActionEnum.LIST_RISK,
             resource_type=ResourceEnum.RISK,
@@ -23,7 +23,7 @@ from bk_resource.settings import bk_resource_settings
 from blueapps.utils.request_provider import get_request_username
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Count, Q, QuerySet
+from django.db.models import Q, QuerySet
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext, gettext_lazy
 
@@ -42,6 +42,7 @@ from services.web.risk.constants import (
     RiskStatus,
     TicketNodeStatus,
 )
+from services.web.risk.handlers.query import RiskListHandler
 from services.web.risk.handlers.ticket import (
     AutoProcess,
     CloseRisk,
@@ -52,11 +53,11 @@ from services.web.risk.handlers.ticket import (
     ReOpenMisReport,
     TransOperator,
 )
+from services.web.risk.handlers.timeline import TicketTimelineHandler
 from services.web.risk.models import (
     ProcessApplication,
     Risk,
     RiskAuditInstance,
-    RiskExperience,
     TicketNode,
 )
 from services.web.risk.serializers import (
@@ -65,12 +66,12 @@ from services.web.risk.serializers import (
     CustomTransRiskReqSerializer,
     ForceRevokeApproveTicketReqSerializer,
     ForceRevokeAutoProcessReqSerializer,
+    ListRiskPageResponseSerializer,
     ListRiskRequestSerializer,
     ListRiskResponseSerializer,
     ReopenRiskReqSerializer,
     RetryAutoProcessReqSerializer,
     RiskInfoSerializer,
-    TicketNodeSerializer,
     UpdateRiskLabelReqSerializer,
 )
 from services.web.risk.tasks import sync_auto_result
@@ -96,32 +97,29 @@ class RetrieveRisk(RiskMeta):
             extend_data=validated_request_data,
         )
         risk = data[0]
-        nodes = TicketNode.objects.filter(risk_id=risk["risk_id"]).order_by("timestamp")
-        risk["ticket_history"] = TicketNodeSerializer(nodes, many=True).data
+        risk["ticket_history"] = TicketTimelineHandler(risk["risk_id"]).load()
         return risk
 
 
 class ListRisk(RiskMeta):
     name = gettext_lazy("获取风险列表")
     RequestSerializer = ListRiskRequestSerializer
-    ResponseSerializer = ListRiskResponseSerializer
-    many_response_data = True
+    ResponseSerializer = ListRiskPageResponseSerializer
 
     def perform_request(self, validated_request_data):
         order_field = validated_request_data.pop("order_field", "-last_operate_time")
-        risks = self.load_risks(validated_request_data).order_by(order_field)
-        # 获取关联的经验
-        experiences = {
-            e["risk_id"]: e["count"]
-            for e in RiskExperience.objects.filter(risk_id__in=risks.values("risk_id"))
-            .values("risk_id")
-            .order_by("risk_id")
-            .annotate(count=Count("risk_id"))
-        }
-        for risk in risks:
-            setattr(risk, "experiences", experiences.get(risk.risk_id, 0))
+        page = validated_request_data.pop("page")
+        page_size = validated_request_data.pop("page_size")
+        cursor = validated_request_data.pop("cursor", None)
+        handler = RiskListHandler(queryset=self.load_risks(validated_request_data), page_size=page_size)
+        # 传入游标时按 (event_time, risk_id) 翻页，排序字段已在请求校验中限制
+        if cursor is not None:
+            data = handler.paginate_by_cursor(cursor=cursor, descending=order_field.startswith("-"))
+        else:
+            data = handler.paginate_by_page(page=page, order_field=order_field)
         # 响应
-        return risks
+        data["results"] = ListRiskResponseSerializer(data["results"], many=True).data
+        return data
 
     def load_risks(self, validated_request_data: dict) -> QuerySet:
         # 构造表达式
@@ -20,6 +20,7 @@ import abc
 
 from bk_resource import Resource
 from blueapps.utils.request_provider import get_local_request
+from django.db import transaction
 from django.db.models import Q
 from django.utils.translation import gettext_lazy
 
@@ -30,6 +31,7 @@ from apps.permission.handlers.resource_types import ResourceEnum
 from core.exceptions import RiskRuleInUse
 from core.utils.tools import choices_to_dict
 from services.web.risk.constants import RiskRuleOperator, RiskStatus
+from services.web.risk.handlers.rule import RiskRuleSetHandler
 from services.web.risk.models import Risk, RiskRule, RiskRuleAuditInstance
 from services.web.risk.serializers import (
     BatchUpdateRiskRulePriorityIndexReqSerializer,
@@ -90,11 +92,17 @@ class CreateRiskRule(RiskRuleMeta):
     RequestSerializer = CreateRiskRuleReqSerializer
     ResponseSerializer = RiskRuleInfoSerializer
 
+    @transaction.atomic()
     def perform_request(self, validated_request_data):
-        instance: RiskRule = RiskRule.objects.create(**validated_request_data, version=1, is_enabled=False)
+        instance: RiskRule = RiskRule.objects.create(
+            **validated_request_data,
+            version=1,
+            is_enabled=False,
+            priority_index=RiskRuleSetHandler.allocate_priority_index()
+        )
         instance.rule_id = instance.id
-        instance.priority_index = RiskRule.objects.all().order_by("-priority_index").first().priority_index + 1
-        instance.save(update_fields=["rule_id", "priority_index"])
+        instance.save(update_fields=["rule_id"])
+        RiskRuleSetHandler.bump_version()
         bk_audit_client.add_event(
             action=ActionEnum.CREATE_RULE,
             instance=RiskRuleAuditInstance(instance),
@@ -108,6 +116,7 @@ class UpdateRiskRule(RiskRuleMeta):
     RequestSerializer = UpdateRiskRuleReqSerializer
     ResponseSerializer = RiskRuleInfoSerializer
 
+    @transaction.atomic()
     def perform_request(self, validated_request_data):
         rule = RiskRule.get_rule_or_404(rule_id=validated_request_data["rule_id"])
         origin_data = RiskRuleInfoSerializer(rule).data
@@ -118,6 +127,7 @@ class UpdateRiskRule(RiskRuleMeta):
             created_at=rule.created_at,
             created_by=rule.created_by
         )
+        RiskRuleSetHandler.bump_version()
         setattr(instance, "instance_origin_data", origin_data)
         bk_audit_client.add_event(
             action=ActionEnum.EDIT_RULE,
@@ -130,6 +140,7 @@ class UpdateRiskRule(RiskRuleMeta):
 class DeleteRiskRule(RiskRuleMeta):
     name = gettext_lazy("删除风险处理规则")
 
+    @transaction.atomic()
     def perform_request(self, validated_request_data):
         if Risk.objects.filter(rule_id=validated_request_data["rule_id"]).exclude(status=RiskStatus.CLOSED).exists():
             raise RiskRuleInUse()
@@ -142,6 +153,7 @@ class DeleteRiskRule(RiskRuleMeta):
             extend_data=validated_request_data,
         )
         instances.delete()
+        RiskRuleSetHandler.bump_version()
 
 
 class ListRiskByRule(RiskRuleMeta):
@@ -168,11 +180,13 @@ class ToggleRiskRule(RiskRuleMeta):
     RequestSerializer = ToggleRiskRuleRequestSerializer
     ResponseSerializer = RiskRuleInfoSerializer
 
+    @transaction.atomic()
     def perform_request(self, validated_request_data):
         rule = RiskRule.get_rule_or_404(rule_id=validated_request_data["rule_id"])
         origin_data = RiskRuleInfoSerializer(rule).data
         rule.is_enabled = validated_request_data["is_enabled"]
         rule.save(update_fields=["is_enabled"])
+        RiskRuleSetHandler.bump_version()
         setattr(rule, "instance_origin_data", origin_data)
         bk_audit_client.add_event(
             action=ActionEnum.EDIT_RULE,
@@ -194,15 +208,7 @@ class BatchUpdateRiskRulePriorityIndex(RiskRuleMeta):
     RequestSerializer = BatchUpdateRiskRulePriorityIndexReqSerializer
 
     def perform_request(self, validated_request_data):
-        for config in validated_request_data["config"]:
-            rule = RiskRule.objects.filter(rule_id=config["rule_id"]).order_by("-version").first()
-            if not rule:
-                continue
-            origin_data = RiskRuleInfoSerializer(rule).data
-            RiskRule._objects.filter(rule_id=rule.rule_id).update(
-                priority_index=config["priority_index"], is_enabled=config["is_enabled"]
-            )
-            rule.refresh_from_db()
+        for rule, origin_data in RiskRuleSetHandler.reorder(validated_request_data["config"]):
             setattr(rule, "instance_origin_data", origin_data)
             bk_audit_client.add_event(
                 action=ActionEnum.EDIT_RULE,
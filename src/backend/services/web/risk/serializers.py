@@ -24,11 +24,18 @@ from blueapps.utils.request_provider import get_request_username
 from django.conf import settings
 from django.utils.translation import gettext, gettext_lazy
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from apps.meta.constants import OrderTypeChoices
 from core.utils.distutils import strtobool
 from core.utils.tools import mstimestamp_to_date_string
-from services.web.risk.constants import EventMappingFields, RiskLabel, RiskRuleOperator
+from services.web.risk.constants import (
+    RISK_LIST_CURSOR_ORDER_FIELDS,
+    RISK_LIST_MAX_PAGE_SIZE,
+    EventMappingFields,
+    RiskLabel,
+    RiskRuleOperator,
+)
 from services.web.risk.models import (
     ProcessApplication,
     Risk,
@@ -183,6 +190,11 @@ class ListRiskRequestSerializer(serializers.Serializer):
     order_type = serializers.ChoiceField(
         label=gettext_lazy("排序方式"), required=False, allow_null=True, allow_blank=True, choices=OrderTypeChoices.choices
     )
+    page = serializers.IntegerField(label=gettext_lazy("Page"), min_value=1, default=1)
+    page_size = serializers.IntegerField(
+        label=gettext_lazy("Page Size"), min_value=1, max_value=RISK_LIST_MAX_PAGE_SIZE, default=api_settings.PAGE_SIZE
+    )
+    cursor = serializers.CharField(label=gettext_lazy("Cursor"), required=False, allow_blank=True)
 
     def validate(self, attrs: dict) -> dict:
         # 校验
@@ -194,6 +206,11 @@ class ListRiskRequestSerializer(serializers.Serializer):
                 if data.pop("order_type") == OrderTypeChoices.DESC
                 else data.pop("order_field")
             )
+        # 游标翻页
+        if "cursor" in data:
+            data["order_field"] = data.get("order_field") or RISK_LIST_CURSOR_ORDER_FIELDS[-1]
+            if data["order_field"] not in RISK_LIST_CURSOR_ORDER_FIELDS:
+                raise serializers.ValidationError(gettext("游标翻页仅支持按 %s 排序") % ", ".join(RISK_LIST_CURSOR_ORDER_FIELDS))
         # 时间转换
         if data.get("start_time"):
             data["event_time__gte"] = [data.pop("start_time")]
@@ -212,7 +229,7 @@ class ListRiskRequestSerializer(serializers.Serializer):
             data["event_content__contains"] = data.pop("event_content")
         # 格式转换
         for key, val in attrs.items():
-            if key in ["event_time__gte", "event_time__lt", "order_type", "order_field"]:
+            if key in ["event_time__gte", "event_time__lt", "order_type", "order_field", "page", "page_size", "cursor"]:
                 continue
             if key in ["tags__contains"]:
                 data[key] = [int(i) for i in val.split(",") if i]
@@ -221,6 +238,18 @@ class ListRiskRequestSerializer(serializers.Serializer):
         return data
 
 
+class ListRiskPageResponseSerializer(serializers.Serializer):
+    """
+    List Risk Page
+    """
+
+    page = serializers.IntegerField(label=gettext_lazy("Page"), required=False)
+    num_pages = serializers.IntegerField(label=gettext_lazy("Total Pages"), required=False)
+    total = serializers.IntegerField(label=gettext_lazy("Total"))
+    next_cursor = serializers.CharField(label=gettext_lazy("Next Cursor"), required=False, allow_null=True)
+    results = serializers.ListField(label=gettext_lazy("Risks"), child=serializers.JSONField())
+
+
 class ListRiskResponseSerializer(serializers.ModelSerializer):
     """
     List Risk
@@ -56,6 +56,7 @@ from services.web.analyze.controls.base import Controller
 from services.web.analyze.exceptions import ControlNotExist
 from services.web.analyze.models import Control
 from services.web.analyze.tasks import call_controller
+from services.web.analyze.utils import ResultTableSchemaCache
 from services.web.strategy_v2.constants import (
     HAS_UPDATE_TAG_ID,
     HAS_UPDATE_TAG_NAME,
@@ -523,7 +524,8 @@ class GetRTFields(StrategyV2Base):
     many_response_data = True
 
     def perform_request(self, validated_request_data):
-        fields = api.bk_base.get_rt_fields(result_table_id=validated_request_data["table_id"])
+        # 用户选择字段时刷新缓存，保证后续创建策略使用的字段结构与页面一致
+        fields = ResultTableSchemaCache(validated_request_data["table_id"]).refresh_fields()
         return [
             {
                 "label": "{}({})".format(field["field_alias"] or field["field_name"], field["field_name"]),
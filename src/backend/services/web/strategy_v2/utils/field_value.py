@@ -21,7 +21,8 @@ from typing import List
 from blueapps.utils.logger import logger
 from django.db.models import QuerySet
 
-from apps.meta.models import Action, DataMap, ResourceType, System
+from apps.meta.models import Action, ResourceType, System
+from apps.meta.utils.data_map import data_map_translator
 from apps.meta.utils.fields import SNAPSHOT_USER_INFO
 from core.utils.tools import choices_to_dict
 from services.web.esquery.constants import AccessTypeChoices, UserIdentifyTypeChoices
@@ -126,7 +127,7 @@ class FieldValueHandler:
 
     def _load_snapshot_user_info_field(self) -> None:
         data_field = self.field_name.replace(".", "__")
-        data_map = DataMap.objects.filter(data_field=data_field)
+        aliases = data_map_translator.get_aliases(data_field)
         self._values = self._db_data_to_list(
-            data_map, get_id=lambda item: item.data_key, get_name=lambda item: item.data_alias
+            aliases.items(), get_id=lambda item: item[0], get_name=lambda item: item[1]
         )
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+
+from services.web.analyze.constants import FlowStatusChoices
+from services.web.analyze.models import FlowDeployTask
+from services.web.analyze.tracker import FlowStatusTracker
+from services.web.strategy_v2.constants import StrategyStatusChoices
+from services.web.strategy_v2.models import Strategy
+from tests.base import TestCase
+
+
+class FlowStatusTrackerTest(TestCase):
+    def setUp(self) -> None:
+        self.strategy = Strategy.objects.create(
+            namespace=self.namespace,
+            strategy_name="flow",
+            control_id="control",
+            control_version=1,
+            status=StrategyStatusChoices.STARTING.value,
+            backend_data={"flow_id": 1},
+        )
+        FlowStatusTracker.track(
+            self.strategy.strategy_id,
+            success_status=StrategyStatusChoices.RUNNING.value,
+            failed_status=StrategyStatusChoices.START_FAILED.value,
+            other_status=StrategyStatusChoices.STARTING.value,
+        )
+
+    def _make_due(self) -> None:
+        FlowDeployTask.objects.update(next_check_at=timezone.now() - datetime.timedelta(seconds=1))
+
+    @mock.patch("services.web.analyze.tracker.api.bk_base.get_flow_deploy_data")
+    def test_check(self, get_flow_deploy_data: mock.Mock):
+        """FlowStatusTracker.check"""
+        # 未到检查时间
+        self.assertIsNone(FlowStatusTracker.check(self.strategy.strategy_id))
+        get_flow_deploy_data.assert_not_called()
+        # 部署中
+        self._make_due()
+        get_flow_deploy_data.return_value = {"status": "running"}
+        self.assertEqual(FlowStatusTracker.check(self.strategy.strategy_id), FlowStatusTracker.get_countdown(1))
+        self.assertEqual(FlowDeployTask.objects.get(strategy_id=self.strategy.strategy_id).attempts, 1)
+        # 部署完成
+        self._make_due()
+        get_flow_deploy_data.return_value = {"status": FlowStatusChoices.SUCCESS.value}
+        self.assertIsNone(FlowStatusTracker.check(self.strategy.strategy_id))
+        self.strategy.refresh_from_db()
+        self.assertEqual(self.strategy.status, StrategyStatusChoices.RUNNING.value)
+        self.assertFalse(FlowDeployTask.objects.exists())
+
+    @mock.patch("services.web.analyze.tracker.FLOW_STATUS_CHECK_MAX_ATTEMPTS", 1)
+    @mock.patch("services.web.analyze.tracker.ErrorMsgHandler")
+    @mock.patch("services.web.analyze.tracker.api.bk_base.get_flow_deploy_data")
+    def test_check_timeout(self, get_flow_deploy_data: mock.Mock, error_msg_handler: mock.Mock):
+        """FlowStatusTracker.check"""
+        self._make_due()
+        get_flow_deploy_data.return_value = {"status": "running"}
+        self.assertIsNone(FlowStatusTracker.check(self.strategy.strategy_id))
+        self.strategy.refresh_from_db()
+        self.assertEqual(self.strategy.status, StrategyStatusChoices.START_FAILED.value)
+        self.assertFalse(FlowDeployTask.objects.exists())
+        error_msg_handler.assert_called_once()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from services.web.analyze.utils import (
+    ResultTableSchemaCache,
+    build_sql_case_branch,
+    build_sql_field,
+)
+from tests.base import TestCase
+
+RESULT_TABLE_ID = "2_bklog_demo"
+RT_FIELDS = [{"field_name": "timestamp"}, {"field_name": "system_id"}, {"field_name": "extend_data"}]
+
+
+class ResultTableSchemaCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.cache_patcher = mock.patch.object(ResultTableSchemaCache, "cache", LocMemCache("rt_schema", {}))
+        self.cache_patcher.start()
+
+    def tearDown(self) -> None:
+        self.cache_patcher.stop()
+
+    @mock.patch("services.web.analyze.utils.api.bk_base.get_rt_fields")
+    def test_get_fields(self, get_rt_fields: mock.Mock):
+        """ResultTableSchemaCache.get_fields"""
+        get_rt_fields.return_value = RT_FIELDS
+        self.assertEqual(ResultTableSchemaCache(RESULT_TABLE_ID).get_fields(), RT_FIELDS)
+        self.assertEqual(ResultTableSchemaCache(RESULT_TABLE_ID).get_fields(), RT_FIELDS)
+        get_rt_fields.assert_called_once_with(result_table_id=RESULT_TABLE_ID)
+
+    @mock.patch("services.web.analyze.utils.api.bk_base.get_rt_fields")
+    def test_invalidate(self, get_rt_fields: mock.Mock):
+        """ResultTableSchemaCache.invalidate"""
+        get_rt_fields.return_value = RT_FIELDS
+        ResultTableSchemaCache(RESULT_TABLE_ID).get_fields()
+        ResultTableSchemaCache(RESULT_TABLE_ID).invalidate()
+        ResultTableSchemaCache(RESULT_TABLE_ID).get_fields()
+        ResultTableSchemaCache.invalidate_all()
+        ResultTableSchemaCache(RESULT_TABLE_ID).get_fields()
+        self.assertEqual(get_rt_fields.call_count, 3)
+
+
+class SQLFragmentTest(TestCase):
+    def test_build_sql_field(self):
+        """build_sql_field"""
+        self.assertEqual(build_sql_field("username", "operator"), "username as operator")
+        self.assertEqual(build_sql_field("username", "operator", using_as=False), "username ")
+        self.assertEqual(
+            build_sql_field("extend_data.cmd", "cmd"),
+            "udf_json_extract_one(extend_data, 'cmd') as cmd",
+        )
+
+    def test_build_sql_case_branch(self):
+        """build_sql_case_branch"""
+        self.assertEqual(
+            build_sql_case_branch("bk_audit", "view_log", "username", "operator"),
+            "WHEN system_id = 'bk_audit' AND action_id = 'view_log' THEN username ",
+        )
+        self.assertEqual(
+            build_sql_case_branch("bk_audit", "", "username", "operator"),
+            "WHEN system_id = 'bk_audit'  THEN username ",
+        )
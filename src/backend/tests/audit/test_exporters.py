@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from opentelemetry import context as otel_context
+
+from apps.audit.constants import DropPolicy
+from apps.audit.exporters import BufferedExporter
+from tests.base import TestCase
+
+
+class FakeExporter:
+    """
+    记录输出内容
+    """
+
+    is_delay = False
+
+    def __init__(self, fail: bool = False):
+        self.events = []
+        self.contexts = []
+        self.fail = fail
+
+    def export(self, events):
+        if self.fail:
+            raise Exception("collector unavailable")
+        self.events.extend(events)
+        self.contexts.extend([otel_context.get_value("request_id")] * len(events))
+
+
+class BufferedExporterTest(TestCase):
+    def _build(self, inner, drop_policy=DropPolicy.DROP_OLDEST, buffer_size=10):
+        exporter = BufferedExporter(inner, buffer_size=buffer_size, batch_size=3, drop_policy=drop_policy)
+        # 不启动后台线程，由测试手动 flush
+        exporter._ensure_worker = lambda: None
+        return exporter
+
+    def test_flush(self):
+        inner = FakeExporter()
+        exporter = self._build(inner)
+        exporter.export(list(range(7)))
+        exporter.flush()
+        self.assertEqual(inner.events, list(range(7)))
+        self.assertEqual(exporter.stats["flushed"], 7)
+        self.assertEqual(exporter.stats["pending"], 0)
+
+    def test_drop_oldest(self):
+        inner = FakeExporter()
+        exporter = self._build(inner, buffer_size=3)
+        exporter.export(list(range(5)))
+        exporter.flush()
+        self.assertEqual(inner.events, [2, 3, 4])
+        self.assertEqual(exporter.stats["dropped"], 2)
+
+    def test_drop_newest(self):
+        inner = FakeExporter()
+        exporter = self._build(inner, drop_policy=DropPolicy.DROP_NEWEST, buffer_size=3)
+        exporter.export(list(range(5)))
+        exporter.flush()
+        self.assertEqual(inner.events, [0, 1, 2])
+        self.assertEqual(exporter.stats["dropped"], 2)
+
+    def test_export_failed(self):
+        exporter = self._build(FakeExporter(fail=True))
+        exporter.export(list(range(4)))
+        exporter.flush()
+        self.assertEqual(exporter.stats["failed"], 4)
+        self.assertEqual(exporter.stats["flushed"], 0)
+
+    def test_trace_context(self):
+        inner = FakeExporter()
+        exporter = self._build(inner)
+        for request_id in ["r1", "r2"]:
+            token = otel_context.attach(otel_context.set_value("request_id", request_id))
+            try:
+                exporter.export([request_id] * 2)
+            finally:
+                otel_context.detach(token)
+        exporter.flush()
+        self.assertEqual(inner.events, ["r1", "r1", "r2", "r2"])
+        self.assertEqual(inner.contexts, ["r1", "r1", "r2", "r2"])
+        self.assertIsNone(otel_context.get_value("request_id"))
@@ -20,11 +20,14 @@ from bk_resource import api as _api
 from bk_resource import resource as _resource
 from django.conf import settings
 from django.test import TestCase as _TestCase
+from django.test import override_settings
 
 
+@override_settings(ENABLE_BKCRYPTO=False)
 class TestCase(_TestCase):
     """
     Base Test Case for Bk Audit
+    单元测试默认关闭加密，避免依赖数据库中的密钥
     """
 
     app_code = settings.APP_CODE
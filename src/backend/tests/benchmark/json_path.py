@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+# JSON 路径工具基准测试
+# python -m tests.benchmark.json_path
+
+import copy
+import os
+import random
+import timeit
+from typing import List
+
+EVENT_COUNT = 2000
+REPEAT = 5
+
+
+def legacy_expand_json(raw_json: dict, level: int, separator: str = "/") -> dict:
+    data = dict()
+    expanded_keys = set()
+    current_level = 1
+    while current_level < level:
+        current_level += 1
+        for key, val in raw_json.items():
+            if key in expanded_keys:
+                continue
+            data[key] = val
+            expanded_keys.add(key)
+            if isinstance(val, dict):
+                for child_key, child_val in val.items():
+                    data[f"{key}{separator}{child_key}"] = child_val
+        raw_json = copy.deepcopy(data)
+    return data
+
+
+def legacy_modify_dict_by_path(data: dict, path: List[str], default_value: any, auto_create: bool = False) -> dict:
+    if not data:
+        return data
+    if len(path) == 1:
+        data[path[0]] = default_value
+        return data
+    if auto_create:
+        data[path[0]] = data.get(path[0]) or {}
+    if data.get(path[0]) is None:
+        return data
+    data[path[0]] = legacy_modify_dict_by_path(data[path[0]], path[1:], default_value)
+    return data
+
+
+def legacy_drop_dict_item_by_path(data: dict, path: List[str], default_value: any) -> dict:
+    if not data:
+        return data
+    if len(path) == 1:
+        data.pop(path[0], None)
+        return data
+    next_path = data.get(path[0])
+    if not next_path:
+        return data
+    data[path[0]] = legacy_drop_dict_item_by_path(data[path[0]], path[1:], default_value)
+    return data
+
+
+def build_audit_event(rand: random.Random) -> dict:
+    """
+    构造接近真实审计日志结构的事件
+    """
+
+    username = f"user_{rand.randint(1, 500)}"
+    return {
+        "event_id": f"{rand.getrandbits(64):x}",
+        "request_id": f"{rand.getrandbits(64):x}",
+        "system_id": rand.choice(["bk_cmdb", "bk_job", "bk_monitor", "bk_log_search"]),
+        "action_id": rand.choice(["view_host", "edit_host", "execute_script", "search_log"]),
+        "resource_type_id": rand.choice(["host", "biz", "script", ""]),
+        "instance_id": str(rand.randint(1, 100000)),
+        "username": username,
+        "access_source_ip": f"10.0.{rand.randint(0, 255)}.{rand.randint(0, 255)}",
+        "start_time": 1700000000000 + rand.randint(0, 10**9),
+        "result_code": rand.choice([0, 0, 0, 1]),
+        "extend_data": {
+            "host": {"ip": f"10.1.{rand.randint(0, 255)}.{rand.randint(0, 255)}", "os": {"name": "linux", "ver": "7"}},
+            "params": {f"param_{index}": rand.random() for index in range(rand.randint(0, 8))},
+            "tags": [rand.choice(["a", "b", "c"]) for _ in range(3)],
+        },
+        "instance_data": {
+            "bk_host_id": rand.randint(1, 100000),
+            "bk_cloud_id": {"id": 0, "name": "default area"},
+            "attrs": {"cpu": rand.randint(1, 64), "mem": rand.randint(1, 512), "disk": {"type": "ssd"}},
+        },
+        "snapshot_user_info": {"username": username, "display_name": username.upper(), "phone": "13000000000"},
+        "snapshot_resource_type_info": {"id": "host", "name": "主机", "sensitivity": 1},
+    }
+
+
+def build_audit_events(count: int = EVENT_COUNT, seed: int = 1) -> List[dict]:
+    rand = random.Random(seed)
+    return [build_audit_event(rand) for _ in range(count)]
+
+
+SENSITIVE_PATHS = [
+    "snapshot_user_info.phone",
+    "extend_data.host.ip",
+    "instance_data.attrs.disk.type",
+    "instance_data.not_exists.value",
+]
+
+
+def run():
+    from core.constants import DEFAULT_JSON_EXPAND_LEVEL
+    from core.utils.tools import (
+        compile_json_path,
+        drop_dict_item_by_path,
+        expand_json,
+        modify_dict_by_path,
+    )
+
+    events = build_audit_events()
+    cases = {
+        "expand_json": (
+            lambda: [legacy_expand_json(event, DEFAULT_JSON_EXPAND_LEVEL) for event in events],
+            lambda: [expand_json(event, DEFAULT_JSON_EXPAND_LEVEL) for event in events],
+        ),
+        "expand_json(level=4)": (
+            lambda: [legacy_expand_json(event, 4) for event in events],
+            lambda: [expand_json(event, 4) for event in events],
+        ),
+        "modify_dict_by_path": (
+            lambda: [
+                legacy_modify_dict_by_path(event, path.split("."), "******")
+                for event in events
+                for path in SENSITIVE_PATHS
+            ],
+            lambda: [compile_json_path(path).set(event, "******") for event in events for path in SENSITIVE_PATHS],
+        ),
+        "drop_dict_item_by_path": (
+            lambda: [
+                legacy_drop_dict_item_by_path(copy.copy(event), path.split("."), None)
+                for event in events
+                for path in SENSITIVE_PATHS
+            ],
+            lambda: [
+                drop_dict_item_by_path(copy.copy(event), path.split("."), None)
+                for event in events
+                for path in SENSITIVE_PATHS
+            ],
+        ),
+        "modify_dict_by_path(uncompiled)": (
+            lambda: [
+                legacy_modify_dict_by_path(event, path.split("."), "******")
+                for event in events
+                for path in SENSITIVE_PATHS
+            ],
+            lambda: [
+                modify_dict_by_path(event, path.split("."), "******") for event in events for path in SENSITIVE_PATHS
+            ],
+        ),
+    }
+    print(f"events => {len(events)}; repeat => {REPEAT}")
+    for name, (legacy, current) in cases.items():
+        legacy_cost = min(timeit.repeat(legacy, number=1, repeat=REPEAT))
+        current_cost = min(timeit.repeat(current, number=1, repeat=REPEAT))
+        print(
+            f"{name:<36} legacy => {legacy_cost * 1000:8.2f}ms; "
+            f"current => {current_cost * 1000:8.2f}ms; speedup => {legacy_cost / current_cost:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+
+    import django
+
+    django.setup()
+    run()
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+# 风险链路离线基准测试
+# 事件写入、风险生成、规则匹配、单据流转四个阶段使用本地替身代替 bk_log / ES / ITSM / IAM / 通知，
+# 统计各阶段吞吐、p95 耗时与数据库查询数，输出 JSON 报告并可与基线对比
+
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.db import connection
+
+from apps.meta.models import GlobalMetaConfig
+from apps.notice.models import NoticeGroup
+from services.web.risk.constants import SECURITY_PERSON_KEY, RiskStatus
+from services.web.risk.handlers import EventHandler
+from services.web.risk.handlers.risk import RiskHandler
+from services.web.risk.handlers.rule import RiskRuleHandler
+from services.web.risk.handlers.ticket import NewRisk
+from services.web.risk.models import Risk, RiskRule
+from services.web.strategy_v2.models import Strategy
+
+# 耗时允许的波动比例，超过基线该比例视为性能回退
+DEFAULT_TOLERANCE = 0.2
+BENCHMARK_OPERATOR = "bk_audit_benchmark"
+
+
+@dataclass
+class BenchmarkScale:
+    events: int = 500
+    strategies: int = 20
+    rules: int = 50
+    seed: int = 1
+
+    @classmethod
+    def from_env(cls) -> "BenchmarkScale":
+        return cls(
+            events=int(os.getenv("BKAPP_BENCHMARK_EVENTS", cls.events)),
+            strategies=int(os.getenv("BKAPP_BENCHMARK_STRATEGIES", cls.strategies)),
+            rules=int(os.getenv("BKAPP_BENCHMARK_RULES", cls.rules)),
+            seed=int(os.getenv("BKAPP_BENCHMARK_SEED", cls.seed)),
+        )
+
+
+class QueryCounter:
+    """
+    统计执行的 SQL 数量，不依赖 DEBUG
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class StageRecorder:
+    """
+    记录单个阶段每次执行的耗时与查询数
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.durations: List[float] = []
+        self.items = 0
+        self.queries = 0
+
+    @contextmanager
+    def measure(self, items: int = 1):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            yield
+        self.durations.append(time.perf_counter() - start)
+        self.items += items
+        self.queries += counter.count
+
+    @staticmethod
+    def percentile(values: List[float], percent: float) -> float:
+        if not values:
+            return 0
+        values = sorted(values)
+        index = max(math.ceil(len(values) * percent / 100) - 1, 0)
+        return values[index]
+
+    def to_json(self) -> dict:
+        total = sum(self.durations)
+        return {
+            "calls": len(self.durations),
+            "items": self.items,
+            "total_seconds": round(total, 6),
+            "throughput": round(self.items / total, 3) if total else 0,
+            "p50_ms": round(self.percentile(self.durations, 50) * 1000, 3),
+            "p95_ms": round(self.percentile(self.durations, 95) * 1000, 3),
+            "max_ms": round(max(self.durations, default=0) * 1000, 3),
+            "queries": self.queries,
+            "queries_per_item": round(self.queries / self.items, 3) if self.items else 0,
+        }
+
+
+class FakeElasticsearch:
+    """
+    ES 替身，记录写入的文档
+    """
+
+    def __init__(self):
+        self.documents = []
+
+    def bulk(self, index: str, body: list) -> dict:
+        docs = body[1::2]
+        self.documents.extend(docs)
+        return {"items": [{"index": {"_shards": {"failed": 0}}} for _ in docs]}
+
+
+class RiskPipelineBenchmark:
+    """
+    风险链路基准测试
+    需要在测试数据库中运行，会创建策略、通知组与规则数据
+    """
+
+    def __init__(self, scale: BenchmarkScale):
+        self.scale = scale
+        self.random = random.Random(scale.seed)
+        self.stages: Dict[str, StageRecorder] = {}
+        self.es = FakeElasticsearch()
+        self.strategy_ids: List[int] = []
+
+    def stage(self, name: str) -> StageRecorder:
+        return self.stages.setdefault(name, StageRecorder(name))
+
+    def stand_ins(self) -> ExitStack:
+        """
+        外部依赖替身
+        """
+
+        stack = ExitStack()
+        patches = [
+            mock.patch.object(EventHandler, "get_es_config", return_value={}),
+            mock.patch.object(EventHandler, "get_client", return_value=self.es),
+            mock.patch.object(EventHandler, "get_table_id", return_value="2_bkaudit_benchmark_event"),
+            mock.patch.object(EventHandler, "search_all_event", side_effect=lambda **kwargs: self.es.documents),
+            mock.patch("services.web.risk.handlers.risk.send_notice"),
+            mock.patch("services.web.risk.handlers.risk.ErrorMsgHandler"),
+            mock.patch("services.web.risk.tasks.process_risk_ticket"),
+            mock.patch.object(Risk, "auth_operators"),
+            mock.patch("services.web.risk.handlers.ticket.api.bk_itsm"),
+            mock.patch("services.web.risk.handlers.ticket.api.bk_sops"),
+        ]
+        for patch in patches:
+            stack.enter_context(patch)
+        return stack
+
+    def prepare(self) -> None:
+        GlobalMetaConfig.set(config_key=SECURITY_PERSON_KEY, config_value=[BENCHMARK_OPERATOR])
+        notice_group = NoticeGroup.objects.create(
+            group_name="benchmark", group_member=[BENCHMARK_OPERATOR], notice_config=[]
+        )
+        strategies = [
+            Strategy(
+                namespace=settings.DEFAULT_NAMESPACE,
+                strategy_name=f"benchmark_{index}",
+                control_id="benchmark",
+                control_version=1,
+                notice_groups=[notice_group.group_id],
+            )
+            for index in range(self.scale.strategies)
+        ]
+        Strategy.objects.bulk_create(strategies)
+        self.strategy_ids = list(Strategy.objects.filter(control_id="benchmark").values_list("strategy_id", flat=True))
+        # 规则均不命中，规则匹配为最差情况
+        rules = [
+            RiskRule(
+                name=f"benchmark_{index}",
+                scope=[{"field": "operator", "value": [f"nobody_{index}"], "operator": "="}],
+                version=1,
+                priority_index=index,
+                is_enabled=True,
+            )
+            for index in range(self.scale.rules)
+        ]
+        RiskRule.objects.bulk_create(rules)
+        for rule in RiskRule.objects.filter(name__startswith="benchmark_", rule_id__isnull=True):
+            rule.rule_id = rule.id
+            rule.save(update_fields=["rule_id"])
+
+    def build_events(self) -> List[dict]:
+        now = int(datetime.datetime.now().timestamp() * 1000)
+        # 部分事件重复，用于覆盖更新已有风险的分支
+        raw_event_ids = [uuid.uuid1().hex for _ in range(max(self.scale.events * 4 // 5, 1))]
+        return [
+            {
+                "event_id": uuid.uuid1().hex,
+                "event_content": f"benchmark event {index}",
+                "raw_event_id": self.random.choice(raw_event_ids),
+                "strategy_id": self.random.choice(self.strategy_ids),
+                "event_evidence": "[]",
+                "event_type": "benchmark,SuperPermission",
+                "event_data": {"username": f"user_{self.random.randint(1, 100)}", "index": index},
+                "event_time": now - self.random.randint(0, 3600 * 1000),
+                "event_source": "benchmark",
+                "operator": f"user_{self.random.randint(1, 100)}",
+            }
+            for index in range(self.scale.events)
+        ]
+
+    def run_add_event(self, events: List[dict]) -> None:
+        handler = EventHandler()
+        batch_size = 100
+        for index in range(0, len(events), batch_size):
+            batch = events[index : index + batch_size]
+            with self.stage("add_event").measure(items=len(batch)):
+                handler.add_event(batch)
+
+    def run_generate_risk(self) -> None:
+        recorder = self.stage("create_risk")
+        origin_create_risk = RiskHandler.create_risk
+
+        def create_risk(handler, event):
+            with recorder.measure():
+                return origin_create_risk(handler, event)
+
+        with mock.patch.object(RiskHandler, "create_risk", create_risk):
+            with self.stage("generate_risk_from_event").measure(items=len(self.es.documents)):
+                RiskHandler().generate_risk_from_event()
+
+    def run_match_rule(self, risk_ids: List[str]) -> None:
+        for risk_id in risk_ids:
+            with self.stage("match_rule").measure():
+                RiskRuleHandler(risk_id).bind_rule()
+
+    def run_flow(self, risk_ids: List[str]) -> None:
+        for risk_id in risk_ids:
+            with self.stage("risk_flow").measure():
+                NewRisk(risk_id=risk_id, operator=BENCHMARK_OPERATOR).run()
+
+    def run(self) -> dict:
+        with self.stand_ins():
+            self.prepare()
+            events = self.build_events()
+            self.run_add_event(events)
+            self.run_generate_risk()
+            risk_ids = list(
+                Risk.objects.filter(event_source="benchmark", status=RiskStatus.NEW).values_list("risk_id", flat=True)
+            )
+            self.run_match_rule(risk_ids)
+            self.run_flow(risk_ids)
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "scale": asdict(self.scale),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "stages": {name: recorder.to_json() for name, recorder in self.stages.items()},
+        }
+
+
+def compare_with_baseline(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    与基线对比，返回性能回退的描述
+    p95 耗时超过容忍范围 或 单条查询数增加 视为回退
+    """
+
+    regressions = []
+    for name, base in baseline.get("stages", {}).items():
+        current = report["stages"].get(name)
+        if current is None:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["queries_per_item"] > base["queries_per_item"]:
+            regressions.append(f"{name}: queries/item {base['queries_per_item']} -> {current['queries_per_item']}")
+    return regressions
+
+
+def dump_report(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
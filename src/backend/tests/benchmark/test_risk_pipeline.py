@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+# BKAPP_RUN_BENCHMARK=1 pytest tests/benchmark/test_risk_pipeline.py
+# 可选参数:
+#   BKAPP_BENCHMARK_EVENTS / BKAPP_BENCHMARK_STRATEGIES / BKAPP_BENCHMARK_RULES 数据规模
+#   BKAPP_BENCHMARK_OUTPUT 报告输出路径
+#   BKAPP_BENCHMARK_BASELINE 基线报告路径，存在时与基线对比
+#   BKAPP_BENCHMARK_TOLERANCE 耗时容忍比例
+
+import os
+import unittest
+
+from tests.base import TestCase
+from tests.benchmark.risk_pipeline import (
+    DEFAULT_TOLERANCE,
+    BenchmarkScale,
+    RiskPipelineBenchmark,
+    compare_with_baseline,
+    dump_report,
+    load_report,
+)
+
+
+@unittest.skipUnless(os.getenv("BKAPP_RUN_BENCHMARK"), "set BKAPP_RUN_BENCHMARK to run benchmark")
+class RiskPipelineBenchmarkTest(TestCase):
+    def test_risk_pipeline(self):
+        report = RiskPipelineBenchmark(BenchmarkScale.from_env()).run()
+        dump_report(report, os.getenv("BKAPP_BENCHMARK_OUTPUT", "risk_pipeline_benchmark.json"))
+
+        for stage in ["add_event", "generate_risk_from_event", "create_risk", "match_rule", "risk_flow"]:
+            self.assertIn(stage, report["stages"])
+
+        baseline_path = os.getenv("BKAPP_BENCHMARK_BASELINE")
+        if not baseline_path:
+            return
+        tolerance = float(os.getenv("BKAPP_BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE))
+        regressions = compare_with_baseline(report, load_report(baseline_path), tolerance)
+        self.assertFalse(regressions, "\n".join(regressions))
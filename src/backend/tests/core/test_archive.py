@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import io
+import json
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from apps.notice.archive import NoticeLogArchivePolicy
+from apps.notice.models import NoticeLog, NoticeLogArchive
+from core.archive import ArchiveHandler
+from tests.base import TestCase
+
+
+@override_settings(NOTICE_LOG_RETENTION_DAYS=0, NOTICE_AGG_MINUTES=0)
+class ArchiveHandlerTest(TestCase):
+    def setUp(self) -> None:
+        for index in range(5):
+            NoticeLog.objects.create(msg_type="rtx", title=str(index), md5=str(index), send_at=index, receivers=[])
+
+    def test_run(self):
+        """ArchiveHandler.run"""
+        handler = ArchiveHandler(NoticeLogArchivePolicy(), batch_size=2, sleep_seconds=0)
+        result = handler.run()
+        self.assertEqual(result["archived"], 5)
+        self.assertEqual(result["batches"], 3)
+        self.assertFalse(NoticeLog.objects.exists())
+        self.assertEqual(NoticeLogArchive.objects.count(), 5)
+
+    def test_max_batches(self):
+        """ArchiveHandler.max_batches"""
+        handler = ArchiveHandler(NoticeLogArchivePolicy(), batch_size=2, sleep_seconds=0, max_batches=2)
+        result = handler.run()
+        self.assertEqual(result["archived"], 4)
+        self.assertEqual(result["batches"], 2)
+        # 按发送时间从早到晚归档
+        self.assertEqual(list(NoticeLog.objects.values_list("send_at", flat=True)), [4])
+        self.assertEqual(handler.count(), 1)
+
+    def test_dry_run(self):
+        """BaseArchiveCommand --dry-run"""
+        stdout = io.StringIO()
+        call_command("archive_notice_log", "--dry-run", stdout=stdout)
+        self.assertEqual(json.loads(stdout.getvalue())["candidates"], 5)
+        self.assertEqual(NoticeLog.objects.count(), 5)
+        self.assertFalse(NoticeLogArchive.objects.exists())
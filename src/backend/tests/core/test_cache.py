@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from core.utils.cache import using_cache
+from core.utils.metrics import metrics
+from tests.base import TestCase
+
+
+class UsingCacheTest(TestCase):
+    def setUp(self) -> None:
+        local_cache = LocMemCache("using_cache", {})
+        self.patchers = [
+            mock.patch("core.utils.cache.cache", local_cache),
+            mock.patch("core.utils.lock.cache", local_cache),
+            mock.patch("core.utils.lock.get_redis_client", return_value=None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        metrics.reset()
+
+    def tearDown(self) -> None:
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_serializer_and_compress(self):
+        calls = []
+
+        @using_cache("test:compress:{0}", duration=60, serializer="pickle", compress_threshold=16)
+        def load(name):
+            calls.append(name)
+            return {"name": name, "items": {1, 2, 3}, "content": "a" * 100}
+
+        self.assertEqual(load("demo"), load("demo"))
+        self.assertEqual(load("demo")["items"], {1, 2, 3})
+        self.assertEqual(calls, ["demo"])
+        self.assertEqual(metrics.snapshot("cache_hit")["test:compress:{0}"], 2)
+
+    def test_negative_cache(self):
+        calls = []
+
+        @using_cache("test:negative:{0}", duration=60)
+        def load_without_negative(name):
+            calls.append(name)
+            return []
+
+        @using_cache("test:negative:{0}:cached", duration=60, negative_duration=60)
+        def load_with_negative(name):
+            calls.append(name)
+            return []
+
+        load_without_negative("a")
+        load_without_negative("a")
+        load_with_negative("b")
+        load_with_negative("b")
+        self.assertEqual(calls, ["a", "a", "b"])
+
+    def test_single_flight(self):
+        calls = []
+
+        @using_cache("test:single_flight", duration=60)
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"result": True}
+
+        threads = [threading.Thread(target=load) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_while_revalidate(self):
+        calls = []
+
+        @using_cache("test:stale", duration=0.1, stale_duration=60)
+        def load():
+            calls.append(1)
+            return {"version": len(calls)}
+
+        self.assertEqual(load(), {"version": 1})
+        time.sleep(0.2)
+        # 过期后由当前调用方重新计算
+        self.assertEqual(load(), {"version": 2})
+        self.assertEqual(load(), {"version": 2})
+        self.assertEqual(metrics.snapshot("cache_stale")["test:stale"], 1)
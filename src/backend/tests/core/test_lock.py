@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import os
+import threading
+import time
+from unittest import mock
+
+import fakeredis
+
+from core.utils.lock import RedisLock, TaskLease
+from core.utils.metrics import metrics
+from core.utils.tools import single_task_cache_key, single_task_decorator
+from tests.base import TestCase
+
+
+class RedisLockTest(TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        metrics.reset()
+
+    def _client(self):
+        return fakeredis.FakeStrictRedis(server=self.server, decode_responses=True)
+
+    def test_release_only_by_owner(self):
+        first = RedisLock("test_lock", ttl=1, client=self._client())
+        self.assertTrue(first.acquire(0))
+        second = RedisLock("test_lock", ttl=1, client=self._client())
+        self.assertFalse(second.acquire(0))
+        # 第一个持有者的锁过期后由第二个持有者获取，第一个持有者不能再删除
+        time.sleep(1.1)
+        self.assertTrue(second.acquire(0))
+        self.assertFalse(first.release())
+        self.assertTrue(self._client().get(second.key))
+        self.assertTrue(second.release())
+        self.assertFalse(self._client().get(second.key))
+
+    def test_auto_renewal(self):
+        lock = RedisLock("test_lock", ttl=1, auto_renewal=True, client=self._client())
+        self.assertTrue(lock.acquire(0))
+        time.sleep(1.5)
+        self.assertTrue(self._client().get(lock.key))
+        self.assertTrue(lock.release())
+
+    def test_contention(self):
+        state = {"running": 0, "max_running": 0, "order": []}
+
+        def worker(index):
+            lock = RedisLock("test_lock", ttl=5, client=self._client())
+            self.assertTrue(lock.acquire(20))
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+            state["order"].append(index)
+            time.sleep(0.05)
+            state["running"] -= 1
+            lock.release()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(state["max_running"], 1)
+        # 按等待先后获取锁
+        self.assertEqual(state["order"], list(range(8)))
+        self.assertEqual(metrics.snapshot("lock_hold_seconds")["test_lock"]["count"], 8)
+        self.assertEqual(self._client().keys("*"), [])
+
+
+class TaskLeaseTest(TestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+
+    def _client(self):
+        return fakeredis.FakeStrictRedis(server=self.server, decode_responses=True)
+
+    def test_inspect_and_force_release(self):
+        lease = TaskLease("test_task_running_key", client=self._client())
+        self.assertTrue(lease.acquire(0))
+        info = TaskLease("test_task_running_key", client=self._client()).inspect()
+        self.assertEqual(info["owner"]["pid"], os.getpid())
+        self.assertGreater(info["ttl"], 0)
+        # 持有期间其他进程无法获取
+        self.assertFalse(TaskLease("test_task_running_key", client=self._client()).acquire(0))
+        self.assertTrue(TaskLease("test_task_running_key", client=self._client()).force_release())
+        self.assertIsNone(lease.inspect())
+        self.assertFalse(lease.release())
+
+    def test_single_task_decorator(self):
+        calls = []
+        client = self._client()
+
+        @single_task_decorator
+        def demo_task():
+            calls.append(1)
+            # 运行期间再次触发会被跳过
+            demo_task()
+
+        with mock.patch("core.utils.lock.get_redis_client", return_value=client):
+            demo_task()
+            self.assertEqual(calls, [1])
+            self.assertIsNone(TaskLease(single_task_cache_key(demo_task)).inspect())
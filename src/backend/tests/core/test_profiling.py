@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.middleware.profiling import RequestProfilingMiddleware
+from core.profiling import (
+    ProfilingConfig,
+    get_current_profile,
+    get_profile_record,
+    list_profile_records,
+    profiling_config,
+)
+from core.utils.metrics import metrics
+from tests.base import TestCase
+
+
+class RequestProfilingMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.cache_patcher = mock.patch("core.profiling.cache", LocMemCache("request_profiling", {}))
+        self.cache_patcher.start()
+        metrics.reset()
+
+    def tearDown(self) -> None:
+        profiling_config.set(ProfilingConfig())
+        self.cache_patcher.stop()
+
+    @staticmethod
+    def view(request):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.execute("SELECT 2")
+        profile = get_current_profile()
+        if profile is not None:
+            profile.record_resource("api.bk_log.default.SearchLog", 0.01)
+        return HttpResponse("ok")
+
+    def _request(self, username: str, **extra):
+        request = RequestFactory().get("/", **extra)
+        request.user = mock.Mock(username=username, is_superuser=False)
+        return RequestProfilingMiddleware(self.view)(request)
+
+    def test_disabled(self):
+        self._request("admin")
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_enabled(self):
+        profiling_config.set(ProfilingConfig(enabled=True))
+        response = self._request("admin")
+        self.assertNotIn("X-Bkaudit-Profile-Id", response)
+        self.assertEqual(metrics.snapshot("request_sql_count")["unknown"]["sum"], 2)
+        self.assertEqual(metrics.snapshot("request_api_count")["unknown"]["sum"], 1)
+        self.assertEqual(metrics.snapshot("request_latency_ms")["unknown"]["count"], 1)
+
+    def test_profile_user(self):
+        profiling_config.set(ProfilingConfig(enabled=True, profile_users=["admin"]))
+        self._request("other", HTTP_X_BKAUDIT_PROFILE="1")
+        self.assertEqual(list_profile_records(), [])
+        response = self._request("admin")
+        record = get_profile_record(response["X-Bkaudit-Profile-Id"])
+        self.assertEqual(record["sql_count"], 2)
+        self.assertEqual(record["resources"]["api.bk_log.default.SearchLog"]["count"], 1)
+        self.assertTrue(record["text"])
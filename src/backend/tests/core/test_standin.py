@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from http import HTTPStatus
+
+from django.test import override_settings
+
+from api.bk_base.default import DatabusCleansPost, DatabusCleansPut
+from api.bk_itsm.default import CreateTicket
+from api.bk_log.default import EsQueryScroll, EsQuerySearchResource
+from api.standin.server import StandInRoute, StandInRouter
+from tests.base import TestCase
+
+STANDIN_URL = "http://127.0.0.1:8787"
+
+
+def build_route(module: str, resource_class, api_name: str) -> StandInRoute:
+    resource_class = type(resource_class.__name__, (resource_class,), {"base_url": f"{STANDIN_URL}/apigw/{api_name}"})
+    return StandInRoute(module, resource_class)
+
+
+@override_settings(
+    API_STANDIN_URL=STANDIN_URL,
+    API_STANDIN_PROFILE={"latency": 0, "jitter": 0, "error_rate": 0, "timeout_rate": 0, "es_total": 25},
+    API_STANDIN_MODULE_PROFILES={"bk_itsm": {"error_rate": 1}},
+)
+class StandInRouterTest(TestCase):
+    def setUp(self) -> None:
+        self.router = StandInRouter(
+            [
+                build_route("bk_base", DatabusCleansPost, "bk-data"),
+                build_route("bk_base", DatabusCleansPut, "bk-data"),
+                build_route("bk_log", EsQuerySearchResource, "log-search"),
+                build_route("bk_log", EsQueryScroll, "log-search"),
+                build_route("bk_itsm", CreateTicket, "bk-itsm"),
+            ]
+        )
+
+    def test_dispatch(self) -> None:
+        status, body = self.router.dispatch(
+            "POST", "/apigw/bk-data/v3/databus/cleans/", {"bk_biz_id": 2, "result_table_name": "demo"}
+        )
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(body["data"], {"processing_id": "2_demo", "result_table_id": "2_demo"})
+        # 未配置响应的接口返回空数据
+        status, body = self.router.dispatch("PUT", "/apigw/bk-data/v3/databus/cleans/2_demo/", {})
+        self.assertEqual((status, body["data"]), (HTTPStatus.OK, {}))
+        status, _ = self.router.dispatch("GET", "/apigw/bk-data/v3/databus/cleans/", {})
+        self.assertEqual(status, HTTPStatus.NOT_FOUND)
+
+    def test_es_scroll(self) -> None:
+        _, body = self.router.dispatch("POST", "/apigw/log-search/esquery_search/", {"size": 10, "scroll": "1m"})
+        self.assertEqual(body["data"]["hits"]["total"], 25)
+        scroll_id = body["data"]["_scroll_id"]
+        counts = [len(body["data"]["hits"]["hits"])]
+        while counts[-1]:
+            _, body = self.router.dispatch("POST", "/apigw/log-search/esquery_scroll/", {"scroll_id": scroll_id})
+            counts.append(len(body["data"]["hits"]["hits"]))
+        self.assertEqual(counts, [10, 10, 5, 0])
+
+    def test_error_profile(self) -> None:
+        status, body = self.router.dispatch("POST", "/apigw/bk-itsm/v2/itsm/create_ticket/", {})
+        self.assertEqual(status, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertFalse(body["result"])
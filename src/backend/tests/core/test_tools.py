@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import copy
+
+from core.utils.tools import (
+    compile_json_path,
+    drop_dict_item_by_path,
+    expand_json,
+    modify_dict_by_path,
+)
+from tests.base import TestCase
+from tests.benchmark.json_path import (
+    SENSITIVE_PATHS,
+    build_audit_events,
+    legacy_drop_dict_item_by_path,
+    legacy_expand_json,
+    legacy_modify_dict_by_path,
+)
+
+
+class JsonPathTest(TestCase):
+    def setUp(self) -> None:
+        self.events = build_audit_events(count=200)
+        self.events.extend(
+            [
+                {},
+                {"a": {"b": {"c": 1}}, "a/b": {"d": 2}},
+                {"a": {"b": None, "c": {}}, "x": "y"},
+                {"a": {"b": "string"}},
+            ]
+        )
+
+    def test_expand_json(self):
+        for level in range(1, 5):
+            for event in self.events:
+                self.assertEqual(expand_json(event, level), legacy_expand_json(event, level))
+
+    def test_modify_dict_by_path(self):
+        paths = [path.split(".") for path in SENSITIVE_PATHS] + [["a", "b"], ["a", "c", "d"], ["new", "value"]]
+        for event in self.events:
+            for path in paths:
+                for auto_create in [True, False]:
+                    expected = legacy_modify_dict_by_path(copy.deepcopy(event), path, "******", auto_create)
+                    self.assertEqual(modify_dict_by_path(copy.deepcopy(event), path, "******", auto_create), expected)
+
+    def test_drop_dict_item_by_path(self):
+        paths = [path.split(".") for path in SENSITIVE_PATHS] + [["a", "b"], ["a", "c", "d"], ["x"]]
+        for event in self.events:
+            for path in paths:
+                expected = legacy_drop_dict_item_by_path(copy.deepcopy(event), path, None)
+                self.assertEqual(drop_dict_item_by_path(copy.deepcopy(event), path, None), expected)
+                self.assertEqual(compile_json_path(".".join(path)).drop(copy.deepcopy(event)), expected)
@@ -21,12 +21,23 @@ from unittest import mock
 from apps.exceptions import JoinDataPreCheckFailed, SnapshotPreparingException
 from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig, ResourceType, System
+from services.web.databus.collector.join.base import JoinDataHandler
+from services.web.databus.collector.join.etl_storage import JoinDataEtlStorageHandler
+from services.web.databus.collector.join.http_pull import HttpPullHandler
 from services.web.databus.constants import (
     COLLECTOR_PLUGIN_ID,
     DEFAULT_STORAGE_CONFIG_KEY,
     ContainerCollectorType,
+    SnapshotProvisionStatusChoices,
+    SnapshotProvisionStepChoices,
+    SnapshotRunningStatus,
+)
+from services.web.databus.models import (
+    CollectorConfig,
+    CollectorPlugin,
+    Snapshot,
+    SnapshotProvisionStep,
 )
-from services.web.databus.models import CollectorConfig, CollectorPlugin
 from tests.base import TestCase
 from tests.databus.collector.constants import (
     API_BK_LOG_GET_COLLECTOR_DATA,
@@ -245,3 +256,35 @@ class CollectorTest(TestCase):
         """EtlFieldHistory"""
         result = self.resource.databus.collector.etl_field_history(collector_config_id=COLLECTOR_ID)
         self.assertEqual(result, ETL_FIELD_HISTORY_RESULT)
+
+    @mock.patch("services.web.databus.collector.join.base.ErrorMsgHandler", mock.Mock())
+    @mock.patch.object(HttpPullHandler, "update_or_create", mock.Mock(return_value=1))
+    @mock.patch.object(JoinDataEtlStorageHandler, "start_clean", mock.Mock())
+    @mock.patch.object(JoinDataHandler, "update_log_clean_link", mock.Mock())
+    def test_start_snapshot_resume(self):
+        """JoinDataHandler 失败后从未完成的步骤继续"""
+        snapshot = Snapshot.objects.create(
+            system_id=self.system_id, resource_type_id=RESOURCE_TYPE_ID, status=SnapshotRunningStatus.PREPARING.value
+        )
+        create_clean = mock.Mock(return_value={"processing_id": "p_1", "result_table_id": "rt_1"})
+        create_storage = mock.Mock(side_effect=[Exception("storage failed"), None])
+        with mock.patch.object(JoinDataEtlStorageHandler, "create_clean", create_clean), mock.patch.object(
+            JoinDataEtlStorageHandler, "create_storage", create_storage
+        ):
+            JoinDataHandler(self.system_id, RESOURCE_TYPE_ID).start()
+            snapshot.refresh_from_db()
+            self.assertEqual(snapshot.status, SnapshotRunningStatus.FAILED.value)
+            self.assertIsNone(snapshot.bkbase_table_id)
+            self.assertEqual(
+                SnapshotProvisionStep.objects.get(
+                    snapshot_id=snapshot.id, step=SnapshotProvisionStepChoices.STORAGE.value
+                ).status,
+                SnapshotProvisionStatusChoices.FAILED.value,
+            )
+            JoinDataHandler(self.system_id, RESOURCE_TYPE_ID).start()
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.status, SnapshotRunningStatus.RUNNING.value)
+        self.assertEqual(snapshot.bkbase_table_id, "rt_1")
+        self.assertEqual(create_clean.call_count, 1)
+        self.assertEqual(create_storage.call_count, 2)
+        self.assertFalse(SnapshotProvisionStep.objects.filter(snapshot_id=snapshot.id).exists())
@@ -24,7 +24,9 @@ from core.utils.tools import ordered_dict_to_json
 from services.web.databus.constants import (
     DEFAULT_STORAGE_CONFIG_KEY,
     INDEX_SET_CONFIG_KEY,
+    BkBaseConfigTypeChoices,
 )
+from services.web.databus.fingerprint import ConfigFingerprint
 from services.web.databus.models import CollectorPlugin
 from services.web.entry.init.base import SystemInitHandler
 from tests.base import TestCase
@@ -127,3 +129,17 @@ class CollectorPluginTest(TestCase):
             item.pop("updated_by", None)
             result.append(item)
         self.assertEqual(ordered_dict_to_json(result), GET_PLUGIN_LIST_DATA)
+
+    def test_config_fingerprint(self):
+        """ConfigFingerprint"""
+        push = mock.Mock()
+        clean_type = BkBaseConfigTypeChoices.CLEAN.value
+        config = {"fields": [{"field_name": "a"}], "json_config": '{"b": 1, "a": 2}'}
+        self.assertTrue(ConfigFingerprint.push("rt", clean_type, config, push))
+        # 键顺序不同视为相同配置
+        same_config = {"json_config": '{"a": 2, "b": 1}', "fields": [{"field_name": "a"}]}
+        self.assertFalse(ConfigFingerprint.push("rt", clean_type, same_config, push))
+        self.assertTrue(ConfigFingerprint.push("rt", clean_type, same_config, push, force=True))
+        self.assertTrue(ConfigFingerprint.push("rt", clean_type, {**config, "fields": []}, push))
+        self.assertEqual(push.call_count, 3)
+        self.assertEqual(ConfigFingerprint.skipped_stats(), {clean_type: 1})
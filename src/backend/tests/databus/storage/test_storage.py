@@ -18,15 +18,20 @@ to the current version of the project delivered to anyone in the future.
 
 from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from apps.exceptions import StorageChanging
 from core.utils.tools import ordered_dict_to_json
 from services.web.databus.models import StorageOperateLog
+from services.web.databus.storage.handler.inventory import StorageInventory
 from tests.base import TestCase
 from tests.databus.collector_plugin.constants import (
     CREATE_PLUGIN_DATA as CREATE_PLUGIN_API_RESP,
 )
 from tests.databus.storage.constants import (
     CACHE_API_RESP,
+    CLUSTER_ID,
     CREATE_OR_UPDATE_REDIS_DATA,
     CREATE_OR_UPDATE_REDIS_PARAMS,
     CREATE_STORAGE_API_RESP,
@@ -90,3 +95,46 @@ class StorageTest(TestCase):
         result.pop("redis_id", None)
         result.pop("is_deleted", None)
         self.assertEqual(result, CREATE_OR_UPDATE_REDIS_DATA)
+
+
+class StorageInventoryTest(TestCase):
+    def test_load_operate_logs(self):
+        """StorageInventory.load_operate_logs"""
+        for cluster_id in [CLUSTER_ID, CLUSTER_ID + 1, CLUSTER_ID + 2]:
+            for operator in ["creator", "updater"]:
+                StorageOperateLog.objects.create(cluster_id=cluster_id, operator=operator)
+        inventory = StorageInventory(namespace="default")
+        with CaptureQueriesContext(connection) as queries:
+            logs = inventory.load_operate_logs([CLUSTER_ID, CLUSTER_ID + 1, CLUSTER_ID + 2, CLUSTER_ID + 3])
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(logs), 3)
+        self.assertEqual([log.operator for log in logs[CLUSTER_ID]], ["creator", "updater"])
+
+    @mock.patch("databus.storage.handler.inventory.api.bk_log.get_storages")
+    def test_load_clusters(self, get_storages: mock.Mock):
+        """StorageInventory.load_clusters"""
+        get_storages.return_value = GET_STORAGES_API_RESP
+        inventory = StorageInventory(namespace="default")
+        inventory.load_clusters(namespace="default")
+        inventory.load_clusters(namespace="default")
+        self.assertEqual(get_storages.call_count, 1)
+        StorageInventory.invalidate()
+        inventory.load_clusters(namespace="default")
+        self.assertEqual(get_storages.call_count, 2)
+        # 不同用户不共享缓存
+        with mock.patch("databus.storage.handler.inventory.get_request_username", return_value="other"):
+            inventory.load_clusters(namespace="default")
+        self.assertEqual(get_storages.call_count, 3)
+
+    @mock.patch("databus.storage.handler.inventory.api.bk_log.batch_connectivity_detect")
+    def test_probe(self, batch_connectivity_detect: mock.Mock):
+        """StorageInventory.probe"""
+
+        def detect(cluster_ids: str, **kwargs) -> dict:
+            if cluster_ids == "3":
+                raise Exception()
+            return {cluster_ids: cluster_ids == "1"}
+
+        batch_connectivity_detect.side_effect = detect
+        self.assertEqual(StorageInventory.probe([1, 2, 3]), {"1": True, "2": False, "3": False})
+        self.assertEqual(batch_connectivity_detect.call_count, 3)
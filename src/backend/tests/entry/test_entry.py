@@ -20,7 +20,13 @@ from uuid import uuid1
 
 from bkcrypto.contrib.django.ciphers import get_asymmetric_cipher
 
-from apps.bk_crypto.crypto import FakeAsymmetricCipher, asymmetric_cipher
+from apps.bk_crypto.crypto import (
+    AsymmetricCipher,
+    FakeAsymmetricCipher,
+    LazyAsymmetricCipher,
+    asymmetric_cipher,
+)
+from apps.bk_crypto.field import FieldEncryptor
 from tests.base import TestCase
 
 
@@ -52,3 +58,72 @@ class EntryTest(TestCase):
         decrypt_text: str = cipher.decrypt(encrypt_text)
         self.assertEquals(random_text, decrypt_text)
         self.assertTrue(cipher.verify(plaintext=random_text, signature=cipher.sign(random_text)))
+
+    def test_lazy_crypto(self) -> None:
+        """测试延迟加载及密钥轮换"""
+
+        class Provider(AsymmetricCipher):
+            key_stamp = "v1"
+            load_count = 0
+
+            def use_fake_cipher(self) -> bool:
+                return False
+
+            def get_private_key_stamp(self) -> str:
+                return self.key_stamp
+
+            def build_cipher(self, private_key_stamp: str) -> FakeAsymmetricCipher:
+                self.load_count += 1
+                return FakeAsymmetricCipher()
+
+        provider = Provider()
+        cipher = LazyAsymmetricCipher(provider=provider, check_interval=0)
+        self.assertFalse(cipher.is_loaded)
+        self.assertEquals(cipher.encrypt("text"), "text")
+        cipher.decrypt("text")
+        self.assertEquals(provider.load_count, 1)
+        provider.key_stamp = "v2"
+        cipher.encrypt("text")
+        self.assertEquals(provider.load_count, 2)
+        cipher.reload()
+        self.assertFalse(cipher.is_loaded)
+
+    def test_field_encryptor(self) -> None:
+        """测试字段批量加密"""
+
+        class CountingCipher(FakeAsymmetricCipher):
+            encrypt_count = 0
+
+            def encrypt(self, plaintext: str) -> str:
+                self.encrypt_count += 1
+                return f"encrypted:{plaintext}"
+
+        class Provider(AsymmetricCipher):
+            key_stamp = "v1"
+
+            def use_fake_cipher(self) -> bool:
+                return False
+
+            def get_private_key_stamp(self) -> str:
+                return self.key_stamp
+
+            def build_cipher(self, private_key_stamp: str) -> CountingCipher:
+                return CountingCipher()
+
+        provider = Provider()
+        cipher = LazyAsymmetricCipher(provider=provider, check_interval=0)
+        encryptor = FieldEncryptor(cipher=cipher, max_size=2)
+        users = [{"username": "admin", "display_name": "admin"}, {"username": "admin", "display_name": "guest"}]
+        batch = encryptor.batch()
+        for user in users:
+            batch.add(user)
+        batch.flush()
+        self.assertEquals(users[1], {"username": "encrypted:admin", "display_name": "encrypted:guest"})
+        self.assertEquals(cipher.encrypt_count, 2)
+        # 命中缓存
+        self.assertEquals(encryptor.encrypt("admin"), "encrypted:admin")
+        self.assertEquals(cipher.encrypt_count, 2)
+        # 密钥轮换后重新加密
+        provider.key_stamp = "v2"
+        encryptor.encrypt("admin")
+        self.assertEquals(cipher.encrypt_count, 1)
@@ -94,3 +94,27 @@ FIELD_MAP_DATA = {
     ],
     "result_code": [{"id": "0", "name": gettext_lazy("成功")}, {"id": "-1", "name": gettext_lazy("其他")}],
 }
+
+# Export
+EXPORT_ES_QUERY_API_RESP = {
+    "hits": {
+        "total": 3,
+        "hits": [
+            {"_source": {"event_id": "1", "extend_data": '{"key": "value"}'}},
+            {"_source": {"event_id": "2", "extend_data": "{}"}},
+        ],
+    },
+    "_scroll_id": "scroll_id",
+}
+EXPORT_ES_SCROLL_API_RESP = [
+    {"hits": {"hits": [{"_source": {"event_id": "3", "extend_data": "{}"}}]}, "_scroll_id": "scroll_id"},
+    {"hits": {"hits": []}, "_scroll_id": "scroll_id"},
+]
+EXPORT_PARAMS = {"namespace": settings.DEFAULT_NAMESPACE}
+EXPORT_FIELDS = ["event_id", "extend_data"]
+EXPORT_CSV_DATA = '\ufeffevent_id,extend_data\r\n1,"{""key"": ""value""}"\r\n2,{}\r\n3,{}\r\n'
+EXPORT_NDJSON_DATA = (
+    '{"event_id": "1", "extend_data": {"key": "value"}}\n'
+    '{"event_id": "2", "extend_data": {}}\n'
+    '{"event_id": "3", "extend_data": {}}\n'
+)
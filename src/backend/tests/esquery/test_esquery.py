@@ -16,13 +16,29 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import contextlib
+import os
+import tempfile
+import time
 from unittest import mock
 
 from core.exceptions import PermissionException
 from services.web.databus.models import CollectorPlugin
+from services.web.esquery.constants import ExportFormatChoices, ExportStatusChoices
+from services.web.esquery.utils.exporter import (
+    ExportProgress,
+    SearchExporter,
+    clean_expired_export_files,
+)
 from tests.base import TestCase
 from tests.esquery.constants import (
     ES_QUERY_SEARCH_API_RESP,
+    EXPORT_CSV_DATA,
+    EXPORT_ES_QUERY_API_RESP,
+    EXPORT_ES_SCROLL_API_RESP,
+    EXPORT_FIELDS,
+    EXPORT_NDJSON_DATA,
+    EXPORT_PARAMS,
     FIELD_MAP_DATA,
     FIELD_MAP_PARAMS,
     GET_AUTH_SYSTEMS_API_RESP,
@@ -57,3 +73,77 @@ class EsQueryTest(TestCase):
         """FieldMapResource"""
         result = self.resource.esquery.field_map(**FIELD_MAP_PARAMS)
         self.assertEqual(result, FIELD_MAP_DATA)
+
+    def _build_exporter(self, export_format: str, cancel: bool = False) -> SearchExporter:
+        progress = ExportProgress.create(username="admin", export_format=export_format)
+        if cancel:
+            progress.cancel()
+        return SearchExporter(
+            search_params=EXPORT_PARAMS, export_format=export_format, progress=progress, fields=EXPORT_FIELDS
+        )
+
+    def _patch_search(self) -> contextlib.ExitStack:
+        stack = contextlib.ExitStack()
+        stack.enter_context(
+            mock.patch(
+                "services.web.esquery.utils.exporter.resource.esquery.es_query",
+                mock.Mock(return_value=EXPORT_ES_QUERY_API_RESP),
+            )
+        )
+        stack.enter_context(
+            mock.patch(
+                "services.web.esquery.utils.exporter.api.bk_log.es_query_scroll",
+                mock.Mock(side_effect=EXPORT_ES_SCROLL_API_RESP),
+            )
+        )
+        stack.enter_context(mock.patch("services.web.esquery.utils.exporter.SearchExporter.indices", "index"))
+        stack.enter_context(mock.patch("services.web.esquery.utils.exporter.SearchExporter.storage_cluster_id", 1))
+        return stack
+
+    def _export(self, export_format: str, cancel: bool = False) -> (str, dict):
+        exporter = self._build_exporter(export_format, cancel=cancel)
+        with self._patch_search():
+            content = "".join(exporter.stream())
+        return content, exporter.progress.get()
+
+    def test_export_csv(self):
+        """SearchExporter"""
+        content, progress = self._export(ExportFormatChoices.CSV.value)
+        self.assertEqual(content, EXPORT_CSV_DATA)
+        self.assertEqual(progress["status"], ExportStatusChoices.SUCCESS.value)
+        self.assertEqual(progress["exported"], 3)
+
+    def test_export_ndjson(self):
+        """SearchExporter"""
+        content, progress = self._export(ExportFormatChoices.NDJSON.value)
+        self.assertEqual(content, EXPORT_NDJSON_DATA)
+
+    def test_export_cancel(self):
+        """SearchExporter"""
+        content, progress = self._export(ExportFormatChoices.NDJSON.value, cancel=True)
+        self.assertEqual(content, "".join(EXPORT_NDJSON_DATA.splitlines(True)[:2]))
+        self.assertEqual(progress["status"], ExportStatusChoices.CANCELLED.value)
+
+    def test_export_closed(self):
+        """SearchExporter"""
+        exporter = self._build_exporter(ExportFormatChoices.NDJSON.value)
+        with self._patch_search():
+            content = exporter.stream()
+            next(content)
+            # 模拟客户端断开连接
+            content.close()
+        self.assertEqual(exporter.progress.get()["status"], ExportStatusChoices.CANCELLED.value)
+
+    def test_clean_export_files(self):
+        """clean_expired_export_files"""
+        with tempfile.TemporaryDirectory() as file_dir:
+            expired_file = os.path.join(file_dir, "expired.csv")
+            fresh_file = os.path.join(file_dir, "fresh.csv")
+            for file_path in [expired_file, fresh_file]:
+                with open(file_path, "w") as file:
+                    file.write("content")
+            expired_at = time.time() - 120
+            os.utime(expired_file, (expired_at, expired_at))
+            removed = clean_expired_export_files(file_dir=file_dir, expire_seconds=60)
+            self.assertEqual(removed, [expired_file])
+            self.assertTrue(os.path.exists(fresh_file))
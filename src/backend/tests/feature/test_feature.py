@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.test import override_settings
+
+from apps.exceptions import FeatureNotExist
+from apps.feature.cache import FeatureToggleCache, feature_toggle_cache
+from apps.feature.constants import FeatureStatusChoices
+from apps.feature.handlers import FeatureHandler
+from apps.feature.models import FeatureToggle
+from tests.base import TestCase
+
+
+@override_settings(FEATURE_TOGGLE={"watermark": FeatureStatusChoices.DENY.value})
+class FeatureTest(TestCase):
+    def setUp(self) -> None:
+        feature_toggle_cache._bump_version()
+
+    def test_feature_cache(self) -> None:
+        """测试特性开关缓存"""
+
+        toggle_cache = FeatureToggleCache(check_interval=0)
+        self.assertEqual(toggle_cache.get("watermark").status, FeatureStatusChoices.DENY.value)
+        self.assertIsNone(toggle_cache.get("not_exist"))
+        # 数据库配置优先
+        FeatureToggle.objects.create(feature_id="watermark", status=FeatureStatusChoices.AVAILABLE.value)
+        toggle_cache._bump_version()
+        self.assertEqual(toggle_cache.get("watermark").status, FeatureStatusChoices.AVAILABLE.value)
+        # 命中缓存时不查询数据库
+        feature_toggle_cache._bump_version()
+        self.assertTrue(FeatureHandler("watermark").check())
+        with self.assertNumQueries(0):
+            self.assertTrue(FeatureHandler("watermark").check())
+        # 返回副本
+        toggle_cache.get("watermark").status = FeatureStatusChoices.DENY.value
+        self.assertEqual(toggle_cache.get("watermark").status, FeatureStatusChoices.AVAILABLE.value)
+
+    def test_feature_not_exist(self) -> None:
+        """测试特性不存在"""
+
+        with self.assertRaises(FeatureNotExist):
+            FeatureHandler("not_exist")
@@ -19,7 +19,15 @@ to the current version of the project delivered to anyone in the future.
 from unittest import mock
 
 from apps.meta.exceptions import BKAppNotExists
-from apps.meta.models import CustomField, Field, ResourceType, System, SystemRole
+from apps.meta.models import (
+    CustomField,
+    DataMap,
+    Field,
+    ResourceType,
+    System,
+    SystemRole,
+)
+from apps.meta.utils.data_map import DataMapTranslator
 from core.utils.tools import ordered_dict_to_json, trans_object_local
 from services.web.databus.models import Snapshot
 from tests.base import TestCase
@@ -306,3 +314,18 @@ class MetaTest(TestCase):
         self.resource.meta.retrieve_user(**RETRIEVE_USER_PARAMS)
         result = self.resource.meta.retrieve_user(**RETRIEVE_USER_PARAMS)
         self.assertEqual(result, RETRIEVE_USER_DATA)
+
+    def test_data_map_translator(self):
+        """DataMapTranslator"""
+        translator = DataMapTranslator(check_interval=0)
+        data_map = DataMap.objects.create(data_field="snapshot_user_info__sex", data_key="1", data_alias="male")
+        data = translator.translate(
+            [{"sex": 1, "age": 18}], ["sex", "age"], build_data_fields=lambda x: f"snapshot_user_info__{x}", many=True
+        )
+        self.assertEqual(data, [{"sex": "male", "age": "18"}])
+        self.assertEqual(translator.get_alias("snapshot_user_info__sex", "2", default="-"), "-")
+        # 变更后重新加载
+        with self.captureOnCommitCallbacks(execute=True):
+            data_map.data_alias = "man"
+            data_map.save()
+        self.assertEqual(translator.get_aliases("snapshot_user_info__sex"), {"1": "man"})
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.test import override_settings
+
+from apps.notice.archive import NoticeLogArchivePolicy
+from apps.notice.handlers import NoticeDigestHandler, NoticeHandler
+from apps.notice.models import (
+    NoticeBuffer,
+    NoticeContent,
+    NoticeContentConfig,
+    NoticeGroup,
+    NoticeLog,
+    NoticeLogArchive,
+)
+from core.archive import ArchiveHandler
+from tests.base import TestCase
+
+
+class FakeCmsi:
+    """
+    本地 bk_cmsi，记录发送内容
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def __getattr__(self, name: str):
+        if not name.startswith("send_"):
+            raise AttributeError(name)
+
+        def sender(**params):
+            self.messages.append((name, params))
+            return {"result": True}
+
+        return sender
+
+
+class NoticeTest(TestCase):
+    def setUp(self) -> None:
+        self.cmsi = FakeCmsi()
+        self.notice_group = NoticeGroup(group_member=["admin"], notice_config=[{"msg_type": "rtx"}])
+
+    def _build_handler(self, title: str, **kwargs) -> NoticeHandler:
+        return NoticeHandler(
+            notice_group=self.notice_group,
+            title=title,
+            content=NoticeContent(NoticeContentConfig(key="risk_id", name="Risk ID", value=title)),
+            cmsi=self.cmsi,
+            **kwargs,
+        )
+
+    def test_send(self):
+        """NoticeHandler.send"""
+        self._build_handler("risk-1").send()
+        self._build_handler("risk-1").send()
+        self.assertEqual(len(self.cmsi.messages), 1)
+        self.assertEqual(NoticeLog.objects.count(), 2)
+        self.assertEqual(NoticeLog.objects.filter(is_duplicate=True).count(), 1)
+
+    @override_settings(NOTICE_DIGEST_SECONDS=60)
+    def test_digest(self):
+        """NoticeDigestHandler.flush"""
+        self._build_handler("risk-1").send()
+        self._build_handler("risk-2").send()
+        self.assertEqual(NoticeBuffer.objects.count(), 2)
+        self.assertEqual(NoticeDigestHandler(cmsi=self.cmsi).flush(), 0)
+        self.assertEqual(NoticeDigestHandler(cmsi=self.cmsi).flush(force=True), 1)
+        self.assertEqual(len(self.cmsi.messages), 1)
+        self.assertIn("risk-2", self.cmsi.messages[0][1]["content"])
+        self.assertEqual(NoticeLog.objects.filter(is_success=True).count(), 2)
+        self.assertFalse(NoticeBuffer.objects.exists())
+
+    @override_settings(NOTICE_DIGEST_SECONDS=60)
+    def test_digest_duplicate(self):
+        """NoticeHandler.send with digest"""
+        self._build_handler("risk-1").send()
+        self._build_handler("risk-1").send()
+        self._build_handler("risk-2").send()
+        self.assertEqual(NoticeDigestHandler(cmsi=self.cmsi).flush(force=True), 1)
+        content = self.cmsi.messages[0][1]["content"]
+        self.assertEqual(content.count("risk-1"), content.count("risk-2"))
+        self.assertEqual(NoticeLog.objects.filter(is_duplicate=True).count(), 1)
+        # 已发送的通知在聚合时间内不再暂存
+        self._build_handler("risk-1").send()
+        self.assertFalse(NoticeBuffer.objects.exists())
+        self.assertEqual(NoticeLog.objects.filter(is_duplicate=True).count(), 2)
+
+    @override_settings(NOTICE_LOG_RETENTION_DAYS=0, NOTICE_AGG_MINUTES=0)
+    def test_archive(self):
+        """NoticeLogArchivePolicy"""
+        self._build_handler("risk-1").send()
+        self._build_handler("risk-2").send()
+        NoticeLog.objects.update(send_at=0)
+        log_ids = set(NoticeLog.objects.values_list("log_id", flat=True))
+        result = ArchiveHandler(NoticeLogArchivePolicy(), batch_size=1, sleep_seconds=0).run()
+        self.assertEqual(result["archived"], 2)
+        self.assertEqual(result["batches"], 2)
+        self.assertFalse(NoticeLog.objects.exists())
+        self.assertEqual(set(NoticeLogArchive.objects.values_list("log_id", flat=True)), log_ids)
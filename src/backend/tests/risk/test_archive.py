@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import time
+
+from django.test import override_settings
+from django.utils import timezone
+
+from core.archive import ArchiveHandler
+from services.web.risk.archive import TicketNodeArchivePolicy
+from services.web.risk.constants import RiskStatus, TicketNodeStatus
+from services.web.risk.handlers.ticket import NewRisk, TransOperator
+from services.web.risk.models import Risk, TicketNode, TicketNodeArchive, TicketTimeline
+from tests.base import TestCase
+
+
+@override_settings(TICKET_NODE_RETENTION_DAYS=30)
+class TicketNodeArchivePolicyTest(TestCase):
+    def setUp(self) -> None:
+        expired_at = timezone.now() - datetime.timedelta(days=60)
+        now = time.time()
+        self.nodes = {}
+        for risk_id, status, last_operate_time in [
+            ("closed_expired", RiskStatus.CLOSED, expired_at),
+            ("closed_recent", RiskStatus.CLOSED, timezone.now()),
+            ("open_expired", RiskStatus.NEW, expired_at),
+        ]:
+            Risk.objects.create(risk_id=risk_id, raw_event_id=risk_id, strategy_id=1, event_time=expired_at)
+            self.nodes[risk_id] = [
+                self.create_node(risk_id, NewRisk.__name__, now, TicketNodeStatus.FINISHED),
+                self.create_node(risk_id, TransOperator.__name__, now + 1, TicketNodeStatus.RUNNING),
+            ]
+            # last_operate_time 为 auto_now，需通过 update 修改
+            Risk.objects.filter(risk_id=risk_id).update(status=status, last_operate_time=last_operate_time)
+
+    def create_node(self, risk_id: str, action: str, timestamp: float, status: str) -> TicketNode:
+        return TicketNode.objects.create(
+            risk_id=risk_id, operator="admin", action=action, timestamp=timestamp, time="", status=status
+        )
+
+    def test_candidates(self):
+        """TicketNodeArchivePolicy.candidates"""
+        self.assertEqual(list(TicketNodeArchivePolicy().candidates()), [self.nodes["closed_expired"][0].id])
+
+    def test_load_archived_history(self):
+        """TicketNode.load_history"""
+        finished, running = self.nodes["closed_expired"]
+        result = ArchiveHandler(TicketNodeArchivePolicy(), sleep_seconds=0).run()
+        self.assertEqual(result["archived"], 1)
+        self.assertFalse(TicketNode.objects.filter(id=finished.id).exists())
+        self.assertTrue(TicketNodeArchive.objects.filter(id=finished.id).exists())
+        history = TicketNode.load_history("closed_expired")
+        self.assertEqual([node.id for node in history], [finished.id, running.id])
+        self.assertIsInstance(history[0], TicketNodeArchive)
+
+    def test_last_history_archived(self):
+        """Risk.last_history"""
+        finished, running = self.nodes["closed_expired"]
+        running.delete()
+        ArchiveHandler(TicketNodeArchivePolicy(), sleep_seconds=0).run()
+        # 经由时间线定位
+        TicketTimeline.objects.filter(risk_id="closed_expired").update(last_node_id=finished.id)
+        self.assertEqual(Risk.objects.get(risk_id="closed_expired").last_history.id, finished.id)
+        # 无时间线时回查归档表
+        TicketTimeline.objects.filter(risk_id="closed_expired").delete()
+        self.assertEqual(Risk.objects.get(risk_id="closed_expired").last_history.id, finished.id)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from unittest import mock
+
+from services.web.risk.handlers.bkm import BKMAlertSyncHandler
+from services.web.strategy_v2.models import Strategy
+from tests.base import TestCase
+
+BKM_STRATEGY_ID = 1
+ALERT = {
+    "id": "1001",
+    "strategy_id": BKM_STRATEGY_ID,
+    "create_time": 1700000000,
+    "update_time": 1700000000,
+    "dimensions": [],
+    "description": "",
+    "tags": [{"key": "username", "value": "admin"}],
+}
+
+
+class BKMAlertSyncHandlerTest(TestCase):
+    def setUp(self) -> None:
+        self.strategy_map = {BKM_STRATEGY_ID: Strategy(strategy_id=1, backend_data={"id": BKM_STRATEGY_ID})}
+
+    @mock.patch("services.web.risk.handlers.bkm.api.bk_monitor.search_alert")
+    @mock.patch("services.web.risk.tasks.add_event.delay")
+    def test_sync_skip_synced_alerts(self, add_event: mock.Mock, search_alert: mock.Mock):
+        """BKMAlertSyncHandler.sync"""
+        search_alert.return_value = {"total": 1, "alerts": [ALERT]}
+        with mock.patch.object(BKMAlertSyncHandler, "_load_strategy_map", return_value=self.strategy_map):
+            BKMAlertSyncHandler().sync()
+            BKMAlertSyncHandler().sync()
+        search_alert.assert_called()
+        self.assertEqual(search_alert.call_args.kwargs["page_size"], 100)
+        add_event.assert_called_once()
+        self.assertEqual(add_event.call_args.args[0][0]["raw_event_id"], ALERT["id"])
+
+    @mock.patch("services.web.risk.handlers.bkm.api.bk_monitor.search_alert")
+    @mock.patch("services.web.risk.tasks.add_event.delay")
+    def test_sync_updated_alerts(self, add_event: mock.Mock, search_alert: mock.Mock):
+        """BKMAlertSyncHandler.sync"""
+        with mock.patch.object(BKMAlertSyncHandler, "_load_strategy_map", return_value=self.strategy_map):
+            search_alert.return_value = {"total": 1, "alerts": [ALERT]}
+            BKMAlertSyncHandler().sync()
+            # 持续中的告警更新后重新同步
+            search_alert.return_value = {"total": 1, "alerts": [{**ALERT, "update_time": ALERT["update_time"] + 60}]}
+            BKMAlertSyncHandler().sync()
+        self.assertEqual(add_event.call_count, 2)
+        self.assertEqual(search_alert.call_args.kwargs["ordering"], ["create_time", "id"])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from services.web.risk.handlers.query import RiskListHandler
+from services.web.risk.models import Risk, RiskExperience
+from services.web.risk.serializers import ListRiskRequestSerializer
+from tests.base import TestCase
+
+
+class RiskListHandlerTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        event_time = timezone.now()
+        # 两两共享 event_time，校验 risk_id 作为次级排序
+        for i in range(5):
+            Risk.objects.create(
+                risk_id=f"risk{i}",
+                raw_event_id=str(i),
+                strategy_id=1,
+                event_time=event_time - datetime.timedelta(minutes=i // 2),
+            )
+        RiskExperience.objects.create(risk_id="risk4", content="")
+        RiskExperience.objects.create(risk_id="risk4", content="")
+
+    def test_paginate_by_cursor(self):
+        """RiskListHandler.paginate_by_cursor"""
+        handler = RiskListHandler(queryset=Risk.objects.all(), page_size=2)
+        risk_ids, cursor = [], ""
+        for _ in range(3):
+            data = handler.paginate_by_cursor(cursor=cursor)
+            risk_ids.extend(risk.risk_id for risk in data["results"])
+            cursor = data["next_cursor"]
+            self.assertEqual(data["total"], 5)
+        self.assertIsNone(cursor)
+        self.assertEqual(risk_ids, ["risk1", "risk0", "risk3", "risk2", "risk4"])
+        self.assertEqual(data["results"][0].experiences, 2)
+
+    def test_paginate_by_page(self):
+        """RiskListHandler.paginate_by_page"""
+        handler = RiskListHandler(queryset=Risk.objects.all(), page_size=2)
+        data = handler.paginate_by_page(page=3, order_field="risk_id")
+        self.assertEqual(data["num_pages"], 3)
+        self.assertEqual([risk.risk_id for risk in data["results"]], ["risk4"])
+        self.assertEqual(data["results"][0].experiences, 2)
+        self.assertEqual(handler.paginate_by_page(page=4, order_field="risk_id")["results"], [])
+
+    def test_paginate_by_page_stale_total(self):
+        """RiskListHandler.paginate_by_page"""
+        handler = RiskListHandler(queryset=Risk.objects.all(), page_size=2)
+        self.assertEqual(handler.total, 5)
+        # 缓存总数后新增风险，超出缓存总数的页仍可查询
+        for i in range(5, 7):
+            Risk.objects.create(risk_id=f"risk{i}", raw_event_id=str(i), strategy_id=1, event_time=timezone.now())
+        data = handler.paginate_by_page(page=4, order_field="risk_id")
+        self.assertEqual(data["total"], 5)
+        self.assertEqual([risk.risk_id for risk in data["results"]], ["risk6"])
+
+    def test_total_cached(self):
+        """RiskListHandler.total"""
+        handler = RiskListHandler(queryset=Risk.objects.all(), page_size=2)
+        self.assertEqual(handler.total, 5)
+        Risk.objects.filter(risk_id="risk0").delete()
+        self.assertEqual(handler.total, 5)
+        self.assertEqual(RiskListHandler(queryset=Risk.objects.filter(strategy_id=1), page_size=2).total, 4)
+        self.assertEqual(RiskListHandler(queryset=Risk.objects.none(), page_size=2).total, 0)
+
+
+class ListRiskRequestSerializerTest(TestCase):
+    def _validate(self, **params) -> ListRiskRequestSerializer:
+        serializer = ListRiskRequestSerializer(data=params)
+        serializer.is_valid()
+        return serializer
+
+    def test_page_size(self):
+        """ListRiskRequestSerializer.page_size"""
+        self.assertTrue(self._validate(page_size=1000).is_valid())
+        self.assertFalse(self._validate(page_size=1001).is_valid())
+
+    def test_cursor_order_field(self):
+        """ListRiskRequestSerializer.validate"""
+        self.assertEqual(self._validate(cursor="").validated_data["order_field"], "-event_time")
+        serializer = self._validate(cursor="", order_field="event_time", order_type="asc")
+        self.assertEqual(serializer.validated_data["order_field"], "event_time")
+        self.assertFalse(self._validate(cursor="", order_field="last_operate_time", order_type="desc").is_valid())
+        self.assertTrue(self._validate(order_field="last_operate_time", order_type="desc").is_valid())
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from services.web.risk.handlers.rule import RiskRuleHandler, RiskRuleSetHandler
+from services.web.risk.models import RiskRule, RiskRuleCatalog
+from tests.base import TestCase
+
+
+class RiskRuleSetHandlerTest(TestCase):
+    def setUp(self) -> None:
+        RiskRuleHandler._rules = (None, [])
+
+    def create_rule(self, rule_id: int, version: int = 1) -> RiskRule:
+        return RiskRule.objects.create(
+            rule_id=rule_id,
+            version=version,
+            name=f"rule{rule_id}",
+            scope=[],
+            priority_index=RiskRuleSetHandler.allocate_priority_index(),
+        )
+
+    def test_allocate_priority_index(self):
+        """RiskRuleSetHandler.allocate_priority_index"""
+        self.assertEqual(self.create_rule(1).priority_index, 1)
+        self.assertEqual(self.create_rule(2).priority_index, 2)
+
+    def test_reorder(self):
+        """RiskRuleSetHandler.reorder"""
+        for rule_id in range(1, 4):
+            self.create_rule(rule_id)
+        self.create_rule(1, version=2)
+        version = RiskRuleSetHandler.get_version()
+        config = [{"rule_id": rule_id, "priority_index": 10 - rule_id, "is_enabled": False} for rule_id in range(1, 4)]
+        with CaptureQueriesContext(connection) as small:
+            RiskRuleSetHandler.reorder(config[:1])
+        with CaptureQueriesContext(connection) as large:
+            result = RiskRuleSetHandler.reorder(config)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(RiskRuleSetHandler.get_version(), version + 2)
+        self.assertEqual({rule.rule_id: rule.version for rule, _ in result}, {1: 2, 2: 1, 3: 1})
+        self.assertEqual(set(RiskRule.objects.filter(rule_id=1).values_list("priority_index", flat=True)), {9})
+        self.assertFalse(RiskRule.objects.filter(is_enabled=True).exists())
+
+    def test_load_rules_by_version(self):
+        """RiskRuleHandler.load_rules"""
+        self.create_rule(1)
+        RiskRuleSetHandler.bump_version()
+        self.assertEqual([rule.rule_id for rule in RiskRuleHandler.load_rules()], [1])
+        self.create_rule(2)
+        self.assertEqual(len(RiskRuleHandler.load_rules()), 1)
+        RiskRuleSetHandler.bump_version()
+        self.assertEqual([rule.rule_id for rule in RiskRuleHandler.load_rules()], [2, 1])
+
+
+class RiskRuleCatalogTest(TestCase):
+    def test_latest_version_pointer(self):
+        """RiskRuleCatalog.on_rule_saved"""
+        first = RiskRule.objects.create(name="rule", scope=[], version=1)
+        first.rule_id = first.id
+        first.save(update_fields=["rule_id"])
+        second = RiskRule.objects.create(name="rule", scope=[], version=2, rule_id=first.rule_id, pa_id=1)
+        # 旧版本保存时不回退
+        first.save(update_fields=["name"])
+        self.assertEqual(RiskRuleCatalog.objects.get(rule_id=first.rule_id).latest_rule_id, second.id)
+        self.assertEqual(list(RiskRule.load_latest_rules().values_list("id", flat=True)), [second.id])
+        self.assertEqual(RiskRule.load_latest_rules().filter(pa_id=1).count(), 1)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import time
+
+from services.web.risk.handlers.ticket import MisReport, NewRisk, TransOperator
+from services.web.risk.handlers.timeline import TicketTimelineHandler
+from services.web.risk.models import TicketNode, TicketNodeArchive, TicketTimeline
+from tests.base import TestCase
+
+RISK_ID = "timeline"
+
+
+class TicketTimelineTest(TestCase):
+    def create_node(self, action: str, timestamp: float) -> TicketNode:
+        return TicketNode.objects.create(
+            risk_id=RISK_ID, operator="admin", action=action, timestamp=timestamp, time="", extra={"a": 1}
+        )
+
+    def test_merge_on_save(self):
+        """TicketTimelineHandler.merge"""
+        now = time.time()
+        first = self.create_node(NewRisk.__name__, now)
+        second = self.create_node(TransOperator.__name__, now + 1)
+        third = self.create_node(MisReport.__name__, now + 2)
+        timeline = TicketTimeline.objects.get(risk_id=RISK_ID)
+        self.assertEqual([node["id"] for node in timeline.nodes], [first.id, second.id, third.id])
+        self.assertEqual(timeline.nodes[0]["a"], 1)
+        self.assertEqual(timeline.last_node_id, second.id)
+        # 更新后原位覆盖
+        first.process_result = {"status": "ok"}
+        first.save(update_fields=["process_result"])
+        nodes = TicketTimelineHandler(RISK_ID).load()
+        self.assertEqual(len(nodes), 3)
+        self.assertEqual(nodes[0]["process_result"], {"status": "ok"})
+
+    def test_rebuild_with_archive(self):
+        """TicketTimelineHandler.rebuild"""
+        now = time.time()
+        first = self.create_node(NewRisk.__name__, now)
+        self.create_node(TransOperator.__name__, now + 1)
+        # 模拟归档
+        TicketNodeArchive.objects.create(
+            **{field.name: getattr(first, field.name) for field in TicketNode._meta.fields}
+        )
+        TicketNode.objects.filter(id=first.id).delete()
+        self.assertEqual(len(TicketTimelineHandler(RISK_ID).load()), 2)
+        TicketTimeline.objects.all().delete()
+        nodes = TicketTimelineHandler(RISK_ID).load()
+        self.assertEqual([node["id"] for node in nodes][0], first.id)
+        self.assertEqual(len(nodes), 2)